@@ -0,0 +1,5 @@
+# FILE: coursehub/__init__.py
+# PURPOSE: The Business Analyst course hub generators as one importable package:
+#          catalog scanning, viewer and dashboard rendering, and the `coursehub` CLI.
+#          Every command runs from the hub root, where hub_config.json lives.
+__version__ = "0.1.0"
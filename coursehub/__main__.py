@@ -0,0 +1,5 @@
+# FILE: coursehub/__main__.py
+# PURPOSE: Lets `python3 -m coursehub ...` work without installing the package.
+from .cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,713 @@
+# FILE: coursehub/assets.py (`coursehub assets verify|restore`)
+# PURPOSE: SingleFile inlines every font, icon and image of a lesson as a base64 data URI,
+#          so the same few hundred blobs are repeated thousands of times across the hub.
+#          For the --site output of `coursehub build` each URI is decoded once, stored as
+#          <site>/assets/<sha256>.<ext> and replaced by a relative link, which browsers
+#          then cache across lessons. The rewrite is exactly reversible: every rewritten
+#          lesson is restored in memory and compared with the original before it is kept
+#          (a lesson that would not round-trip is copied verbatim), and `coursehub assets
+#          verify` repeats that check from the files on disk against the catalog's hashes.
+#          A second pass moves each run of adjacent <style> elements that hold nothing but
+#          @font-face rules into a hash-named stylesheet in the same store and links it,
+#          so the font faces (not just the font files) are fetched once for the whole hub.
+#          A third pass does the same for every other <style> element that several lessons
+#          of a course share, keeping only each lesson's own styles inline.
+#          Before those, the course's SVG icons are packed into sprite sheets, one per
+#          intrinsic size, and each link points at the icon's <view> in its sprite. The
+#          icons stay in the store on their own too, which is what restore() reads back.
+#          Last, the CSS rules that match nothing in the lessons using them (see
+#          deadcss.py) move out of the inline styles and shared stylesheets into the store,
+#          each run replaced by a comment naming where its text went.
+#          Only once a lesson has restored byte for byte is it minified (see minify.py)
+#          for serving. Minifying is not reversible, so the verified page it was made
+#          from is kept in the store, zlib-compressed, and is what restore starts from.
+#          A lesson copied verbatim is served as captured, without minifying.
+import argparse
+import base64
+import binascii
+import hashlib
+import os
+import posixpath
+import re
+import threading
+import zlib
+
+from . import catalog, deadcss, metrics, minify, writer
+
+# --- Configuration ---
+SITE_PATH = "_site"
+ASSETS_DIR = "assets"
+EXTRACT_VERSION = 8          # bump when the rewritten form changes; every site task then reruns
+NAME_LENGTH = 32             # hex digits of the content's sha256 used as the asset's name
+# One extension per media type, and back: the extension alone tells restore() the original prefix
+MIME_EXTENSIONS = {
+    "image/svg+xml": "svg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/x-icon": "ico",
+    "font/woff2": "woff2",
+    "font/woff": "woff",
+}
+MIN_SHARED_LESSONS = 2       # a <style> element found in this many lessons of a course is hoisted
+MIN_SPRITE_ICONS = 2         # icons of one intrinsic size share a sprite once there are this many
+SPRITE_GAP = 2               # empty user units between stacked icons, so none bleeds into its neighbour
+# --- End Configuration ---
+
+EXTENSION_MIMES = {extension: mime for mime, extension in MIME_EXTENSIONS.items()}
+# A data URI ends where the CSS url(), the attribute value or the unquoted attribute ends.
+# Requiring that end keeps a line-wrapped or otherwise odd URI from being cut in half.
+URI_END = rb"(?=[)\"'\s>])"
+DATA_URI = re.compile(rb"data:([a-z0-9.+-]+/[a-z0-9.+-]+);base64,([A-Za-z0-9+/]+={0,2})" + URI_END)
+# A run of adjacent attribute-less <style> elements holding only @font-face rules
+FONT_STYLES = re.compile(rb"(?:<style>(?:\s*@font-face\s*\{[^}]*\})+\s*</style>)+")
+STYLE_ELEMENT = re.compile(rb"(<style[^>]*>)(.*?)</style>", re.S)
+# Inside a shared stylesheet each original <style> element starts with this comment,
+# which keeps its opening tag so restore_lesson() can put it back exactly
+SHEET_MARK = b"/* coursehub: "
+SHEET_ELEMENT = re.compile(rb"/\* coursehub: (<style[^>]*>) \*/\n")
+# A run of unused rules moved to the store: the file, and the offset and length of the text
+UNUSED_MARK = b"/* coursehub-unused: "
+UNUSED_RULES = re.compile(rb"/\* coursehub-unused: ([0-9a-f]{%d}\.css) (\d+) (\d+) \*/" % NAME_LENGTH)
+SHEET_LINK = re.compile(rb'<link rel=stylesheet href="[^"]*?([0-9a-f]{%d}\.css)">' % NAME_LENGTH)
+# The root of an SVG icon that can go into a sprite: attributes only, nothing that
+# would leak into the other icons (stylesheets, scripts, entities, processing instructions)
+SVG_ROOT = re.compile(rb'<svg((?:\s+[A-Za-z][\w:.-]*="[^"]*")*)\s*>')
+SVG_ATTRIBUTE = re.compile(rb'([A-Za-z][\w:.-]*)="([^"]*)"')
+SVG_UNSAFE = re.compile(rb"<style|<script|<\?|<!|<svg", re.I)
+SVG_ID = re.compile(rb'\bid="([^"]*)"')
+NUMBER = rb"-?(?:\d+\.?\d*|\.\d+)"
+VIEW_BOX = re.compile(rb"\s*(%s)[\s,]+(%s)[\s,]+(%s)[\s,]+(%s)\s*" % (NUMBER, NUMBER, NUMBER, NUMBER))
+
+
+def site_path(site, path):
+    """Where the hub-relative `path` ('/'-separated) lives inside the site."""
+    return os.path.join(site, *path.split("/"))
+
+
+def asset_prefix(path):
+    """The relative link from the hub-relative file `path` to the asset store, e.g. '../../assets/'."""
+    return posixpath.relpath(ASSETS_DIR, posixpath.dirname(path) or ".") + "/"
+
+
+def reference_pattern(prefix):
+    """Matches an asset link below `prefix`: name, extension and, for an icon linked
+    through a sprite, the icon's name."""
+    extensions = "|".join(sorted(EXTENSION_MIMES, key=len, reverse=True))
+    return re.compile(re.escape(prefix.encode("utf-8")) + rb"([0-9a-f]{%d})\.(%s)(?:#i([0-9a-f]{%d}))?"
+                      % (NAME_LENGTH, extensions.encode("ascii"), NAME_LENGTH) + URI_END)
+
+
+def extract(html, prefix, memo):
+    """Replaces every data URI worth extracting with a link below `prefix`.
+
+    `memo` maps an encoded payload to its (name, data) and is shared between the
+    lessons of one course, so a repeated icon is decoded and hashed once. Returns
+    (rewritten html, {name: data} of the assets it links to, URIs extracted, URIs left inline).
+    """
+    assets = {}
+    extracted = kept = 0
+
+    def replace(match):
+        nonlocal extracted, kept
+        encoded = match.group(2)
+        known = memo.get(encoded)
+        if known is None:
+            extension = MIME_EXTENSIONS.get(match.group(1).decode("ascii"))
+            known = memo[encoded] = _decode(encoded, extension)
+        name, data = known
+        reference = (prefix + name).encode("utf-8") if name else b""
+        # Unknown types, non-canonical base64 and URIs shorter than their link stay inline
+        if not name or len(reference) >= len(match.group(0)):
+            kept += 1
+            return match.group(0)
+        assets[name] = data
+        extracted += 1
+        return reference
+
+    rewritten = DATA_URI.sub(replace, html)
+    return rewritten, assets, extracted, kept
+
+
+def _decode(encoded, extension):
+    if extension is None:
+        return None, None
+    try:
+        data = base64.b64decode(encoded, validate=True)
+    except binascii.Error:
+        return None, None
+    # restore() re-encodes the asset; only a canonical encoding comes back byte for byte
+    if base64.b64encode(data) != encoded:
+        return None, None
+    return f"{hashlib.sha256(data).hexdigest()[:NAME_LENGTH]}.{extension}", data
+
+
+def restore(html, prefix, load):
+    """Inverse of extract(): turns every asset link below `prefix` back into its data URI.
+    `load(name)` returns an asset's bytes."""
+    def replace(match):
+        name = f"{(match.group(3) or match.group(1)).decode('ascii')}.{match.group(2).decode('ascii')}"
+        mime = EXTENSION_MIMES[match.group(2).decode("ascii")]
+        return b"data:" + mime.encode("ascii") + b";base64," + base64.b64encode(load(name))
+    return reference_pattern(prefix).sub(replace, html)
+
+
+def sprite_icon(data):
+    """Splits an SVG icon into (root attributes, content, viewBox numbers), or None if it
+    cannot be nested in a sprite without changing how it draws."""
+    root = SVG_ROOT.match(data)
+    if root is None or not data.rstrip().endswith(b"</svg>") or SVG_UNSAFE.search(data, root.end()):
+        return None
+    attributes = dict(SVG_ATTRIBUTE.findall(root.group(1)))
+    view_box = VIEW_BOX.fullmatch(attributes.get(b"viewBox", b""))
+    if view_box is None or any(float(number) <= 0 for number in view_box.groups()[2:]):
+        return None
+    # Only unitless sizes (or none at all) carry over to the sprite's root unchanged
+    size = (attributes.get(b"width"), attributes.get(b"height"))
+    if (size[0] is None) != (size[1] is None) or not all(re.fullmatch(NUMBER, value) for value in size if value is not None):
+        return None
+    content = data[root.end():data.rstrip().rindex(b"</svg>")]
+    return attributes, content, view_box.groups()
+
+
+def pack_sprites(icons):
+    """Packs the course's SVG icons ({name: data}) into sprite sheets.
+
+    A link to "<sprite>.svg#i<name>" draws the icon through the sprite's <view>. A
+    sprite's root can carry only one intrinsic size, so icons are grouped by their
+    width and height attributes, which makes each link draw exactly as the icon did;
+    a size shared by fewer than MIN_SPRITE_ICONS icons is left alone, as is any icon
+    whose ids another icon of its sprite already uses.
+
+    Returns ({sprite name: bytes}, {icon name: sprite name}).
+    """
+    groups = {}
+    for name in sorted(icons):
+        icon = sprite_icon(icons[name])
+        if icon is not None:
+            groups.setdefault((icon[0].get(b"width"), icon[0].get(b"height")), []).append((name, icon))
+
+    sprites, placed = {}, {}
+    for (width, height), members in sorted(groups.items(), key=lambda group: str(group[0])):
+        ids, parts, offset, names = set(), [], 0.0, []
+        for name, (attributes, content, (_, _, view_width, view_height)) in members:
+            icon_ids = set(SVG_ID.findall(content))
+            if icon_ids & ids:
+                continue
+            ids |= icon_ids
+            nested = [b'x="0"', b'y="%g"' % offset, b'width="' + view_width + b'"', b'height="' + view_height + b'"']
+            nested += [key + b'="' + value + b'"' for key, value in attributes.items()
+                       if key not in (b"xmlns", b"x", b"y", b"width", b"height")]
+            view = [b'id="i%s"' % name.split(".")[0].encode("ascii"), b'viewBox="0 %g %s %s"' % (offset, view_width, view_height)]
+            if b"preserveAspectRatio" in attributes:
+                view.append(b'preserveAspectRatio="' + attributes[b"preserveAspectRatio"] + b'"')
+            parts.append(b"<view " + b" ".join(view) + b"/>\n<svg " + b" ".join(nested) + b">" + content + b"</svg>\n")
+            names.append(name)
+            offset += float(view_height) + SPRITE_GAP
+        if len(names) < MIN_SPRITE_ICONS:
+            continue
+        size = b' width="%s" height="%s"' % (width, height) if width is not None else b""
+        sprite = b'<svg xmlns="http://www.w3.org/2000/svg"' + size + b">\n" + b"".join(parts) + b"</svg>\n"
+        sprite_name = f"{hashlib.sha256(sprite).hexdigest()[:NAME_LENGTH]}.svg"
+        sprites[sprite_name] = sprite
+        placed.update((name, sprite_name) for name in names)
+    return sprites, placed
+
+
+def link_sprites(html, prefix, placed):
+    """Points each link to an icon in `placed` ({icon name: sprite name}) at its <view>
+    in the sprite. Returns (rewritten html, links rewritten)."""
+    linked = 0
+
+    def replace(match):
+        nonlocal linked
+        name = f"{match.group(1).decode('ascii')}.{match.group(2).decode('ascii')}"
+        if match.group(3) or name not in placed:
+            return match.group(0)
+        linked += 1
+        return f"{prefix}{placed[name]}#i{match.group(1).decode('ascii')}".encode("utf-8")
+    return reference_pattern(prefix).sub(replace, html), linked
+
+
+def pack_stylesheet(elements, prefix):
+    """Packs (opening tag, body) pairs of <style> elements into one shared stylesheet, with
+    asset links made relative to the store. Returns (name, bytes), or None if an element
+    could not be told apart from the marks and so would not restore exactly."""
+    links = reference_pattern(prefix)
+    parts = []
+    for tag, body in elements:
+        if SHEET_MARK in body or b"*/" in tag:
+            return None
+        parts.append(SHEET_MARK + tag + b" */\n" + links.sub(lambda link: link.group(0)[len(prefix):], body) + b"\n")
+    css = b"".join(parts)
+    return f"{hashlib.sha256(css).hexdigest()[:NAME_LENGTH]}.css", css
+
+
+def stylesheet_link(prefix, name):
+    return f'<link rel=stylesheet href="{prefix}{name}">'.encode("utf-8")
+
+
+def link_font_faces(html, prefix):
+    """Replaces each run of font-face-only <style> elements with a <link> to a shared
+    stylesheet below `prefix`.
+
+    Returns (rewritten html, {name: stylesheet bytes}, <style> elements replaced).
+    """
+    sheets = {}
+    replaced = 0
+
+    def replace(match):
+        nonlocal replaced
+        elements = STYLE_ELEMENT.findall(match.group(0))
+        packed = pack_stylesheet(elements, prefix)
+        if packed is None or len(stylesheet_link(prefix, packed[0])) >= len(match.group(0)):
+            return match.group(0)
+        sheets[packed[0]] = packed[1]
+        replaced += len(elements)
+        return stylesheet_link(prefix, packed[0])
+
+    return FONT_STYLES.sub(replace, html), sheets, replaced
+
+
+def link_shared_styles(pages, prefixes):
+    """Hoists the <style> elements that several of a course's lessons share into shared
+    stylesheets. Elements are compared after making their asset links relative to the
+    store, so lessons at different depths still match.
+
+    Adjacent shared elements found in the same set of lessons go into one stylesheet,
+    linked where they stood, so the cascade order is unchanged and a lesson needs a
+    few links rather than one per element. Elements with text between them, or found
+    in fewer than MIN_SHARED_LESSONS lessons, stay inline.
+
+    Returns (rewritten pages, {name: stylesheet bytes}, elements hoisted per page).
+    """
+    found = []       # per page: [(start, end, opening tag, body, normalized key)]
+    lessons_of = {}  # normalized key -> indexes of the pages it appears in
+    for index, (html, prefix) in enumerate(zip(pages, prefixes)):
+        links = reference_pattern(prefix)
+        elements = []
+        for match in STYLE_ELEMENT.finditer(html):
+            normalized = match.group(1) + b"\0" + links.sub(lambda link: link.group(0)[len(prefix):], match.group(2))
+            key = hashlib.sha256(normalized).digest()
+            elements.append((match.start(), match.end(), match.group(1), match.group(2), key))
+            lessons_of.setdefault(key, set()).add(index)
+        found.append(elements)
+
+    sheets = {}
+    rewritten, hoisted = [], []
+    for html, prefix, elements in zip(pages, prefixes, found):
+        groups = []
+        for element in elements:
+            if len(lessons_of[element[4]]) < MIN_SHARED_LESSONS:
+                continue
+            group = groups[-1] if groups else None
+            if group and group[-1][1] == element[0] and lessons_of[group[0][4]] == lessons_of[element[4]]:
+                group.append(element)
+            else:
+                groups.append([element])
+        parts, position, count = [], 0, 0
+        for group in groups:
+            packed = pack_stylesheet([(element[2], element[3]) for element in group], prefix)
+            start, end = group[0][0], group[-1][1]
+            if packed is None or len(stylesheet_link(prefix, packed[0])) >= end - start:
+                continue
+            sheets[packed[0]] = packed[1]
+            parts += [html[position:start], stylesheet_link(prefix, packed[0])]
+            position = end
+            count += len(group)
+        parts.append(html[position:])
+        rewritten.append(b"".join(parts))
+        hoisted.append(count)
+    return rewritten, sheets, hoisted
+
+
+def move_unused_rules(css, spans):
+    """Moves the text of `spans` ((start, end) of unused rules) out of `css`. Adjacent
+    spans become one run, replaced by a mark naming the file that holds its text, and
+    runs no longer than their mark stay.
+
+    Returns (rewritten css, (name, removed text) or None, rules moved).
+    """
+    runs = []
+    for start, end, count in ((start, end, 1) for start, end in spans):
+        if runs and not css[runs[-1][1]:start].strip():
+            runs[-1] = (runs[-1][0], end, runs[-1][2] + count)
+        else:
+            runs.append((start, end, count))
+    mark_size = len(UNUSED_MARK) + NAME_LENGTH + len(".css  ") + len(" */")
+    moved, offset, kept = [], 0, []
+    for start, end, count in runs:
+        length = end - start
+        if mark_size + len(str(offset)) + len(str(length)) >= length:
+            continue
+        kept.append((start, end, offset, length, count))
+        moved.append(css[start:end])
+        offset += length
+    if not kept:
+        return css, None, 0
+    removed = b"".join(moved)
+    name = f"{hashlib.sha256(removed).hexdigest()[:NAME_LENGTH]}.css"
+    parts, position = [], 0
+    for start, end, offset, length, _ in kept:
+        parts += [css[position:start], UNUSED_MARK + b"%s %d %d */" % (name.encode("ascii"), offset, length)]
+        position = end
+    parts.append(css[position:])
+    return b"".join(parts), (name, removed), sum(run[4] for run in kept)
+
+
+def drop_unused_rules(pages, originals, sheets):
+    """Moves the CSS rules that cannot match anything out of a course's lessons.
+
+    A lesson's inline <style> elements are pruned against its own elements, a shared
+    stylesheet against the elements of every lesson linking it, and @keyframes stay
+    while a live rule anywhere in the course, or any rule of a style that is not
+    pruned, names them. Lessons with scripts, or whose original already holds
+    UNUSED_MARK, are left alone, and so are the stylesheets they link.
+
+    Returns (rewritten pages, rewritten {name: stylesheet bytes}, {name: moved text},
+    rules moved, bytes moved).
+    """
+    documents, prunable, linking = [], [], {}
+    for index, (html, original) in enumerate(zip(pages, originals)):
+        document = deadcss.Document()
+        document.add(html)
+        documents.append(document)
+        prunable.append(not document.scripted and UNUSED_MARK not in original)
+        for name in SHEET_LINK.findall(html):
+            linking.setdefault(name.decode("ascii"), set()).add(index)
+
+    # Every stretch of CSS to prune: (where it lives, start, end, parsed rules, matcher)
+    matchers = {}
+
+    def matcher(indexes):
+        key = frozenset(indexes)
+        if key not in matchers:
+            union = deadcss.Document()
+            for index in key:
+                union.update(documents[index])
+            matchers[key] = deadcss.Matcher(union)
+        return matchers[key]
+
+    texts = []
+    used = set().union(*(document.animations for document in documents))
+    for index, html in enumerate(pages):
+        for match in STYLE_ELEMENT.finditer(html):
+            if prunable[index]:
+                texts.append((index, match.start(2), match.end(2), matcher([index])))
+            else:
+                deadcss.animation_names(match.group(2), used)
+    for name, css in sorted(sheets.items()):
+        indexes = linking.get(name)
+        if indexes and all(prunable[index] for index in indexes):
+            marks = list(SHEET_ELEMENT.finditer(css))
+            texts += [(name, mark.end(), (following.start() if following else len(css)) - 1, matcher(indexes))
+                      for mark, following in zip(marks, marks[1:] + [None])]
+        else:
+            deadcss.animation_names(css, used)
+
+    def source(where):
+        return pages[where] if isinstance(where, int) else sheets[where]
+
+    parsed = []
+    for where, start, end, rules_matcher in texts:
+        css = source(where)[start:end]
+        rules = deadcss.parse_rules(css)
+        if rules is None:
+            deadcss.animation_names(css, used)
+        else:
+            deadcss.dead_rules(css, rules, rules_matcher, None, used)
+            parsed.append((where, start, end, css, rules, rules_matcher))
+
+    edits, unused = {}, {}
+    moved_rules = moved_bytes = 0
+    for where, start, end, css, rules, rules_matcher in parsed:
+        rewritten, removed, count = move_unused_rules(css, deadcss.dead_rules(css, rules, rules_matcher, used))
+        if removed is None:
+            continue
+        unused[removed[0]] = removed[1]
+        moved_rules += count
+        moved_bytes += len(removed[1])
+        edits.setdefault(where, []).append((start, end, rewritten))
+
+    def apply(data, changes):
+        parts, position = [], 0
+        for start, end, rewritten in sorted(changes):
+            parts += [data[position:start], rewritten]
+            position = end
+        return b"".join(parts + [data[position:]])
+
+    pages = [apply(html, edits.get(index, [])) for index, html in enumerate(pages)]
+    renamed = {}
+    for name in sorted(sheets):
+        css = apply(sheets[name], edits.get(name, []))
+        renamed[name] = f"{hashlib.sha256(css).hexdigest()[:NAME_LENGTH]}.css" if name in edits else name
+        sheets[name] = css
+    sheets = {renamed[name]: css for name, css in sheets.items()}
+    for name, indexes in linking.items():
+        if name in edits:
+            for index in indexes:
+                pages[index] = pages[index].replace(name.encode("ascii") + b'">', renamed[name].encode("ascii") + b'">')
+    return pages, sheets, unused, moved_rules, moved_bytes
+
+
+def revive_rules(css, load):
+    """Inverse of move_unused_rules(): puts the moved rules back in place of their marks."""
+    def replace(match):
+        offset, length = int(match.group(2)), int(match.group(3))
+        return load(match.group(1).decode("ascii"))[offset:offset + length]
+    return UNUSED_RULES.sub(replace, css)
+
+
+def unlink_stylesheets(html, prefix, load):
+    """Inverse of link_font_faces() and link_shared_styles(): puts each linked stylesheet
+    back as the <style> elements it was made from."""
+    pattern = re.compile(rb'<link rel=stylesheet href="' + re.escape(prefix.encode("utf-8")) + rb'([0-9a-f]{%d})\.css">' % NAME_LENGTH)
+    bare_links = reference_pattern("")
+    relink = prefix.encode("utf-8")
+
+    def replace(match):
+        css = load(f"{match.group(1).decode('ascii')}.css")
+        marks = list(SHEET_ELEMENT.finditer(css))
+        elements = []
+        for mark, following in zip(marks, marks[1:] + [None]):
+            # Each body was followed by one newline before the next mark (or the end)
+            body = css[mark.end():(following.start() if following else len(css)) - 1]
+            elements.append(mark.group(1) + bare_links.sub(lambda link: relink + link.group(0), body) + b"</style>")
+        return b"".join(elements)
+    return pattern.sub(replace, html)
+
+
+def restore_lesson(html, prefix, load):
+    """Undoes every pass of build_site_lessons(), last pass first."""
+    def load_revived(name):
+        return revive_rules(load(name), load)
+    return restore(unlink_stylesheets(revive_rules(html, load), prefix, load_revived), prefix, load)
+
+
+def store_asset(store, name, data):
+    """Writes one asset unless it is already there. Returns True if written.
+
+    The name is the content's hash, so an existing file of the right size is the same
+    asset. Course tasks run in parallel and may store the same asset at once; each
+    writes its own temp file and the identical results replace one another atomically.
+    """
+    path = os.path.join(store, name)
+    try:
+        if os.stat(path).st_size == len(data):
+            return False
+    except OSError:
+        pass
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    metrics.count("assets_written")
+    metrics.count("bytes_written", len(data))
+    return True
+
+
+def build_site_lessons(site, lessons):
+    """Writes the site copy of each lesson of a course plus the assets they link to.
+
+    Every lesson is rewritten first (its data URIs extracted, its icons linked
+    through the course's sprites and its font faces linked), then the <style>
+    elements the course's lessons share are hoisted and the rules nothing can match
+    are moved out, and only then is each lesson checked against its original, minified
+    and written. The verified page behind each minified one goes to the store.
+
+    `lessons` are catalog rows (path, size, sha256). Returns the statistics and the
+    list of files written, for the build report and the task cache.
+    """
+    store = os.path.join(site, ASSETS_DIR)
+    os.makedirs(store, exist_ok=True)
+    memo = {}
+    originals, prefixes, pages, used, counts = [], [], [], [], []
+    for lesson in lessons:
+        with metrics.phase("read", lesson["path"]):
+            with open(lesson["path"].replace("/", os.path.sep), "rb") as f:
+                original = f.read()
+        metrics.count("bytes_read", len(original))
+        prefix = asset_prefix(lesson["path"])
+        with metrics.phase("extract", lesson["path"]):
+            rewritten, assets, replaced, inline = extract(original, prefix, memo)
+        originals.append(original)
+        prefixes.append(prefix)
+        pages.append(rewritten)
+        used.append(assets)
+        counts.append([replaced, inline])
+    with metrics.phase("extract", "sprites"):
+        sprites, placed = pack_sprites({name: data for assets in used for name, data in assets.items() if name.endswith(".svg")})
+    for index, prefix in enumerate(prefixes):
+        with metrics.phase("extract", lessons[index]["path"]):
+            rewritten, icons = link_sprites(pages[index], prefix, placed)
+            pages[index], sheets, linked = link_font_faces(rewritten, prefix)
+        used[index].update(sheets)
+        counts[index] += [icons, linked]
+    with metrics.phase("extract", "shared styles"):
+        pages, shared, hoisted = link_shared_styles(pages, prefixes)
+    with metrics.phase("extract", "unused css"):
+        pages, shared, unused, unused_rules, unused_bytes = drop_unused_rules(pages, originals, shared)
+    shared.update(sprites)
+    shared.update(unused)
+
+    outputs, verbatim, asset_sizes, sources = [], [], {}, {}
+    original_bytes = verified_bytes = site_bytes = extracted = kept = sprite_links = font_styles = styles = 0
+    for lesson, original, prefix, rewritten, assets, (replaced, inline, icons, linked), moved in zip(
+            lessons, originals, prefixes, pages, used, counts, hoisted):
+        with metrics.phase("verify", lesson["path"]):
+            round_trip = restore_lesson(rewritten, prefix, lambda name: assets[name] if name in assets else shared[name]) == original
+        if round_trip:
+            extracted += replaced
+            kept += inline
+            sprite_links += icons
+            font_styles += linked
+            styles += moved
+        else:
+            rewritten, assets = original, {}
+            verbatim.append(lesson["path"])
+        for name, data in assets.items():
+            store_asset(store, name, data)
+            asset_sizes[name] = len(data)
+        if round_trip:
+            source = zlib.compress(rewritten, 9)
+            sources[lesson["path"]] = f"{hashlib.sha256(source).hexdigest()[:NAME_LENGTH]}.html.z"
+            store_asset(store, sources[lesson["path"]], source)
+            with metrics.phase("minify", lesson["path"]):
+                served = minify.minify_html(rewritten)
+        else:
+            served = original
+        output = site_path(site, lesson["path"])
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        writer.write_bytes_if_changed(output, served)
+        outputs.append(output)
+        original_bytes += len(original)
+        verified_bytes += len(rewritten)
+        site_bytes += len(served)
+    for name, data in shared.items():
+        store_asset(store, name, data)
+        asset_sizes[name] = len(data)
+    metrics.count("assets_extracted", extracted)
+    metrics.count("assets_inline", kept)
+    metrics.count("sprite_links", sprite_links)
+    metrics.count("font_styles_linked", font_styles)
+    metrics.count("styles_hoisted", styles)
+    metrics.count("unused_rules_moved", unused_rules)
+    metrics.count("minify_bytes_saved", verified_bytes - site_bytes)
+    outputs.extend(os.path.join(store, name) for name in sorted(set(asset_sizes) | set(sources.values())))
+    return {
+        "lessons": len(lessons),
+        "original_bytes": original_bytes,
+        "verified_bytes": verified_bytes,
+        "site_bytes": site_bytes,
+        "extracted": extracted,
+        "inline": kept,
+        "sprites": sorted(sprites),
+        "sprite_icons": sorted(placed),
+        "sprite_links": sprite_links,
+        "font_styles": font_styles,
+        "styles": styles,
+        "unused_rules": unused_rules,
+        "unused_bytes": unused_bytes,
+        "unused_files": sorted(unused),
+        "verbatim": verbatim,
+        "sources": sources,
+        "assets": asset_sizes,
+        "outputs": outputs,
+    }
+
+
+def load_asset(store):
+    """A load() for restore() that reads assets from `store` and checks each against its name."""
+    cache = {}
+
+    def load(name):
+        if name not in cache:
+            with open(os.path.join(store, name), "rb") as f:
+                data = f.read()
+            if not hashlib.sha256(data).hexdigest().startswith(name.split(".")[0]):
+                raise ValueError(f"asset '{name}' does not match its hash")
+            cache[name] = data
+        return cache[name]
+    return load
+
+
+def site_lessons(conn, site):
+    """Yields (lesson row, restored bytes or None, error) for every catalogued lesson.
+
+    Each lesson is restored from the verified page kept in the store, after checking
+    that the served page is that page minified. A lesson copied verbatim is read back
+    as served."""
+    verbatim, sources = set(), {}
+    for name, result in catalog.task_results(conn, "site:"):
+        verbatim.update(result.get("verbatim", []))
+        sources.update(result.get("sources", {}))
+    load = load_asset(os.path.join(site, ASSETS_DIR))
+    for course in catalog.course_summaries(conn):
+        for lesson in catalog.lessons(conn, course["path"]):
+            try:
+                if lesson["path"] in verbatim:
+                    with open(site_path(site, lesson["path"]), "rb") as f:
+                        html = f.read()
+                else:
+                    if lesson["path"] not in sources:
+                        raise ValueError("no verified page recorded; run `coursehub build --site` again")
+                    html = zlib.decompress(load(sources[lesson["path"]]))
+                    with open(site_path(site, lesson["path"]), "rb") as f:
+                        if f.read() != minify.minify_html(html):
+                            raise ValueError("served page is not the minified form of its verified page")
+                    html = restore_lesson(html, asset_prefix(lesson["path"]), load)
+            except (OSError, ValueError, zlib.error) as e:
+                yield lesson, None, str(e)
+                continue
+            yield lesson, html, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub assets",
+                                     description="Check or undo the asset extraction of `coursehub build --site`.")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH, help=f"Path of the lesson catalog (default: {catalog.CATALOG_PATH}).")
+    parser.add_argument("--site", default=SITE_PATH, help=f"The site built by `coursehub build --site` (default: {SITE_PATH}).")
+    metrics.add_arguments(parser, metrics_path=None)
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("verify", help="Restore every site lesson in memory and compare it with the original's hash.")
+    restore_parser = actions.add_parser("restore", help="Write every restored lesson below a folder.")
+    restore_parser.add_argument("output", help="Folder to write the restored lessons to (mirrors the hub's layout).")
+    args = parser.parse_args(argv)
+
+    with metrics.session("assets", args):
+        return run(args)
+
+
+def run(args):
+    """Carries out the parsed `coursehub assets` action. Returns the exit code."""
+    if not os.path.exists(args.catalog) or not os.path.isdir(args.site):
+        print(f"❌ Error: Need the catalog '{args.catalog}' and the site '{args.site}'. Run `coursehub build --site` first.")
+        return 1
+    conn = catalog.connect(args.catalog)
+    checked = failed = 0
+    for lesson, html, error in site_lessons(conn, args.site):
+        checked += 1
+        if error is None and hashlib.sha256(html).hexdigest() != lesson["sha256"]:
+            error = "restored bytes differ from the original"
+        if error:
+            failed += 1
+            print(f"  -> ❌ {lesson['path']}: {error}")
+            continue
+        if args.action == "restore":
+            output = site_path(args.output, lesson["path"])
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            writer.write_bytes_if_changed(output, html)
+    conn.close()
+    if failed:
+        print(f"❌ {failed} of {checked} lessons do not restore to their originals.")
+        return 1
+    if args.action == "restore":
+        print(f"✅ Restored {checked} lessons below '{args.output}', each identical to its original.")
+    else:
+        print(f"✅ All {checked} site lessons restore byte for byte to their originals.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,271 @@
+# FILE: coursehub/bench.py (`coursehub bench`)
+# PURPOSE: Benchmark the build and the commands that read the whole corpus (scan,
+#          snapshots pack, similar) at multiples of the real hub's size. For every scale it
+#          generates (or reuses) a synthetic hub (see synthetic.py), runs each stage in
+#          STAGES as a fresh `python3 -m coursehub ...` process and reads that process's
+#          hub_metrics.json, then prints throughput (lessons/s, MB/s) and peak RSS per
+#          stage. Every stage runs --repeat times; the table shows medians. Results are
+#          written as JSON and recorded in the benchmark history (see benchhistory.py) so
+#          `coursehub bench-history compare` can flag regressions between revisions.
+import argparse
+import json
+import os
+import statistics
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import assets, benchhistory, catalog, neardup, snapshots, synthetic, writer
+
+# --- Configuration ---
+DEFAULT_SCALES = "10,100,1000"
+DEFAULT_REPEAT = 3                  # samples per stage; the history's significance test needs more than one
+DEFAULT_WORKDIR = os.path.join(tempfile.gettempdir(), "coursehub-bench")
+RESULTS_PATH = "hub_bench.json"
+RESULTS_VERSION = 1
+TOUCH_EVERY = 100                   # the "touched" stage changes 1 lesson in TOUCH_EVERY
+DISK_HEADROOM = 1.2                 # free space needed, relative to the estimated corpus size
+# --- End Configuration ---
+
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cold_start(root):
+    """Forgets every build output so the next build starts from nothing."""
+    for name in ("hub_catalog.sqlite3", "hub_catalog.sqlite3-journal", "hub_scan.json", "index.html"):
+        if os.path.exists(os.path.join(root, name)):
+            os.remove(os.path.join(root, name))
+    for directory, _, files in os.walk(root):
+        if "viewer.html" in files:
+            os.remove(os.path.join(directory, "viewer.html"))
+    _drop_site(root)
+
+
+def _drop_site(root):
+    """Removes the --site output so the next site build extracts every lesson again."""
+    shutil.rmtree(os.path.join(root, assets.SITE_PATH), ignore_errors=True)
+
+
+def _ensure_catalog(root):
+    """Builds the catalog the corpus commands read, unless an earlier stage already did."""
+    if not os.path.exists(os.path.join(root, catalog.CATALOG_PATH)):
+        _coursehub(root, ["build"])
+
+
+def _drop_snapshots(root):
+    """Removes the snapshot store so the next pack compresses every lesson again."""
+    _ensure_catalog(root)
+    if os.path.exists(os.path.join(root, snapshots.SNAPSHOTS_PATH)):
+        os.remove(os.path.join(root, snapshots.SNAPSHOTS_PATH))
+
+
+def _drop_signatures(root):
+    """Removes the signature cache so the next `similar` signs every lesson again."""
+    _ensure_catalog(root)
+    if os.path.exists(os.path.join(root, neardup.SIMILAR_PATH)):
+        os.remove(os.path.join(root, neardup.SIMILAR_PATH))
+
+
+def _touch_lessons(root):
+    """Bumps the mtime of every TOUCH_EVERY-th lesson, as if it had been re-saved."""
+    lessons = sorted(os.path.join(directory, name) for directory, _, files in os.walk(root)
+                     for name in files if name.endswith(".html") and name != "viewer.html" and name != "index.html")
+    now = time.time()
+    for path in lessons[::TOUCH_EVERY]:
+        os.utime(path, (now, now))
+
+
+# Each stage is one coursehub command run in the synthetic hub's root. "prepare" sets the
+# scene first; "jobs" says whether the command takes -j. Corpus-processing commands are
+# benchmarked by adding an entry here; the ones that read the catalog build it first if
+# no earlier stage did.
+STAGES = [
+    {"name": "build-cold", "argv": ["build"], "prepare": _cold_start, "jobs": True,
+     "description": "full build from an empty catalog (walk, read and hash everything)"},
+    {"name": "build-noop", "argv": ["build"], "prepare": None, "jobs": True,
+     "description": "full build with nothing changed"},
+    {"name": "build-touched", "argv": ["build"], "prepare": _touch_lessons, "jobs": True,
+     "description": f"full build after re-saving 1 lesson in {TOUCH_EVERY} (same bytes, new mtime)"},
+    {"name": "dashboard", "argv": ["dashboard"], "prepare": None, "jobs": False,
+     "description": "dashboard build from the catalog"},
+    {"name": "site", "argv": ["build", "--site"], "prepare": _drop_site, "jobs": True,
+     "description": "build with a fresh --site copy (every lesson's data URIs extracted and verified)"},
+    {"name": "scan", "argv": ["scan"], "prepare": _ensure_catalog, "jobs": False,
+     "description": "mmap scan of every lesson's data: URIs, <style> and <script> blocks"},
+    {"name": "snapshots-pack", "argv": ["snapshots", "pack"], "prepare": _drop_snapshots, "jobs": False,
+     "description": "every lesson packed into an empty delta-compressed snapshot store"},
+    {"name": "similar", "argv": ["similar"], "prepare": _drop_signatures, "jobs": False,
+     "description": "MinHash signatures of every lesson from an empty cache, then LSH clustering"},
+]
+
+
+def output_bytes(root):
+    """Total size of the generated pages (every viewer.html plus the dashboard), outside the site copy."""
+    total = 0
+    for directory, folders, files in os.walk(root):
+        if directory == root and assets.SITE_PATH in folders:
+            folders.remove(assets.SITE_PATH)
+        for name in files:
+            if name == "viewer.html" or (name == "index.html" and directory == root):
+                total += os.path.getsize(os.path.join(directory, name))
+    return total
+
+
+def _coursehub(root, argv):
+    """Runs `python3 -m coursehub <argv>` in `root` with this package importable."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, "-m", "coursehub", *argv], cwd=root, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+def run_stage(stage, root, jobs):
+    """Runs one stage in a fresh interpreter and returns its metrics summary (or None on failure)."""
+    if stage["prepare"]:
+        stage["prepare"](root)
+    metrics_path = os.path.join(root, "bench_metrics.json")
+    # --metrics goes right after the command name: commands with actions only take it there
+    command, *rest = stage["argv"]
+    argv = [command, "--metrics", metrics_path, *rest]
+    if stage["jobs"] and jobs:
+        argv += ["--jobs", str(jobs)]
+    result = _coursehub(root, argv)
+    if result.returncode != 0:
+        print(f"  -> ❌ {stage['name']} failed (exit {result.returncode}): {result.stderr.strip()[-500:]}")
+        return None
+    with open(metrics_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def prepare_corpus(root, scale, args):
+    """Reuses the synthetic hub in `root` if it was generated with the same parameters,
+    otherwise (re)generates it. Returns its manifest, or None if there is not enough disk."""
+    parameters = {"scale": scale, "lesson_kb": args.lesson_kb, "images": args.images,
+                  "duplicate_ratio": args.duplicate_ratio, "seed": args.seed}
+    manifest = synthetic.read_manifest(root)
+    if manifest and manifest["parameters"] == parameters and manifest["generator_version"] == synthetic.GENERATOR_VERSION:
+        print(f"♻️  Reusing the {scale}× hub in '{root}'.")
+        return manifest
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(root)
+    needed = synthetic.estimated_bytes(scale, args.lesson_kb)
+    free = shutil.disk_usage(root).free
+    if needed * DISK_HEADROOM > free:
+        print(f"⚠️ Skipping {scale}×: needs about {needed / 1e9:.1f} GB, only {free / 1e9:.1f} GB free "
+              f"(lower --lesson-kb or pick another --workdir).")
+        return None
+    print(f"🏗️  Generating the {scale}× hub in '{root}' (about {needed / 1e6:.0f} MB)...")
+    started = time.perf_counter()
+    manifest = synthetic.generate(root, **parameters)
+    print(f"   {manifest['lessons']} lessons in {manifest['courses']} courses, {manifest['total_bytes'] / 1e6:.0f} MB "
+          f"in {time.perf_counter() - started:.1f}s.")
+    return manifest
+
+
+def result_row(scale, stage, repeat, manifest, summary, generated):
+    wall = summary["wall_seconds"]
+    megabytes = manifest["total_bytes"] / 1e6
+    return {
+        "scale": scale,
+        "stage": stage["name"],
+        "repeat": repeat,
+        "lessons": manifest["lessons"],
+        "corpus_mb": round(megabytes, 3),
+        "wall_seconds": wall,
+        "lessons_per_second": round(manifest["lessons"] / wall, 1) if wall else None,
+        "mb_per_second": round(megabytes / wall, 1) if wall else None,
+        "peak_rss_kb": summary.get("peak_rss_kb"),
+        "output_bytes": generated,
+        "phases": {name: phase["seconds"] for name, phase in summary["phases"].items()},
+    }
+
+
+def print_table(rows):
+    """One line per (scale, stage) with the median over its repeats."""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["scale"], row["stage"]), []).append(row)
+    print(f"\n{'Scale':>6}  {'Stage':<14} {'Lessons':>8} {'Corpus MB':>10} {'Runs':>5} {'Wall s':>8} {'Lessons/s':>10} {'MB/s':>8} {'Peak RSS MB':>12} {'Output MB':>10}")
+    for (scale, stage), group in groups.items():
+        first = group[0]
+        wall = statistics.median(row["wall_seconds"] for row in group)
+        rss_values = [row["peak_rss_kb"] for row in group if row["peak_rss_kb"] is not None]
+        rss = f"{statistics.median(rss_values) / 1024:.1f}" if rss_values else "-"
+        lessons_per_second = first["lessons"] / wall if wall else 0
+        mb_per_second = first["corpus_mb"] / wall if wall else 0
+        print(f"{scale:>5}×  {stage:<14} {first['lessons']:>8} {first['corpus_mb']:>10.1f} {len(group):>5} {wall:>8.2f} "
+              f"{lessons_per_second:>10.0f} {mb_per_second:>8.1f} {rss:>12} {first['output_bytes'] / 1e6:>10.1f}")
+
+
+def main(argv=None):
+    stage_names = [stage["name"] for stage in STAGES]
+    parser = argparse.ArgumentParser(
+        prog="coursehub bench",
+        description="Time the hub build on synthetic hubs at multiples of the real hub's size.",
+        epilog="Stages: " + "; ".join(f"{stage['name']}: {stage['description']}" for stage in STAGES),
+    )
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"Comma-separated size multiples (default: {DEFAULT_SCALES}).")
+    parser.add_argument("--stages", default=",".join(stage_names), help="Comma-separated stages to run (default: all).")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help=f"Where the synthetic hubs are created (default: {DEFAULT_WORKDIR}).")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated hubs so the next run can reuse them.")
+    parser.add_argument("-j", "--jobs", type=int, help="Passed to the build stages (default: their own default).")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"Runs of each stage (default: {DEFAULT_REPEAT}).")
+    parser.add_argument("--output", default=RESULTS_PATH, help=f"Where to write the results (default: {RESULTS_PATH}).")
+    parser.add_argument("--history", default=benchhistory.HISTORY_PATH,
+                        help=f"Benchmark history database the run is recorded in (default: {benchhistory.HISTORY_PATH}).")
+    parser.add_argument("--no-history", action="store_true", help="Do not record this run in the benchmark history.")
+    synthetic.add_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        scales = [int(scale) for scale in args.scales.split(",")]
+    except ValueError:
+        parser.error("--scales must be comma-separated whole numbers")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    selected = [name.strip() for name in args.stages.split(",")]
+    unknown = sorted(set(selected) - set(stage_names))
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(stage_names)})")
+    stages = [stage for stage in STAGES if stage["name"] in selected]
+
+    rows = []
+    for scale in scales:
+        root = os.path.join(args.workdir, f"scale-{scale}")
+        manifest = prepare_corpus(root, scale, args)
+        if manifest is None:
+            continue
+        # Whole stage sequences are repeated, so every stage sees the state it expects
+        for repeat in range(args.repeat):
+            for stage in stages:
+                print(f"  ⏱️  {scale}× {stage['name']} ({repeat + 1}/{args.repeat})...")
+                summary = run_stage(stage, root, args.jobs)
+                if summary is not None:
+                    rows.append(result_row(scale, stage, repeat, manifest, summary, output_bytes(root)))
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print_table(rows)
+    parameters = {"lesson_kb": args.lesson_kb, "images": args.images,
+                  "duplicate_ratio": args.duplicate_ratio, "seed": args.seed, "jobs": args.jobs}
+    results = {
+        "version": RESULTS_VERSION,
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "parameters": parameters,
+        "results": rows,
+    }
+    writer.write_if_changed(args.output, json.dumps(results, indent=1, sort_keys=True))
+    print(f"\n📈 Results written to '{args.output}'.")
+    if rows and not args.no_history:
+        conn = benchhistory.connect(args.history)
+        run_id = benchhistory.record_run(conn, parameters, rows)
+        conn.close()
+        print(f"🗃️  Recorded as run {run_id} in '{args.history}' (compare with `coursehub bench-history compare`).")
+    return 0 if len(rows) == len(scales) * len(stages) * args.repeat else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,320 @@
+# FILE: coursehub/benchhistory.py (`coursehub bench-history`)
+# PURPOSE: Local SQLite history of `coursehub bench` runs, keyed by git revision and a
+#          machine fingerprint, and a compare command that flags significant regressions
+#          in build time, peak memory or generated output size against a baseline.
+#          Timings are judged with an exact permutation test over the repeated samples
+#          (no SciPy needed); output size is deterministic, so any growth beyond the
+#          threshold counts.
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+# --- Configuration ---
+HISTORY_PATH = "hub_bench_history.sqlite3"
+SCHEMA_VERSION = 1
+DEFAULT_THRESHOLD = 5.0     # % slowdown / growth below which a change is ignored
+DEFAULT_ALPHA = 0.05        # significance level for time and memory changes
+SIZE_THRESHOLD = 0.5        # % growth of generated output that is flagged
+MAX_PERMUTATIONS = 20000    # above this many splits the test samples randomly
+# --- End Configuration ---
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY,
+    finished_at  TEXT NOT NULL,
+    revision     TEXT NOT NULL,
+    dirty        INTEGER NOT NULL,
+    machine      TEXT NOT NULL,
+    machine_info TEXT NOT NULL,
+    python       TEXT NOT NULL,
+    parameters   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id       INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    scale        INTEGER NOT NULL,
+    stage        TEXT NOT NULL,
+    repeat       INTEGER NOT NULL,
+    lessons      INTEGER NOT NULL,
+    corpus_mb    REAL NOT NULL,
+    wall_seconds REAL NOT NULL,
+    peak_rss_kb  INTEGER,
+    output_bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_revision ON runs(machine, revision);
+CREATE INDEX IF NOT EXISTS samples_by_run ON samples(run_id, scale, stage);
+"""
+
+# Metric column, label, and whether it is judged by significance (timings vary run to
+# run; output size does not)
+METRICS = [
+    ("wall_seconds", "wall s", True),
+    ("peak_rss_kb", "peak RSS MB", True),
+    ("output_bytes", "output KB", False),
+]
+
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def connect(path=HISTORY_PATH):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def machine_fingerprint():
+    """Returns (fingerprint, info): a short hash of what makes timings comparable."""
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        memory = None
+    info = {
+        "node": platform.node(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "memory_bytes": memory,
+    }
+    fingerprint = hashlib.sha256(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return fingerprint, info
+
+
+def git_revision():
+    """Returns (revision, dirty) for the coursehub sources, or ("unknown", False) outside git."""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=PACKAGE_PARENT, capture_output=True, text=True, timeout=60)
+    try:
+        head = git("rev-parse", "HEAD")
+        if head.returncode != 0:
+            return "unknown", False
+        # Only the tooling itself matters; the course files are not part of the benchmark
+        dirty = git("diff", "--quiet", "HEAD", "--", "coursehub", "pyproject.toml").returncode != 0
+    except (OSError, subprocess.SubprocessError):
+        return "unknown", False
+    return head.stdout.strip(), dirty
+
+
+def record_run(conn, parameters, rows):
+    """Stores one bench run and its samples. Returns the new run id."""
+    revision, dirty = git_revision()
+    machine, info = machine_fingerprint()
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (finished_at, revision, dirty, machine, machine_info, python, parameters) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%dT%H:%M:%S%z"), revision, int(dirty), machine, json.dumps(info, sort_keys=True),
+             sys.version.split()[0], json.dumps(parameters, sort_keys=True)),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO samples (run_id, scale, stage, repeat, lessons, corpus_mb, wall_seconds, peak_rss_kb, output_bytes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, row["scale"], row["stage"], row["repeat"], row["lessons"], row["corpus_mb"],
+              row["wall_seconds"], row["peak_rss_kb"], row["output_bytes"]) for row in rows],
+        )
+    return run_id
+
+
+def resolve_runs(conn, spec, machine):
+    """Run ids selected by `spec`: a run id, or a git revision (prefix) whose runs on this
+    machine are pooled. Returns (label, [run rows])."""
+    if spec.isdigit():
+        runs = conn.execute("SELECT * FROM runs WHERE id = ?", (int(spec),)).fetchall()
+        return f"run {spec}", runs
+    runs = conn.execute("SELECT * FROM runs WHERE machine = ? AND revision LIKE ? ORDER BY id",
+                        (machine, spec + "%")).fetchall()
+    revisions = {run["revision"] for run in runs}
+    if len(revisions) > 1:
+        raise ValueError(f"revision '{spec}' is ambiguous ({', '.join(sorted(r[:12] for r in revisions))})")
+    return f"revision {spec[:12]}", runs
+
+
+def default_specs(conn, machine):
+    """Latest run as the candidate; the newest run of a different revision as the baseline."""
+    latest = conn.execute("SELECT * FROM runs WHERE machine = ? ORDER BY id DESC LIMIT 1", (machine,)).fetchone()
+    if latest is None:
+        return None, None
+    baseline = conn.execute(
+        "SELECT * FROM runs WHERE machine = ? AND (revision != ? OR dirty != ?) AND id < ? ORDER BY id DESC LIMIT 1",
+        (machine, latest["revision"], latest["dirty"], latest["id"]),
+    ).fetchone()
+    return (str(baseline["id"]) if baseline else None), str(latest["id"])
+
+
+def load_samples(conn, runs):
+    """{(scale, stage): {metric: [values]}} pooled over `runs`."""
+    samples = {}
+    ids = [run["id"] for run in runs]
+    if not ids:
+        return samples
+    rows = conn.execute(f"SELECT * FROM samples WHERE run_id IN ({', '.join('?' * len(ids))})", ids)
+    for row in rows:
+        entry = samples.setdefault((row["scale"], row["stage"]), {metric: [] for metric, _, _ in METRICS})
+        for metric, _, _ in METRICS:
+            if row[metric] is not None:
+                entry[metric].append(row[metric])
+    return samples
+
+
+def permutation_p_value(baseline, candidate, seed=0):
+    """One-sided p-value that `candidate`'s mean is larger than `baseline`'s by chance alone.
+
+    Exact over every split of the pooled samples when that is cheap, otherwise
+    estimated from MAX_PERMUTATIONS random splits.
+    """
+    pooled = baseline + candidate
+    n = len(candidate)
+    observed = statistics.fmean(candidate) - statistics.fmean(baseline)
+    total = sum(pooled)
+
+    def diff(chosen):
+        chosen_sum = sum(pooled[i] for i in chosen)
+        return chosen_sum / n - (total - chosen_sum) / len(baseline)
+
+    indexes = range(len(pooled))
+    combinations = 1
+    for k in range(n):
+        combinations = combinations * (len(pooled) - k) // (k + 1)
+    if combinations <= MAX_PERMUTATIONS:
+        splits = itertools.combinations(indexes, n)
+        count = combinations
+    else:
+        rng = random.Random(seed)
+        splits = (rng.sample(indexes, n) for _ in range(MAX_PERMUTATIONS))
+        count = MAX_PERMUTATIONS
+    extreme = sum(1 for chosen in splits if diff(chosen) >= observed - 1e-12)
+    return extreme / count
+
+
+def compare(baseline, candidate, threshold, alpha):
+    """Judges every (scale, stage, metric) present in both sample sets.
+
+    Returns rows of (scale, stage, metric, baseline median, candidate median, change %,
+    p-value or None, verdict) where verdict is "regression", "slower", "faster" or "same".
+    """
+    results = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        for metric, _, significance in METRICS:
+            before, after = baseline[key][metric], candidate[key][metric]
+            if not before or not after:
+                continue
+            old, new = statistics.median(before), statistics.median(after)
+            change = (new - old) / old * 100 if old else 0.0
+            p_value = None
+            if significance:
+                limit = threshold
+                p_value = permutation_p_value(before, after) if len(before) > 1 and len(after) > 1 else None
+                significant = p_value is not None and p_value <= alpha
+            else:
+                limit = SIZE_THRESHOLD
+                significant = True
+            if change > limit:
+                verdict = "regression" if significant else "slower"
+            elif change < -limit:
+                verdict = "faster"
+            else:
+                verdict = "same"
+            results.append((*key, metric, old, new, change, p_value, verdict))
+    return results
+
+
+def _format(metric, value):
+    if metric == "wall_seconds":
+        return f"{value:.3f}"
+    return f"{value / 1024:.1f}"
+
+
+def print_comparison(results, baseline_label, candidate_label):
+    labels = {metric: label for metric, label, _ in METRICS}
+    marks = {"regression": "❌ regression", "slower": "⚠️  worse (not significant)", "faster": "🚀 better", "same": "✅ same"}
+    print(f"\n📊 {candidate_label} vs {baseline_label}")
+    print(f"{'Scale':>6}  {'Stage':<14} {'Metric':<12} {'Baseline':>10} {'Candidate':>10} {'Change':>8} {'p':>6}  Verdict")
+    for scale, stage, metric, old, new, change, p_value, verdict in results:
+        p_text = "-" if p_value is None else f"{p_value:.3f}"
+        print(f"{scale:>5}×  {stage:<14} {labels[metric]:<12} {_format(metric, old):>10} {_format(metric, new):>10} "
+              f"{change:>+7.1f}% {p_text:>6}  {marks[verdict]}")
+
+
+def list_runs(conn, limit):
+    print(f"{'Run':>5}  {'Finished':<25} {'Revision':<14} {'Machine':<13} {'Python':<8} {'Samples':>7}")
+    rows = conn.execute(
+        "SELECT r.*, COUNT(s.run_id) AS sample_count FROM runs r LEFT JOIN samples s ON s.run_id = r.id "
+        "GROUP BY r.id ORDER BY r.id DESC LIMIT ?", (limit,)
+    )
+    for run in rows:
+        revision = run["revision"][:12] + ("+" if run["dirty"] else "")
+        print(f"{run['id']:>5}  {run['finished_at']:<25} {revision:<14} {run['machine']:<13} {run['python']:<8} {run['sample_count']:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub bench-history", description="Inspect and compare recorded benchmark runs.")
+    parser.add_argument("--history", default=HISTORY_PATH, help=f"Benchmark history database (default: {HISTORY_PATH}).")
+    actions = parser.add_subparsers(dest="action", required=True)
+    list_parser = actions.add_parser("list", help="Show the most recent runs.")
+    list_parser.add_argument("-n", "--limit", type=int, default=20, help="Number of runs to show (default: 20).")
+    compare_parser = actions.add_parser("compare", help="Flag regressions of a candidate against a baseline.")
+    compare_parser.add_argument("baseline", nargs="?",
+                                help="Run id or git revision (runs of a revision on this machine are pooled). "
+                                     "Default: the newest run of a different revision.")
+    compare_parser.add_argument("candidate", nargs="?", help="Run id or git revision (default: the latest run).")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"Ignore time and memory changes below this many percent (default: {DEFAULT_THRESHOLD}).")
+    compare_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                                help=f"Significance level for time and memory changes (default: {DEFAULT_ALPHA}).")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.history):
+        print(f"❌ Error: Benchmark history '{args.history}' not found. Run `coursehub bench` first.")
+        return 1
+    conn = connect(args.history)
+    if args.action == "list":
+        list_runs(conn, args.limit)
+        return 0
+
+    machine, _ = machine_fingerprint()
+    default_baseline, default_candidate = default_specs(conn, machine)
+    baseline_spec = args.baseline or default_baseline
+    candidate_spec = args.candidate or default_candidate
+    if baseline_spec is None or candidate_spec is None:
+        print("❌ Error: Need at least two recorded runs on this machine (or name them explicitly).")
+        return 1
+    try:
+        baseline_label, baseline_runs = resolve_runs(conn, baseline_spec, machine)
+        candidate_label, candidate_runs = resolve_runs(conn, candidate_spec, machine)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    if not baseline_runs or not candidate_runs:
+        print(f"❌ Error: No runs match '{baseline_spec if not baseline_runs else candidate_spec}' on this machine ({machine}).")
+        return 1
+    if {run["parameters"] for run in baseline_runs} != {run["parameters"] for run in candidate_runs}:
+        print("⚠️ Warning: The runs used different corpus parameters; the comparison may be meaningless.")
+
+    results = compare(load_samples(conn, baseline_runs), load_samples(conn, candidate_runs), args.threshold, args.alpha)
+    if not results:
+        print("❌ Error: The runs have no (scale, stage) in common.")
+        return 1
+    print_comparison(results, baseline_label, candidate_label)
+    regressions = sum(1 for result in results if result[-1] == "regression")
+    if regressions:
+        print(f"\n❌ {regressions} significant regression(s).")
+        return 1
+    print("\n✅ No significant regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
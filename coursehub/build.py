@@ -0,0 +1,436 @@
+# FILE: coursehub/build.py (`coursehub build`, or update_all_viewers.py in the hub root)
+# PURPOSE: To run from the root folder (e.g., 'Business Analyst') and automatically
+#          generate a modern viewer.html for every single course subfolder with CORRECT paths.
+#          The build is a task graph (see pipeline.py): per course a scan, a catalog update
+#          and a viewer (lessons plus the course's workbooks and PDFs as resources), then the
+#          scan summary (hub_scan.json) and the dashboard (index.html).
+#          The lesson catalog (hub_catalog.sqlite3, see catalog.py) remembers every file and
+#          the content key of every output, so a rerun only regenerates what actually changed.
+#          With --site it also writes a copy of the hub for serving, with the lessons' inlined
+#          assets extracted into a shared store (see assets.py), and both the lessons and
+#          the generated pages minified (see minify.py).
+#          With --watch it keeps running and rebuilds only the touched course plus the dashboard.
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import assets, catalog, dashboard, fswatch, metrics, minify, pipeline, viewer, walker, writer
+
+# --- Configuration ---
+# Course roots, nested group folders and include/exclude rules live in hub_config.json
+# (see walker.py). Since this runs from the root, paths are relative to it.
+SCAN_PATH = "hub_scan.json"
+SCAN_VERSION = 1
+# --- End Configuration ---
+
+
+def build_scan(conn, config):
+    """Builds the machine-readable scan summary from the catalog.
+
+    Only courses that have lessons are listed, in the order they were discovered.
+    """
+    scan_courses = []
+    for course in catalog.course_summaries(conn):
+        lessons = [{"path": row["rel_path"], "size": row["size"]} for row in catalog.lessons(conn, course["path"])]
+        scan_courses.append({
+            "path": course["path"],
+            "name": course["name"],
+            "viewer": f"{course['path']}/viewer.html",
+            "lesson_count": course["lesson_count"],
+            "total_bytes": course["total_bytes"],
+            "lessons": lessons,
+        })
+    return {
+        "version": SCAN_VERSION,
+        "roots": config["roots"],
+        "course_count": len(scan_courses),
+        "lesson_count": sum(course["lesson_count"] for course in scan_courses),
+        "total_bytes": sum(course["total_bytes"] for course in scan_courses),
+        "courses": scan_courses,
+    }
+
+
+def write_json(data, path, indent=None):
+    """Writes JSON via a temp file plus rename (only if it changed). Returns True if written."""
+    return writer.write_if_changed(path, json.dumps(data, indent=indent, sort_keys=True, ensure_ascii=False))
+
+
+def digest(*parts):
+    """sha256 of the JSON form of `parts`; the content key of a build task."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def publish_minified(source, output):
+    """Writes the minified form of the generated page `source` to `output`. Returns
+    [output, bytes before, bytes after] for the site report."""
+    with open(source, "rb") as f:
+        page = f.read()
+    with metrics.phase("minify", output):
+        minified = minify.minify_html(page)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    writer.write_bytes_if_changed(output, minified)
+    metrics.count("minify_bytes_saved", len(page) - len(minified))
+    return [output, len(page), len(minified)]
+
+
+def course_tasks(conn, config, course_path, position, site=None):
+    """The tasks of one course: "scan" walks the folder and reads new or changed files
+    (worker), "catalog" applies the scan to the catalog (local), "viewer" renders
+    viewer.html (worker), keyed by the template, the lessons' content and the resources'
+    paths, and with a `site`, "site" writes the course's lessons there with their assets
+    extracted, a copy of each resource and a minified copy of its viewer (worker), keyed
+    by the lessons', the resources' and the viewer's content."""
+    course = course_path.replace(os.path.sep, '/')
+    known = catalog.known_files(conn, course)
+    scan_name, catalog_name, viewer_name = f"scan:{course_path}", f"catalog:{course_path}", f"viewer:{course_path}"
+    viewer_file_path = os.path.join(course_path, "viewer.html")
+
+    def scan(results):
+        return catalog.scan_course(course_path, known, config)
+
+    def apply(results):
+        records = results[scan_name]
+        with metrics.phase("catalog", course):
+            written, removed = catalog.apply_scan(conn, course, os.path.basename(course_path), position, records)
+        lessons = [record for record in records if record["kind"] == "lesson"]
+        resources = [record for record in records if record["kind"] != "lesson"]
+        return {"written": written, "removed": removed, "lessons": lessons, "lessons_hash": catalog.lessons_hash(lessons),
+                "resources": resources}
+
+    def viewer_key(results):
+        stored = results[catalog_name]
+        # Empty courses write nothing, so there is nothing to cache
+        if not stored["lessons"] and not stored["resources"]:
+            return None
+        return digest(viewer.TEMPLATE_HASH, course_path, stored["lessons_hash"],
+                      [(resource["rel_path"], resource["kind"]) for resource in stored["resources"]])
+
+    def render(results):
+        lessons, resources = results[catalog_name]["lessons"], results[catalog_name]["resources"]
+        if not lessons and not resources:
+            return {"status": "empty", "lessons": 0, "resources": 0}
+        _, home_path, written = viewer.write_viewer(course_path, lessons, resources)
+        return {"status": "generated" if written else "identical", "lessons": len(lessons),
+                "resources": len(resources), "home_path": home_path}
+
+    def site_key(results):
+        stored = results[catalog_name]
+        if not stored["lessons"] and not stored["resources"]:
+            return None
+        return digest(assets.EXTRACT_VERSION, minify.MINIFY_VERSION, site, stored["lessons_hash"],
+                      [(resource["path"], resource["sha256"]) for resource in stored["resources"]],
+                      catalog.hash_file(viewer_file_path))
+
+    def publish(results):
+        stored = results[catalog_name]
+        summary = assets.build_site_lessons(site, stored["lessons"])
+        for resource in stored["resources"]:
+            output = assets.site_path(site, resource["path"])
+            with open(resource["path"].replace("/", os.path.sep), "rb") as f:
+                data = f.read()
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            writer.write_bytes_if_changed(output, data)
+            summary["outputs"].append(output)
+        if stored["lessons"] or stored["resources"]:
+            summary["minified"] = [publish_minified(viewer_file_path, assets.site_path(site, f"{course}/viewer.html"))]
+            summary["outputs"].append(summary["minified"][0][0])
+        return summary
+
+    tasks = [
+        pipeline.Task("scan", course_path, scan),
+        pipeline.Task("catalog", course_path, apply, deps=[scan_name], local=True),
+        pipeline.Task("viewer", course_path, render, deps=[catalog_name], key=viewer_key, outputs=[viewer_file_path]),
+    ]
+    if site:
+        tasks.append(pipeline.Task("site", course_path, publish, deps=[catalog_name, viewer_name], key=site_key))
+    return tasks
+
+
+def hub_tasks(conn, config, all_folders, catalog_names, args):
+    """The hub-wide tasks: once every catalog task is done (or failed), "retain" drops
+    courses that disappeared, then "index" (the scan summary) and "dashboard" are
+    rebuilt if the course list they show changed. All three use the catalog, so all
+    run locally."""
+    def retain(results):
+        with metrics.phase("catalog", "retain courses"):
+            return catalog.retain_courses(conn, [path.replace(os.path.sep, '/') for path in all_folders])
+
+    def index_key(results):
+        courses = [(course["path"], course["name"], course["lessons_hash"]) for course in catalog.course_summaries(conn)]
+        return digest(SCAN_VERSION, config["roots"], args.scan_output, courses)
+
+    def index(results):
+        scan = build_scan(conn, config)
+        written = write_json(scan, args.scan_output, indent=1)
+        return {"courses": scan["course_count"], "lessons": scan["lesson_count"], "written": written}
+
+    def dashboard_key(results):
+        return digest(dashboard.TEMPLATE_HASH, args.dashboard_output, dashboard.load_courses(conn))
+
+    def render_dashboard(results):
+        courses, lessons, written = dashboard.build_dashboard(conn, args.dashboard_output)
+        return {"courses": courses, "lessons": lessons, "written": written}
+
+    def site_index_key(results):
+        return digest(minify.MINIFY_VERSION, args.site, catalog.hash_file(args.dashboard_output))
+
+    def publish_dashboard(results):
+        return {"minified": [publish_minified(args.dashboard_output, os.path.join(args.site, "index.html"))]}
+
+    site_tasks = []
+    if args.site:
+        site_tasks.append(pipeline.Task("site", "index.html", publish_dashboard, deps=["dashboard"], key=site_index_key,
+                                        outputs=[os.path.join(args.site, "index.html")], local=True))
+    return site_tasks + [
+        pipeline.Task("retain", None, retain, deps=catalog_names, local=True, always=True),
+        pipeline.Task("index", None, index, deps=["retain"], key=index_key, outputs=[args.scan_output], local=True),
+        pipeline.Task("dashboard", None, render_dashboard, deps=["retain"], key=dashboard_key,
+                      outputs=[args.dashboard_output], local=True),
+    ]
+
+
+def course_report(course_path, outcomes):
+    """Returns (status, message) for one course, where status is one of "generated",
+    "identical" (rendered, but the file already held those bytes), "skipped" (its key
+    was unchanged), "empty" or "error"."""
+    published = outcomes.get(f"site:{course_path}")
+    if published is not None and published.state == pipeline.FAILED:
+        return "error", f"  -> ❌ Error writing the site copy of {course_path}: {published.error}"
+    scanned = outcomes[f"scan:{course_path}"]
+    if scanned.state == pipeline.FAILED:
+        return "error", f"  -> ❌ Error scanning {course_path}: {scanned.error}"
+    stored = outcomes[f"catalog:{course_path}"]
+    if stored.state == pipeline.FAILED:
+        return "error", f"  -> ❌ Error updating the catalog for {course_path}: {stored.error}"
+    built = outcomes[f"viewer:{course_path}"]
+    if built.state == pipeline.FAILED:
+        return "error", f"  -> ❌ Error writing file for {course_path}: {built.error}"
+    result = built.result
+    viewer_file_path = os.path.join(course_path, "viewer.html")
+    if result["status"] == "empty":
+        return "empty", f"  -> ⚠️ No lesson or resource files found. Skipping."
+    contents = viewer.contents(result["lessons"], result["resources"])
+    if built.state == pipeline.CACHED:
+        return "skipped", f"  -> ⏭️  Unchanged ({contents}). Skipping."
+    if result["status"] == "identical":
+        return "identical", f"  -> 💤 '{viewer_file_path}' is already identical ({contents}). Left untouched."
+    return "generated", (f"  -> ✅ Successfully generated '{viewer_file_path}' with {contents} "
+                         f"and correct home path '{result['home_path']}'.")
+
+
+def output_report(outcome, path, what):
+    """Prints one line about the scan summary or the dashboard. Returns True if it failed."""
+    if outcome.state in (pipeline.FAILED, pipeline.BLOCKED):
+        print(f"❌ Error writing {what} '{path}': {outcome.error}")
+        return True
+    result = outcome.result
+    contents = f"{result['courses']} courses, {result['lessons']} lessons"
+    if outcome.state == pipeline.CACHED:
+        print(f"⏭️  {what.capitalize()} '{path}' ({contents}) is up to date.")
+    elif result["written"]:
+        print(f"✅ Wrote {what} '{path}' ({contents}).")
+    else:
+        print(f"💤 {what.capitalize()} '{path}' ({contents}) is already identical. Left untouched.")
+    return False
+
+
+def run_build(conn, config, all_folders, targets, executor, args, force=False):
+    """Rebuilds `targets` (a subset of `all_folders`) plus the scan summary and dashboard
+    as one task graph, and prints a per-course report. Returns the {status: count} tally.
+
+    Scans and viewers run in the worker pool. The work is dominated by stat/read syscalls
+    on large lesson files, which release the GIL, so threads scale. All catalog reads and
+    writes stay on this thread.
+    """
+    tasks = []
+    for course_path in targets:
+        tasks += course_tasks(conn, config, course_path, all_folders.index(course_path), site=args.site)
+    tasks += hub_tasks(conn, config, all_folders, [task.name for task in tasks if task.kind == "catalog"], args)
+    outcomes = pipeline.run_graph(tasks, executor, conn, force=force)
+    if targets == all_folders:
+        catalog.retain_tasks(conn, [task.name for task in tasks])
+
+    stored = [outcomes[f"catalog:{course_path}"] for course_path in targets]
+    written = sum(outcome.result["written"] for outcome in stored if outcome.state == pipeline.RAN)
+    removed = sum(outcome.result["removed"] for outcome in stored if outcome.state == pipeline.RAN)
+    retained = outcomes["retain"]
+    removed_courses = retained.result if retained.state == pipeline.RAN else 0
+    print(f"🗃️  Catalog synced: {written} file rows written, {removed} removed, {removed_courses} stale courses dropped.")
+
+    counts = {"generated": 0, "identical": 0, "skipped": 0, "empty": 0, "error": 0}
+    for course_path in targets:
+        status, message = course_report(course_path, outcomes)
+        print(f"\nProcessing: {course_path}")
+        print(message)
+        counts[status] += 1
+        metrics.count(f"courses_{status}")
+
+    print(f"\n📋 Generated: {counts['generated']}, identical output: {counts['identical']}, unchanged inputs: {counts['skipped']}, "
+          f"empty: {counts['empty']}, errors: {counts['error']}")
+    if output_report(outcomes["index"], args.scan_output, "scan summary"):
+        counts["error"] += 1
+    if output_report(outcomes["dashboard"], args.dashboard_output, "dashboard"):
+        counts["error"] += 1
+    if args.site:
+        published = outcomes["site:index.html"]
+        if published.state in (pipeline.FAILED, pipeline.BLOCKED):
+            print(f"❌ Error writing the site copy of '{args.dashboard_output}': {published.error}")
+            counts["error"] += 1
+        site_report(outcomes, targets, args.site)
+    return counts
+
+
+def site_report(outcomes, targets, site):
+    """Prints how much the asset extraction saved across the courses' site copies, and
+    what minifying saved on the lessons and on each generated page."""
+    minified = []
+    for name in [f"site:{course_path}" for course_path in targets] + ["site:index.html"]:
+        outcome = outcomes[name]
+        if outcome.state in (pipeline.RAN, pipeline.CACHED):
+            minified += outcome.result.get("minified", [])
+    if minified:
+        before, after = sum(page[1] for page in minified), sum(page[2] for page in minified)
+        print(f"🗜️  Minified {len(minified)} generated pages: {before / 1e3:.1f} KB -> {after / 1e3:.1f} KB.")
+        for output, page_before, page_after in minified:
+            print(f"   -> '{output}': {page_before / 1e3:.1f} KB -> {page_after / 1e3:.1f} KB "
+                  f"({1 - page_after / max(page_before, 1):.0%} saved)")
+
+    lessons = original = verified = rewritten = extracted = inline = sprite_links = font_styles = styles = verbatim = 0
+    unused_rules = unused_bytes = 0
+    shared, sprites, icons, unused = {}, set(), set(), set()
+    for course_path in targets:
+        outcome = outcomes[f"site:{course_path}"]
+        if outcome.state not in (pipeline.RAN, pipeline.CACHED):
+            continue
+        result = outcome.result
+        lessons += result["lessons"]
+        original += result["original_bytes"]
+        verified += result["verified_bytes"]
+        rewritten += result["site_bytes"]
+        extracted += result["extracted"]
+        inline += result["inline"]
+        icons.update(result["sprite_icons"])
+        sprite_links += result["sprite_links"]
+        sprites.update(result["sprites"])
+        font_styles += result["font_styles"]
+        styles += result["styles"]
+        unused_rules += result["unused_rules"]
+        unused_bytes += result["unused_bytes"]
+        unused.update(result["unused_files"])
+        verbatim += len(result["verbatim"])
+        shared.update(result["assets"])
+    if not lessons:
+        return
+    print(f"🌐 Site '{site}': {lessons} lessons, {original / 1e6:.1f} MB -> {rewritten / 1e6:.1f} MB "
+          f"({original / max(rewritten, 1):.1f}x smaller) plus {sum(shared.values()) / 1e6:.1f} MB in {len(shared)} shared assets.")
+    sheets = sum(1 for name in shared if name.endswith(".css") and name not in unused)
+    print(f"   {extracted} data URIs extracted, {inline} left inline; {font_styles} font-face and {styles} other "
+          f"<style> elements moved to {sheets} shared stylesheets; {verbatim} lessons copied verbatim.")
+    if sprites:
+        print(f"   {len(icons)} SVG icons packed into {len(sprites)} sprites, linked {sprite_links} times.")
+    if unused_rules:
+        print(f"   {unused_rules} CSS rules that match nothing ({unused_bytes / 1e6:.1f} MB) moved out of the lessons' styles.")
+    print(f"   Lessons minified after their round trip: {verified / 1e6:.2f} MB -> {rewritten / 1e6:.2f} MB "
+          f"({1 - rewritten / max(verified, 1):.1%} saved).")
+
+
+def affected_courses(changed, course_folders):
+    """Maps changed paths to the course folders that contain them."""
+    prefixes = [(course_path + os.path.sep, course_path) for course_path in course_folders]
+    affected = set()
+    for path in changed:
+        for prefix, course_path in prefixes:
+            if path.startswith(prefix) or path == course_path:
+                affected.add(course_path)
+                break
+    return [course_path for course_path in course_folders if course_path in affected]
+
+
+def watch(conn, executor, config, args):
+    """Rebuilds only the touched courses' viewers (plus the dashboard) as files change."""
+    watcher = fswatch.open_watcher(config["roots"], force_polling=args.poll)
+    mode = "inotify" if isinstance(watcher, fswatch.InotifyWatcher) else "stat polling"
+    print(f"\n👀 Watching {', '.join(config['roots'])} ({mode}). Press Ctrl+C to stop.")
+    known_folders = walker.find_courses(config)
+    try:
+        for changed in fswatch.watch_batches(watcher, debounce=args.debounce):
+            started = time.monotonic()
+            course_folders = walker.find_courses(config)
+            if changed is None:
+                print("\n⚠️ Change events were lost; rescanning every course.")
+                targets = course_folders
+            else:
+                targets = affected_courses(changed, course_folders)
+                # A deleted course folder has no target left but still has to leave the dashboard
+                if not targets and course_folders == known_folders:
+                    continue
+            known_folders = course_folders
+            print(f"\n🔄 {len(targets)} course(s) affected by {'a full rescan' if changed is None else f'{len(changed)} change(s)'}.")
+            run_build(conn, config, course_folders, targets, executor, args)
+            print(f"⏱️  Rebuilt in {time.monotonic() - started:.2f}s.")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    finally:
+        watcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub build",
+                                     description="Generate viewer.html for every course folder, the scan summary and the dashboard.")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the recorded content keys and regenerate every viewer, the scan summary and the dashboard.")
+    parser.add_argument("--config", default=walker.CONFIG_PATH, help=f"Hub configuration file (default: {walker.CONFIG_PATH}).")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH, help=f"Path of the lesson catalog (default: {catalog.CATALOG_PATH}).")
+    parser.add_argument("--scan-output", default=SCAN_PATH, help=f"Where to write the scan summary (default: {SCAN_PATH}).")
+    parser.add_argument("--dashboard-output", default="index.html", help="Where to write the dashboard (default: index.html).")
+    parser.add_argument("--site", nargs="?", const=assets.SITE_PATH, metavar="DIR",
+                        help=f"Also write a copy of the hub for serving, with the lessons' inlined assets extracted "
+                             f"into a shared store (default DIR: {assets.SITE_PATH}).")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of courses to process in parallel (default: number of CPU cores).")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the initial build, keep running and rebuild touched courses and the dashboard on change.")
+    parser.add_argument("--debounce", type=float, default=fswatch.DEFAULT_DEBOUNCE,
+                        help=f"Seconds of quiet to wait before rebuilding in --watch mode (default: {fswatch.DEFAULT_DEBOUNCE}).")
+    parser.add_argument("--poll", action="store_true", help="In --watch mode, use stat polling even where inotify is available.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    with metrics.session("build", args):
+        return build_hub(args)
+
+
+def build_hub(args):
+    """The whole `coursehub build` run for parsed command-line arguments. Returns the exit code."""
+    print("🚀 Starting viewer generation process...")
+
+    config = walker.load_config(args.config)
+    course_folders = walker.find_courses(config)
+    if not course_folders:
+        print(f"❌ Error: No course folders found. Make sure the roots in '{args.config}' are correct.")
+        return 1
+
+    jobs = min(args.jobs, len(course_folders))
+    print(f"Found {len(course_folders)} course folders to process ({jobs} parallel job{'s' if jobs != 1 else ''}).")
+
+    conn = catalog.connect(args.catalog)
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="course-worker") as executor:
+        counts = run_build(conn, config, course_folders, course_folders, executor, args, force=args.force)
+        if counts["generated"]:
+            print("\n🎉 All viewers have been updated with correct paths! Please hard-refresh your browser (Ctrl+Shift+R or Cmd+Shift+R).")
+        else:
+            print("\n🎉 All viewers are already up to date.")
+
+        if args.watch:
+            watch(conn, executor, config, args)
+    conn.close()
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,288 @@
+# FILE: coursehub/cache.py (`coursehub cache export|import|verify`)
+# PURPOSE: Carry the build cache to another checkout or machine as one plain .tar.gz.
+#          The archive holds the catalog's rows (every file's hash and probed metadata,
+#          the course digests and each build task's content key) plus every file the
+#          recorded tasks wrote, and a manifest with the sha256 of each member. Import
+#          checks the whole archive before it touches anything, and only writes members
+#          that an imported task row lists as an output with the same hash, so an archive
+#          cannot place files anywhere else in the hub. It then adopts the rows of local
+#          files whose sha256 matches (or, with --trust-sizes, only their size) and puts
+#          the outputs in place, so the next `coursehub build` finds everything up to date
+#          instead of probing every lesson and rendering every page again.
+import argparse
+import hashlib
+import io
+import json
+import os
+import posixpath
+import tarfile
+import time
+
+from . import __version__, catalog, metrics, writer
+
+# --- Configuration ---
+ARCHIVE_PATH = "hub_cache.tar.gz"
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+ROWS_NAME = "catalog.json"
+OUTPUTS_PREFIX = "outputs/"
+# --- End Configuration ---
+
+
+def archive_path(path):
+    """The '/'-separated hub-relative form of `path`, or None if it lies outside the hub."""
+    if os.path.isabs(path):
+        return None
+    normalized = posixpath.normpath(path.replace(os.path.sep, "/"))
+    if normalized == "." or normalized.startswith("../") or normalized == "..":
+        return None
+    return normalized
+
+
+def _add(tar, name, data, mtime):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = mtime
+    info.mode = 0o644
+    tar.addfile(info, io.BytesIO(data))
+    return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+def export_cache(conn, path):
+    """Writes the archive (via a temp file plus rename). Returns (tasks, outputs, skipped task names).
+
+    A task whose outputs are missing, changed since it wrote them or lie outside the
+    hub is left out, so it simply runs again after import.
+    """
+    rows = catalog.export_rows(conn)
+    tasks, outputs, skipped = [], [], []
+    for task in rows["tasks"]:
+        fingerprints = json.loads(task["outputs"])
+        paths = [path for path, _, _ in fingerprints]
+        relative = [archive_path(output) for output in paths]
+        if None in relative or not catalog.outputs_intact(fingerprints):
+            skipped.append(task["name"])
+            continue
+        tasks.append(dict(task, outputs=json.dumps([[name, size, sha256] for name, (_, size, sha256) in zip(relative, fingerprints)])))
+        outputs.extend(zip(paths, relative))
+    rows["tasks"] = tasks
+
+    now = int(time.time())
+    members = {}
+    tmp_path = path + ".tmp"
+    with tarfile.open(tmp_path, "w:gz") as tar:
+        members[ROWS_NAME] = _add(tar, ROWS_NAME, json.dumps(rows, sort_keys=True, ensure_ascii=False).encode("utf-8"), now)
+        for local, relative in sorted(set(outputs), key=lambda output: output[1]):
+            with metrics.phase("read", local):
+                with open(local, "rb") as f:
+                    data = f.read()
+            members[OUTPUTS_PREFIX + relative] = _add(tar, OUTPUTS_PREFIX + relative, data, int(os.stat(local).st_mtime))
+        # The manifest goes last, once every member's hash is known
+        manifest = {
+            "version": ARCHIVE_VERSION,
+            "coursehub": __version__,
+            "schema_version": catalog.SCHEMA_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "members": members,
+        }
+        _add(tar, MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"), now)
+    os.replace(tmp_path, path)
+    return len(tasks), len(members) - 1, skipped
+
+
+def verify_archive(tar):
+    """Checks every member against the manifest. Returns (manifest, [problems])."""
+    try:
+        manifest = json.load(tar.extractfile(tar.getmember(MANIFEST_NAME)))
+    except (KeyError, ValueError, AttributeError) as e:
+        return None, [f"unreadable manifest ({e})"]
+    if manifest.get("version") != ARCHIVE_VERSION:
+        return manifest, [f"archive version {manifest.get('version')} (this coursehub reads version {ARCHIVE_VERSION})"]
+    expected = manifest["members"]
+    problems = []
+    seen = set()
+    for info in tar:
+        if info.name == MANIFEST_NAME:
+            continue
+        if info.name not in expected:
+            problems.append(f"{info.name}: not listed in the manifest")
+            continue
+        if not info.isfile():
+            problems.append(f"{info.name}: not a regular file")
+            continue
+        if info.name.startswith(OUTPUTS_PREFIX) and archive_path(info.name[len(OUTPUTS_PREFIX):]) != info.name[len(OUTPUTS_PREFIX):]:
+            problems.append(f"{info.name}: path leaves the hub")
+            continue
+        digest = hashlib.sha256()
+        f = tar.extractfile(info)
+        for chunk in iter(lambda: f.read(catalog.HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        if digest.hexdigest() != expected[info.name]["sha256"] or info.size != expected[info.name]["size"]:
+            problems.append(f"{info.name}: checksum mismatch")
+        seen.add(info.name)
+    problems.extend(f"{name}: missing from the archive" for name in sorted(set(expected) - seen))
+    return manifest, problems
+
+
+def check_outputs(tasks, manifest):
+    """Checks that every output member of the archive is a file one of the exported task
+    rows wrote, with the size and sha256 that row recorded. Returns [problems]."""
+    declared, problems = {}, []
+    for task in tasks:
+        try:
+            fingerprints = json.loads(task["outputs"])
+        except (TypeError, ValueError):
+            problems.append(f"task {task['name']}: unreadable output list")
+            continue
+        for path, size, sha256 in fingerprints:
+            if archive_path(path) != path:
+                problems.append(f"task {task['name']}: output '{path}' is not a hub-relative path")
+                continue
+            declared[OUTPUTS_PREFIX + path] = {"sha256": sha256, "size": size}
+    for name, member in manifest["members"].items():
+        if not name.startswith(OUTPUTS_PREFIX):
+            continue
+        if name not in declared:
+            problems.append(f"{name}: not an output of any task in the archive")
+        elif declared[name] != {"sha256": member["sha256"], "size": member["size"]}:
+            problems.append(f"{name}: differs from what its task recorded")
+    return problems
+
+
+def adopt_files(files, trust_sizes=False):
+    """Pairs exported file rows with the local files. Returns (adopted rows, missing, differing).
+
+    A row is adopted when the local file has the same size and sha256 (with
+    `trust_sizes`, the same size is enough); it then carries the local mtime, so later
+    scans trust its hash without reading the file.
+    """
+    adopted, missing, differing = [], 0, 0
+    for row in files:
+        local = row["path"].replace("/", os.path.sep)
+        try:
+            stat = os.stat(local)
+        except OSError:
+            missing += 1
+            continue
+        if stat.st_size != row["size"]:
+            differing += 1
+            continue
+        if not trust_sizes:
+            with metrics.phase("hash", local):
+                if catalog.hash_file(local) != row["sha256"]:
+                    differing += 1
+                    continue
+        adopted.append(dict(row, mtime_ns=stat.st_mtime_ns))
+    return adopted, missing, differing
+
+
+def import_cache(conn, path, trust_sizes=False):
+    """Verifies the archive, merges its rows and writes its outputs. Returns the exit code."""
+    with tarfile.open(path, "r:*") as tar:
+        with metrics.phase("verify", path):
+            manifest, problems = verify_archive(tar)
+        if problems:
+            print(f"❌ Error: '{path}' failed its integrity check; nothing was imported.")
+            for problem in problems[:20]:
+                print(f"  -> {problem}")
+            return 1
+        if manifest["schema_version"] != catalog.SCHEMA_VERSION:
+            print(f"❌ Error: '{path}' holds catalog schema {manifest['schema_version']}; this coursehub uses "
+                  f"{catalog.SCHEMA_VERSION}. Export it again with this version.")
+            return 1
+        rows = json.load(tar.extractfile(ROWS_NAME))
+        problems = check_outputs(rows["tasks"], manifest)
+        if problems:
+            print(f"❌ Error: '{path}' holds files its task rows do not account for; nothing was imported.")
+            for problem in problems[:20]:
+                print(f"  -> {problem}")
+            return 1
+        files, missing, differing = adopt_files(rows["files"], trust_sizes)
+        adopted_courses = {row["course"] for row in files}
+        courses = [row for row in rows["courses"] if row["path"] in adopted_courses]
+        tasks = [dict(task, outputs=json.dumps([[path.replace("/", os.path.sep), size, sha256]
+                                                for path, size, sha256 in json.loads(task["outputs"])]))
+                 for task in rows["tasks"]]
+        catalog.import_rows(conn, courses, files, tasks)
+
+        written = unchanged = 0
+        for name in sorted(manifest["members"]):
+            if not name.startswith(OUTPUTS_PREFIX):
+                continue
+            local = name[len(OUTPUTS_PREFIX):].replace("/", os.path.sep)
+            if os.path.dirname(local):
+                os.makedirs(os.path.dirname(local), exist_ok=True)
+            if writer.write_bytes_if_changed(local, tar.extractfile(name).read()):
+                written += 1
+            else:
+                unchanged += 1
+
+    print(f"🗃️  Adopted {len(files)} of {len(rows['files'])} file rows ({missing} missing here, {differing} different) "
+          f"and {len(tasks)} task results.")
+    print(f"📦 Outputs: {written} written, {unchanged} already identical.")
+    if missing or differing:
+        print("ℹ️  Run `coursehub build` to bring what differs here up to date.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub cache", description="Export or import the build cache as one archive.")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH, help=f"Path of the lesson catalog (default: {catalog.CATALOG_PATH}).")
+    metrics.add_arguments(parser, metrics_path=None)
+    actions = parser.add_subparsers(dest="action", required=True)
+    export_parser = actions.add_parser("export", help="Write the catalog rows and every cached output to an archive.")
+    export_parser.add_argument("archive", nargs="?", default=ARCHIVE_PATH, help=f"Archive to write (default: {ARCHIVE_PATH}).")
+    import_parser = actions.add_parser("import", help="Check an archive and adopt its cache in this hub.")
+    import_parser.add_argument("archive", nargs="?", default=ARCHIVE_PATH, help=f"Archive to read (default: {ARCHIVE_PATH}).")
+    import_parser.add_argument("--trust-sizes", action="store_true",
+                               help="Adopt a file row when the local file has the same size, without hashing it. "
+                                    "Faster, but a local file that differs at the same size keeps the exported hash.")
+    verify_parser = actions.add_parser("verify", help="Check an archive's members against its manifest.")
+    verify_parser.add_argument("archive", nargs="?", default=ARCHIVE_PATH, help=f"Archive to check (default: {ARCHIVE_PATH}).")
+    args = parser.parse_args(argv)
+
+    with metrics.session("cache", args):
+        return run(args)
+
+
+def run(args):
+    """Carries out the parsed `coursehub cache` action. Returns the exit code."""
+    if args.action == "export":
+        if not os.path.exists(args.catalog):
+            print(f"❌ Error: Lesson catalog '{args.catalog}' not found. Run `coursehub build` first.")
+            return 1
+        conn = catalog.connect(args.catalog)
+        tasks, outputs, skipped = export_cache(conn, args.archive)
+        conn.close()
+        print(f"📦 Exported {tasks} task results and {outputs} outputs to '{args.archive}' "
+              f"({os.path.getsize(args.archive) / 1e6:.1f} MB).")
+        if skipped:
+            print(f"⚠️ Left out {len(skipped)} task(s) whose outputs are missing, changed or outside the hub.")
+        return 0
+
+    if not os.path.exists(args.archive):
+        print(f"❌ Error: Archive '{args.archive}' not found.")
+        return 1
+    try:
+        if args.action == "verify":
+            with tarfile.open(args.archive, "r:*") as tar:
+                manifest, problems = verify_archive(tar)
+            for problem in problems:
+                print(f"  -> {problem}")
+            if problems:
+                print(f"❌ '{args.archive}' failed its integrity check ({len(problems)} problem(s)).")
+                return 1
+            print(f"✅ '{args.archive}' is intact ({len(manifest['members'])} members, created {manifest['created_at']}).")
+            return 0
+        conn = catalog.connect(args.catalog)
+        try:
+            return import_cache(conn, args.archive, trust_sizes=args.trust_sizes)
+        finally:
+            conn.close()
+    except (tarfile.TarError, OSError, EOFError) as e:
+        print(f"❌ Error: Cannot read '{args.archive}': {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
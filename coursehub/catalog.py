@@ -0,0 +1,290 @@
+# FILE: coursehub/catalog.py
+# PURPOSE: Persistent SQLite catalog of every lesson, workbook and PDF in the course tree.
+#          `coursehub build` keeps it in sync (one row update per changed file) and both
+#          the viewer and dashboard generators query it instead of rescanning the folders.
+#          It also records the content key and result of every cached build task (see
+#          pipeline.py).
+import hashlib
+import json
+import os
+import sqlite3
+
+from . import metrics, singlefile, walker
+
+# --- Configuration ---
+CATALOG_PATH = "hub_catalog.sqlite3"
+SCHEMA_VERSION = 5
+HASH_CHUNK_SIZE = 1024 * 1024
+# --- End Configuration ---
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    path          TEXT PRIMARY KEY,
+    name          TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    lessons_hash  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    course      TEXT NOT NULL REFERENCES courses(path) ON DELETE CASCADE,
+    rel_path    TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    sha256      TEXT NOT NULL,
+    title       TEXT,
+    source_url  TEXT,
+    captured_at TEXT
+);
+CREATE INDEX IF NOT EXISTS files_by_course ON files(course, kind, rel_path);
+CREATE INDEX IF NOT EXISTS files_by_url ON files(source_url);
+CREATE TABLE IF NOT EXISTS tasks (
+    name   TEXT PRIMARY KEY,
+    key     TEXT NOT NULL,
+    result  TEXT NOT NULL,
+    outputs TEXT NOT NULL    -- JSON list of [path, size, sha256], one per file the task wrote
+);
+"""
+
+FILE_COLUMNS = ("path", "course", "rel_path", "kind", "size", "mtime_ns", "sha256", "title", "source_url", "captured_at")
+
+
+def connect(path=CATALOG_PATH):
+    """Opens (and if needed creates) the catalog database."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS files")
+            conn.execute("DROP TABLE IF EXISTS courses")
+            conn.execute("DROP TABLE IF EXISTS tasks")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def hash_file(path):
+    """Returns the sha256 of a file, read in chunks so multi-MB lessons are never held in memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def output_fingerprints(paths):
+    """[path, size, sha256] of each file a build task wrote; [path, None, None] if it is missing."""
+    fingerprints = []
+    for path in paths:
+        try:
+            fingerprints.append([path, os.path.getsize(path), hash_file(path)])
+        except OSError:
+            fingerprints.append([path, None, None])
+    return fingerprints
+
+
+def outputs_intact(fingerprints):
+    """True if every recorded output still holds the bytes the task wrote. The size is
+    compared first, so an output that was cut short or grew is never hashed."""
+    for path, size, sha256 in fingerprints:
+        try:
+            if size is None or os.path.getsize(path) != size or hash_file(path) != sha256:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def lessons_hash(lessons):
+    """Digest of the content of a course's lesson rows (in rel_path order).
+
+    The mtime is left out: a lesson saved again with the same bytes changes nothing
+    that is generated from it.
+    """
+    digest = hashlib.sha256()
+    for lesson in lessons:
+        fields = (lesson['rel_path'], lesson['size'], lesson['sha256'],
+                  lesson['title'], lesson['source_url'], lesson['captured_at'])
+        digest.update("\0".join(str(field) for field in fields).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def scan_course(course_path, known, config):
+    """Walks one course folder and returns a file record for every catalogued file.
+
+    `known` maps catalog paths to their current rows; a file whose size and mtime
+    match its row is reused as-is, so an unchanged course costs one stat per file
+    (taken by the walker from its DirEntry). Touches no database state, so it is
+    safe to call from worker threads.
+    """
+    course = course_path.replace(os.path.sep, '/')
+    records = []
+    for hub_file in walker.walk_course(course_path, config):
+        path = f"{course}/{hub_file.rel_path}"
+        previous = known.get(path)
+        if previous and previous["size"] == hub_file.size and previous["mtime_ns"] == hub_file.mtime_ns:
+            records.append(dict(previous))
+            metrics.count("files_reused")
+            continue
+        with metrics.phase("read", path):
+            title = source_url = captured_at = None
+            if hub_file.kind == "lesson":
+                with metrics.span("probe"):
+                    title, source_url, captured_at = singlefile.probe(hub_file.path)
+                # The header is read again by the hash below, so it is counted apart from bytes_read
+                metrics.count("bytes_probed", min(hub_file.size, singlefile.HEADER_READ_SIZE))
+            sha256 = hash_file(hub_file.path)
+        metrics.count("files_read")
+        metrics.count("bytes_read", hub_file.size)
+        records.append({
+            "path": path,
+            "course": course,
+            "rel_path": hub_file.rel_path,
+            "kind": hub_file.kind,
+            "size": hub_file.size,
+            "mtime_ns": hub_file.mtime_ns,
+            "sha256": sha256,
+            "title": title,
+            "source_url": source_url,
+            "captured_at": captured_at,
+        })
+    records.sort(key=lambda record: record["path"])
+    return records
+
+
+def known_files(conn, course):
+    """Returns {path: row} for every catalogued file of a course."""
+    rows = conn.execute("SELECT * FROM files WHERE course = ?", (course,))
+    return {row["path"]: dict(row) for row in rows}
+
+
+def apply_scan(conn, course, name, position, records):
+    """Brings a course's rows in line with a fresh scan inside one transaction.
+
+    Only rows that were added, changed or removed are written.
+    Returns (written, removed) row counts.
+    """
+    existing = known_files(conn, course)
+    written = 0
+    # Records are sorted by path, which within one course is rel_path order
+    digest = lessons_hash([record for record in records if record["kind"] == "lesson"])
+    with conn:
+        conn.execute(
+            "INSERT INTO courses (path, name, position, lessons_hash) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET name = excluded.name, position = excluded.position, "
+            "lessons_hash = excluded.lessons_hash",
+            (course, name, position, digest),
+        )
+        for record in records:
+            if existing.pop(record["path"], None) == record:
+                continue
+            conn.execute(
+                f"INSERT OR REPLACE INTO files ({', '.join(FILE_COLUMNS)}) VALUES ({', '.join('?' * len(FILE_COLUMNS))})",
+                [record[column] for column in FILE_COLUMNS],
+            )
+            written += 1
+        conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in existing])
+    return written, len(existing)
+
+
+def retain_courses(conn, ordered):
+    """Deletes every course (and its files) not listed in `ordered` and renumbers the rest
+    in that order. Returns the number of courses removed."""
+    positions = {path: position for position, path in enumerate(ordered)}
+    stale = [row["path"] for row in conn.execute("SELECT path FROM courses") if row["path"] not in positions]
+    with conn:
+        conn.executemany("DELETE FROM courses WHERE path = ?", [(path,) for path in stale])
+        conn.executemany("UPDATE courses SET position = ? WHERE path = ? AND position != ?",
+                         [(position, path, position) for path, position in positions.items()])
+    return len(stale)
+
+
+def lessons(conn, course):
+    """Returns a course's lesson rows ordered by their path inside the course."""
+    return conn.execute(
+        "SELECT * FROM files WHERE course = ? AND kind = 'lesson' ORDER BY rel_path", (course,)
+    ).fetchall()
+
+
+def task_state(conn, name):
+    """Returns (key, result JSON, output fingerprints JSON) recorded for a build task's last successful run, or None."""
+    row = conn.execute("SELECT key, result, outputs FROM tasks WHERE name = ?", (name,)).fetchone()
+    return (row["key"], row["result"], row["outputs"]) if row else None
+
+
+def task_results(conn, prefix):
+    """Yields (name, result) for every recorded task whose name starts with `prefix`."""
+    for row in conn.execute("SELECT name, result FROM tasks WHERE substr(name, 1, ?) = ? ORDER BY name", (len(prefix), prefix)):
+        yield row["name"], json.loads(row["result"])
+
+
+def set_task_state(conn, name, key, result, outputs):
+    """Records the content key a build task ran with, its result and the fingerprints of
+    the files it wrote (as JSON, see output_fingerprints())."""
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO tasks (name, key, result, outputs) VALUES (?, ?, ?, ?)",
+                     (name, key, result, outputs))
+
+
+def retain_tasks(conn, names):
+    """Forgets every recorded task not in `names` whose kind (the part of its name before
+    ":") is the kind of one of `names`. Tasks of kinds a build did not schedule, such as
+    the site: tasks of a build without --site, are kept for the next build that does.
+    Returns the number removed."""
+    keep = set(names)
+    kinds = {name.partition(":")[0] for name in keep}
+    stale = [row["name"] for row in conn.execute("SELECT name FROM tasks")
+             if row["name"] not in keep and row["name"].partition(":")[0] in kinds]
+    with conn:
+        conn.executemany("DELETE FROM tasks WHERE name = ?", [(name,) for name in stale])
+    return len(stale)
+
+
+def course_summaries(conn):
+    """Returns one row per course that has lessons: path, name, lessons_hash, lesson_count, total_bytes."""
+    return conn.execute(
+        "SELECT c.path, c.name, c.lessons_hash, COUNT(f.path) AS lesson_count, COALESCE(SUM(f.size), 0) AS total_bytes "
+        "FROM courses c JOIN files f ON f.course = c.path AND f.kind = 'lesson' "
+        "GROUP BY c.path ORDER BY c.position"
+    ).fetchall()
+
+
+def course_listing(conn):
+    """Returns one row per course that has lessons or resources (workbooks, PDFs): path,
+    name, lesson_count and resource_count, in display order."""
+    return conn.execute(
+        "SELECT c.path, c.name, SUM(f.kind = 'lesson') AS lesson_count, SUM(f.kind != 'lesson') AS resource_count "
+        "FROM courses c JOIN files f ON f.course = c.path "
+        "GROUP BY c.path ORDER BY c.position"
+    ).fetchall()
+
+
+def export_rows(conn):
+    """Every course, file and task row as plain dicts, for `coursehub cache export`.
+
+    File mtimes are left out: they only mean something on the machine that took them.
+    """
+    return {
+        "courses": [dict(row) for row in conn.execute("SELECT path, name, position, lessons_hash FROM courses ORDER BY path")],
+        "files": [{column: row[column] for column in FILE_COLUMNS if column != "mtime_ns"}
+                  for row in conn.execute("SELECT * FROM files ORDER BY path")],
+        "tasks": [dict(row) for row in conn.execute("SELECT name, key, result, outputs FROM tasks ORDER BY name")],
+    }
+
+
+def import_rows(conn, courses, files, tasks):
+    """Merges exported rows into the catalog inside one transaction. `files` rows must
+    carry the local mtime_ns of the file they describe."""
+    with conn:
+        conn.executemany(
+            "INSERT INTO courses (path, name, position, lessons_hash) VALUES (:path, :name, :position, :lessons_hash) "
+            "ON CONFLICT(path) DO UPDATE SET name = excluded.name, position = excluded.position, "
+            "lessons_hash = excluded.lessons_hash",
+            courses,
+        )
+        conn.executemany(
+            f"INSERT OR REPLACE INTO files ({', '.join(FILE_COLUMNS)}) VALUES ({', '.join(':' + column for column in FILE_COLUMNS)})",
+            files,
+        )
+        conn.executemany("INSERT OR REPLACE INTO tasks (name, key, result, outputs) VALUES (:name, :key, :result, :outputs)", tasks)
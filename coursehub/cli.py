@@ -0,0 +1,41 @@
+# FILE: coursehub/cli.py
+# PURPOSE: The `coursehub` command. Each subcommand is the main() of one module, so a
+#          whole batch of courses is handled in a single interpreter with the templates
+#          loaded once, instead of one python3 process per course folder.
+import argparse
+
+from . import __version__, assets, bench, benchhistory, build, cache, dashboard, neardup, scanner, snapshots, synthetic, viewer, walker
+
+COMMANDS = {
+    "build": (build.main, "Sync the catalog and regenerate every changed viewer (update_all_viewers.py)."),
+    "viewer": (viewer.main, "Generate viewer.html for the given course folders."),
+    "dashboard": (dashboard.main, "Generate index.html from the catalog (generate_dashboard.py)."),
+    "assets": (assets.main, "Verify or undo the asset extraction of `build --site`."),
+    "cache": (cache.main, "Export the build cache to an archive or import one (hub_cache.tar.gz)."),
+    "snapshots": (snapshots.main, "Keep every lesson in a delta-compressed store (hub_snapshots.sqlite3)."),
+    "scan": (scanner.main, "Inventory the data: URIs, style and script blocks of every lesson (mmap)."),
+    "similar": (neardup.main, "Find clusters of near-identical lessons by their visible text."),
+    "courses": (walker.main, "List the course folders below the configured roots."),
+    "synth": (synthetic.main, "Generate a synthetic hub shaped like the real one."),
+    "bench": (bench.main, "Benchmark the build on synthetic hubs at 10x, 100x and 1000x size."),
+    "bench-history": (benchhistory.main, "List recorded benchmark runs or compare two for regressions."),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="coursehub",
+        description="Business Analyst course hub generator. Run from the hub root.",
+        epilog="\n".join(f"  {name:<14} {summary}" for name, (_, summary) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("command", choices=COMMANDS, metavar="command", help="One of: " + ", ".join(COMMANDS) + ".")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the command (see `coursehub <command> -h`).")
+    args = parser.parse_args(argv)
+    command, _ = COMMANDS[args.command]
+    return command(args.args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,285 @@
+# FILE: coursehub/deadcss.py
+# PURPOSE: Find the CSS rules of a SingleFile capture that cannot match anything in it.
+#          A capture carries the learning platform's whole stylesheet, while one exam or
+#          project page uses a fraction of it. Each element of a page is reduced to the
+#          tag name, classes, id and attribute names it carries, and a style rule is dead
+#          when every selector in its list asks for a combination no element has. The
+#          matching errs towards keeping: pseudo-classes and pseudo-elements are ignored
+#          (a :hover or :checked state comes and goes), combinators are not followed,
+#          @media and @supports blocks live while any rule inside them does, @keyframes
+#          live while a live rule names them, and anything not understood is kept. Pages
+#          with scripts, which could add elements or classes later, are never pruned.
+import html
+import re
+
+# --- Configuration ---
+# At-rules whose block holds style rules: the block is dead once every rule in it is
+GROUPING_AT_RULES = {b"media", b"supports", b"layer", b"container", b"document", b"-moz-document"}
+KEYFRAMES_AT_RULES = {b"keyframes", b"-webkit-keyframes", b"-moz-keyframes", b"-o-keyframes"}
+# Elements the HTML parser creates even when the markup leaves them out
+IMPLIED_ELEMENTS = ("html", "head", "body", "tbody")
+# SingleFile's own script, which only attaches the captured shadow roots
+SHADOW_ROOT_SCRIPT = b"data-template-shadow-root"
+# Pseudo-classes and -elements that reach across shadow trees; rules using them are kept
+SHADOW_PSEUDOS = {"host", "host-context", "slotted", "part", "deep"}
+# --- End Configuration ---
+
+# Comments and raw-text elements are skipped whole; every other start tag is an element
+MARKUP = re.compile(rb"<!--.*?-->|<(script|style)\b([^>]*)>.*?</\1\s*>|<([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+                    re.S | re.I)
+ATTRIBUTE = re.compile(rb"""([^\s"'=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+# The tokens that decide a stylesheet's structure; strings, comments and escapes are
+# matched whole so the braces inside them do not count
+CSS_TOKEN = re.compile(rb"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|/\*.*?(?:\*/|\Z)|\\.|[{};]", re.S)
+CSS_SPACE = re.compile(rb"(?:\s|/\*.*?\*/)*", re.S)
+CSS_COMMENT = re.compile(rb"/\*.*?\*/", re.S)
+AT_RULE = re.compile(rb"@([\w-]+)\s*(.*)", re.S)
+ANIMATION = re.compile(rb"animation(?:-name)?\s*:([^;}]*)", re.I)
+CSS_NAME = re.compile(rb"[A-Za-z_-][\w-]*")
+IDENT = r"(?:[\w-]|\\[0-9a-fA-F]{1,6}\s?|\\[^\n0-9a-fA-F])+"
+SIMPLE_SELECTOR = re.compile(
+    r"(?P<combinator>\s*[>+~]\s*|\s+)"
+    rf"|(?P<kind>[#.]?)(?P<name>{IDENT})"
+    r"|(?P<universal>\*)"
+    rf"|\[\s*(?P<attribute>{IDENT})\s*(?:[~|^$*]?=\s*(?:\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|{IDENT})\s*(?:[iIsS]\s*)?)?\]"
+    rf"|::?(?P<pseudo>{IDENT})(?P<arguments>\()?")
+ESCAPE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?|\\(.)", re.S)
+ALL_ANIMATIONS = b"var("  # an animation named through a custom property could be any of them
+
+
+class Document:
+    """What the selectors of a page (or of several pages together) can match.
+
+    `signatures` holds one frozenset of features per distinct kind of element: "t:"
+    plus the tag name, "c:" each class, "i:" the id and "a:" each attribute name, all
+    lowercased so that case never makes a rule look dead. `animations` collects the
+    names used in style="" attributes.
+    """
+
+    def __init__(self):
+        self.signatures = {frozenset([f"t:{name}"]) for name in IMPLIED_ELEMENTS}
+        self.animations = set()
+        self.scripted = False
+
+    def add(self, page):
+        """Adds the elements of one page's markup."""
+        for match in MARKUP.finditer(page):
+            if match.group(1) is None and match.group(3) is None:
+                continue
+            if match.group(1) is not None:
+                tag, attributes = match.group(1), match.group(2)
+                if tag.lower() == b"script" and SHADOW_ROOT_SCRIPT not in attributes:
+                    self.scripted = True
+            else:
+                tag, attributes = match.group(3), match.group(4)
+            features = [f"t:{tag.decode('utf-8', 'replace').lower()}"]
+            for name, value in _attributes(attributes):
+                features.append(f"a:{name}")
+                if name == "class":
+                    features.extend(f"c:{token}" for token in value.lower().split())
+                elif name == "id":
+                    features.append(f"i:{value.lower()}")
+                elif name == "style":
+                    _collect_animations(value.encode("utf-8"), self.animations)
+            self.signatures.add(frozenset(features))
+
+    def update(self, other):
+        self.signatures |= other.signatures
+        self.animations |= other.animations
+        self.scripted = self.scripted or other.scripted
+
+
+def _attributes(markup):
+    for match in ATTRIBUTE.finditer(markup):
+        value = next((group for group in match.groups()[1:] if group is not None), b"")
+        yield match.group(1).decode("utf-8", "replace").lower(), html.unescape(value.decode("utf-8", "replace"))
+
+
+def _collect_animations(declarations, names):
+    for match in ANIMATION.finditer(declarations):
+        value = match.group(1)
+        if ALL_ANIMATIONS in value:
+            names.add(ALL_ANIMATIONS)
+        names.update(CSS_NAME.findall(value))
+
+
+def animation_names(css, names):
+    """Adds every animation name any rule of `css` uses to `names`, live or not; for
+    stylesheets that are kept whole, which may name @keyframes defined elsewhere."""
+    _collect_animations(CSS_COMMENT.sub(b" ", css), names)
+
+
+class Matcher:
+    """Answers whether some element of a Document carries a set of features."""
+
+    def __init__(self, document):
+        self.index = {}
+        for number, signature in enumerate(document.signatures):
+            for feature in signature:
+                self.index.setdefault(feature, set()).add(number)
+        self.memo = {}
+
+    def can_match(self, features):
+        if features not in self.memo:
+            candidates = sorted((self.index.get(feature, set()) for feature in features), key=len)
+            self.memo[features] = not candidates or bool(candidates[0].intersection(*candidates[1:]))
+        return self.memo[features]
+
+
+def _unescape(ident):
+    return ESCAPE.sub(lambda match: chr(int(match.group(1), 16)) if match.group(1) else match.group(2), ident).lower()
+
+
+def _skip_arguments(selector, position):
+    """Position just past the ')' closing the pseudo-class arguments that start at `position`."""
+    depth = 1
+    while position < len(selector) and depth:
+        char = selector[position]
+        if char in "\"'":
+            end = selector.find(char, position + 1)
+            position = len(selector) if end < 0 else end
+        elif char == "\\":
+            position += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        position += 1
+    return position if depth == 0 else None
+
+
+def compounds(selector):
+    """The feature sets of the compound selectors in `selector`, or None if it uses
+    anything this module does not understand (and so must be assumed to match)."""
+    result, features, position = [], set(), 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = SIMPLE_SELECTOR.match(selector, position)
+        if match is None:
+            return None
+        position = match.end()
+        if match.group("combinator") is not None:
+            result.append(frozenset(features))
+            features = set()
+        elif match.group("name") is not None:
+            prefix = {"#": "i", ".": "c", "": "t"}[match.group("kind")]
+            features.add(f"{prefix}:{_unescape(match.group('name'))}")
+        elif match.group("attribute") is not None:
+            features.add(f"a:{_unescape(match.group('attribute'))}")
+        elif match.group("pseudo") is not None:
+            if _unescape(match.group("pseudo")) in SHADOW_PSEUDOS:
+                return None
+            if match.group("arguments"):
+                position = _skip_arguments(selector, position)
+                if position is None:
+                    return None
+    result.append(frozenset(features))
+    return result
+
+
+def split_selectors(text):
+    """Splits a selector list at its top-level commas."""
+    parts, depth, start, position = [], 0, 0, 0
+    while position < len(text):
+        char = text[position]
+        if char in "\"'":
+            end = text.find(char, position + 1)
+            position = len(text) if end < 0 else end
+        elif char == "\\":
+            position += 1
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+        position += 1
+    parts.append(text[start:])
+    return parts
+
+
+def selector_can_match(prelude, matcher):
+    text = CSS_COMMENT.sub(b" ", prelude).decode("utf-8", "replace")
+    for selector in split_selectors(text):
+        parts = compounds(selector)
+        if parts is None or all(matcher.can_match(features) for features in parts):
+            return True
+    return False
+
+
+class Rule:
+    """One rule of a stylesheet: its span, its prelude and, for a block, the rules or
+    declarations inside the braces."""
+
+    def __init__(self, start, end, prelude, block=None, children=None):
+        self.start = start
+        self.end = end
+        self.prelude = prelude
+        self.block = block
+        self.children = children
+
+
+def parse_rules(css):
+    """Splits a stylesheet into a tree of Rules, or returns None if its braces do not
+    balance (the stylesheet is then left as it is)."""
+    root = []
+    stack = []      # (start, prelude end, children of the enclosing level)
+    children = root
+    level_start = 0
+    for token in CSS_TOKEN.finditer(css):
+        char = token.group()
+        if char not in (b"{", b"}", b";"):
+            continue
+        position = token.start()
+        start = CSS_SPACE.match(css, level_start).end()
+        if char == b"{":
+            stack.append((start, position, children))
+            children = []
+        elif char == b";":
+            children.append(Rule(start, position + 1, css[start:position]))
+        else:
+            if not stack:
+                return None
+            rule_start, prelude_end, parent = stack.pop()
+            parent.append(Rule(rule_start, position + 1, css[rule_start:prelude_end], (prelude_end + 1, position), children))
+            children = parent
+        level_start = position + 1
+    return None if stack else root
+
+
+def _rule_lives(rule, css, matcher, animations, used, dead):
+    """Decides whether `rule` can apply; collects the spans of dead rules inside live
+    ones in `dead` and the animation names of live rules in `used`."""
+    if rule.block is None:
+        return True
+    at_rule = AT_RULE.match(rule.prelude)
+    if at_rule:
+        name = at_rule.group(1).lower()
+        if name in GROUPING_AT_RULES:
+            inner = []
+            live = [child for child in rule.children if _rule_lives(child, css, matcher, animations, used, inner)]
+            if live:
+                dead.extend(inner)
+            return bool(live)
+        if name in KEYFRAMES_AT_RULES:
+            keyframes = at_rule.group(2).strip().strip(b"\"'")
+            return animations is None or ALL_ANIMATIONS in animations or keyframes in animations
+        return True
+    # Nested style rules are newer than these captures; keep anything that has them
+    if any(child.block is not None for child in rule.children) or selector_can_match(rule.prelude, matcher):
+        _collect_animations(css[rule.block[0]:rule.block[1]], used)
+        return True
+    return False
+
+
+def dead_rules(css, rules, matcher, animations=None, used=None):
+    """(start, end) of every rule in the parsed `css` that cannot apply to the document
+    behind `matcher`. @keyframes are dead unless `animations` (None: all) names them.
+    The animation names of the live rules are added to `used`."""
+    dead = []
+    used = set() if used is None else used
+    for rule in rules:
+        if not _rule_lives(rule, css, matcher, animations, used, dead):
+            dead.append((rule.start, rule.end))
+    return sorted(dead)
@@ -0,0 +1,172 @@
+# FILE: coursehub/fswatch.py
+# PURPOSE: Detect added, removed or changed files under the course roots for the
+#          --watch mode of `coursehub build`. Uses Linux inotify (through ctypes,
+#          no extra packages) when available and falls back to cheap stat polling.
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# --- Configuration ---
+DEFAULT_DEBOUNCE = 0.2       # seconds of quiet before a burst of changes is reported
+MAX_BATCH_DELAY = 2.0        # never hold back a batch longer than this during constant writes
+POLL_INTERVAL = 0.5          # seconds between scans for the polling fallback
+IGNORED_SUFFIXES = (".tmp", ".swp", "~", ".crdownload", ".part")
+IGNORED_NAMES = {"viewer.html"}  # our own output; rewriting it must not trigger a rebuild
+# --- End Configuration ---
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_relevant(path):
+    """False for editor/browser temp files and for files the build itself writes."""
+    name = os.path.basename(path)
+    if name.startswith(".") or name in IGNORED_NAMES:
+        return False
+    return not name.endswith(IGNORED_SUFFIXES)
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher. poll() returns changed paths, or None after a queue overflow."""
+
+    def __init__(self, roots):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        for root in roots:
+            self._add_tree(root)
+
+    def _add_tree(self, top):
+        for root, dirs, _ in os.walk(top):
+            dirs[:] = [d for d in dirs if not d.startswith('.')] # ignore hidden dirs
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(root), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = root
+
+    def poll(self, timeout):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path)
+                changed.add(path)
+            elif is_relevant(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Portable fallback that diffs (size, mtime) snapshots taken with os.scandir."""
+
+    def __init__(self, roots, interval=POLL_INTERVAL):
+        self._roots = list(roots)
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        stack = [root for root in self._roots if os.path.isdir(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif is_relevant(entry.path):
+                    st = entry.stat()
+                    snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self._interval))
+        current = self._take_snapshot()
+        previous, self._snapshot = self._snapshot, current
+        changed = {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(roots, force_polling=False):
+    """Returns an inotify watcher where the platform supports it, else a polling one."""
+    roots = [root for root in roots if os.path.isdir(root)]
+    if not force_polling and hasattr(os, "O_CLOEXEC"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots)
+
+
+def watch_batches(watcher, debounce=DEFAULT_DEBOUNCE):
+    """Yields debounced batches of changed paths forever.
+
+    A batch is emitted once no new change arrived for `debounce` seconds (or after
+    MAX_BATCH_DELAY of continuous activity). A batch of None means events were lost
+    and the caller should fall back to a full rescan.
+    """
+    while True:
+        changed = watcher.poll(3600)
+        if changed is not None and not changed:
+            continue
+        pending = changed
+        first_seen = time.monotonic()
+        while time.monotonic() - first_seen < MAX_BATCH_DELAY:
+            more = watcher.poll(debounce)
+            if more is None:
+                pending = None
+            elif not more:
+                break
+            elif pending is not None:
+                pending |= more
+        yield pending
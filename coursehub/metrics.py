@@ -0,0 +1,318 @@
+# FILE: coursehub/metrics.py
+# PURPOSE: Per-phase build metrics (walk, read, catalog, render, write) and the --profile
+#          and --trace options shared by `coursehub build`, `viewer` and `dashboard`. Phase
+#          times are summed over every thread that ran the phase, so with -j > 1 they can
+#          add up to more than the wall time. Those three write their summary to
+#          hub_metrics.json; the other commands only print it unless --metrics names a file.
+#          --trace also writes every span as a Chrome/Perfetto trace-event file, and
+#          --memprofile adds tracemalloc and peak-RSS figures per phase and per worker.
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource  # POSIX only; without it peak RSS is simply not reported
+except ImportError:
+    resource = None
+
+# --- Configuration ---
+METRICS_PATH = "hub_metrics.json"
+METRICS_VERSION = 1
+PROFILE_PATH = "hub_build.prof"
+PROFILE_TOP = 20
+TRACE_PATH = "hub_build.trace.json"
+MEMPROFILE_TOP = 10
+MEMPROFILE_FRAMES = 1          # traceback depth kept by tracemalloc (1 = allocation line only)
+SNAPSHOT_GROWTH = 1.1          # re-snapshot allocation sites when the traced peak grows by 10%
+# --- End Configuration ---
+
+_lock = threading.Lock()
+_phases = {}      # phase name -> [seconds, calls]
+_counters = {}    # counter name -> total
+_profiles = None  # per-task profiles collected from worker threads while --profile is on
+_trace = None     # trace events collected while --trace is on
+_trace_threads = {}
+_trace_origin = 0.0
+_memory = None    # per-phase / per-worker memory high-water marks while --memprofile is on
+
+
+def reset():
+    """Clears every phase timing and counter."""
+    with _lock:
+        _phases.clear()
+        _counters.clear()
+
+
+def _trace_event(name, category, started, finished, detail):
+    thread = threading.current_thread()
+    event = {
+        "name": f"{name} {detail}" if detail else name,
+        "cat": category,
+        "ph": "X",
+        "ts": round((started - _trace_origin) * 1e6, 1),
+        "dur": round((finished - started) * 1e6, 1),
+        "pid": os.getpid(),
+        "tid": thread.ident,
+    }
+    if detail:
+        event["args"] = {"target": detail}
+    with _lock:
+        _trace.append(event)
+        _trace_threads[thread.ident] = thread.name
+
+
+def peak_rss_kb():
+    """The process's peak resident set size in KB, or None where it cannot be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def _memory_end(name, before):
+    """Credits the phase and worker thread with the memory high-water marks reached during it.
+
+    tracemalloc and ru_maxrss are process-wide, so a phase is credited with the new
+    peak only if the peak rose while it ran (with -j > 1 overlapping phases share it;
+    use -j 1 for exact attribution). Allocation sites are snapshotted at the end of a
+    phase that pushed the traced peak up by SNAPSHOT_GROWTH.
+    """
+    traced_before, rss_before = before
+    current, peak = tracemalloc.get_traced_memory()
+    rss = peak_rss_kb()
+    reached_kb = (peak if peak > traced_before else current) // 1024
+    take_snapshot = False
+    with _lock:
+        for table, key in ((_memory["phases"], name), (_memory["workers"], threading.current_thread().name)):
+            entry = table.setdefault(key, {"traced_peak_kb": 0, "rss_peak_kb": None})
+            entry["traced_peak_kb"] = max(entry["traced_peak_kb"], reached_kb)
+            if rss is not None and rss > rss_before:
+                entry["rss_peak_kb"] = max(entry["rss_peak_kb"] or 0, rss)
+        if peak > _memory["snapshot_peak"] * SNAPSHOT_GROWTH:
+            _memory["snapshot_peak"] = peak
+            take_snapshot = True
+    if take_snapshot:
+        snapshot = tracemalloc.take_snapshot()
+        with _lock:
+            _memory["snapshot"] = snapshot
+
+
+@contextmanager
+def phase(name, detail=None):
+    """Adds the time spent inside the block to phase `name`. Safe to use from any thread.
+
+    `detail` (a course folder, lesson or output path) only labels the trace span.
+    """
+    memory_before = None
+    if _memory is not None:
+        memory_before = (tracemalloc.get_traced_memory()[1], peak_rss_kb() or 0)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        finished = time.perf_counter()
+        with _lock:
+            entry = _phases.setdefault(name, [0.0, 0])
+            entry[0] += finished - started
+            entry[1] += 1
+        if _trace is not None:
+            _trace_event(name, name, started, finished, detail)
+        if memory_before is not None:
+            _memory_end(name, memory_before)
+
+
+@contextmanager
+def span(name, detail=None):
+    """A trace-only span that groups phases (e.g. one course's whole scan); not timed as a phase."""
+    if _trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _trace_event(name, "step", started, time.perf_counter(), detail)
+
+
+def count(name, amount=1):
+    """Adds `amount` to counter `name`."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def profiled(func):
+    """Wraps a function submitted to a worker pool so --profile also sees worker threads.
+
+    cProfile only follows the thread that enabled it; each call gets its own profile,
+    merged into the report at the end of the session. A plain call when not profiling.
+    """
+    def wrapper(*args, **kwargs):
+        if _profiles is None:
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            with _lock:
+                _profiles.append(profile)
+    return wrapper
+
+
+def summary(command, wall_seconds):
+    """The metrics of the current session as a JSON-ready dict."""
+    with _lock:
+        phases = {name: {"seconds": round(seconds, 6), "calls": calls} for name, (seconds, calls) in sorted(_phases.items())}
+        counters = dict(sorted(_counters.items()))
+    return {
+        "version": METRICS_VERSION,
+        "command": command,
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "wall_seconds": round(wall_seconds, 6),
+        "peak_rss_kb": peak_rss_kb(),
+        "phases": phases,
+        "counters": counters,
+    }
+
+
+def memory_summary(memory, top):
+    """Memory high-water marks per phase and worker plus the top allocation sites."""
+    sites = []
+    if memory["snapshot"] is not None:
+        snapshot = memory["snapshot"].filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen *>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            sites.append({"site": f"{frame.filename}:{frame.lineno}", "kb": stat.size // 1024, "blocks": stat.count})
+    return {
+        "traced_peak_kb": memory["traced_peak"] // 1024,
+        "phases": dict(sorted(memory["phases"].items())),
+        "workers": dict(sorted(memory["workers"].items())),
+        "top_sites": sites,
+    }
+
+
+def _print_memory(data):
+    def mb(kb):
+        return "-" if kb is None else f"{kb / 1024:.1f} MB"
+
+    print(f"\n🧠 Peak RSS {mb(data['peak_rss_kb'])}, peak traced Python memory {mb(data['memory']['traced_peak_kb'])}.")
+    for title, table in (("Phase", data["memory"]["phases"]), ("Worker", data["memory"]["workers"])):
+        print(f"   {title:<18} {'traced peak':>12} {'RSS peak':>10}")
+        for key, entry in table.items():
+            print(f"   {key:<18} {mb(entry['traced_peak_kb']):>12} {mb(entry['rss_peak_kb']):>10}")
+    if data["memory"]["top_sites"]:
+        print(f"   Top allocation sites at the traced peak:")
+        for site in data["memory"]["top_sites"]:
+            print(f"   {mb(site['kb']):>10} {site['blocks']:>7} blocks  {site['site']}")
+
+
+def add_arguments(parser, metrics_path=METRICS_PATH):
+    """Adds --metrics, --profile and --profile-top to a command's argument parser.
+
+    Only the commands that generate the hub's pages write `metrics_path` by default; the
+    others pass None, so they leave the last build's summary alone unless --metrics names
+    a file."""
+    if metrics_path:
+        parser.add_argument("--metrics", default=metrics_path, help=f"Where to write the per-phase metrics summary (default: {metrics_path}).")
+    else:
+        parser.add_argument("--metrics", metavar="PATH", help="Also write the per-phase metrics summary to PATH.")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_PATH, metavar="PATH",
+                        help=f"Profile the run with cProfile, write the pstats dump to PATH (default: {PROFILE_PATH}) and print the hotspots.")
+    parser.add_argument("--profile-top", type=int, default=PROFILE_TOP, metavar="N",
+                        help=f"Number of functions in the --profile hotspot table (default: {PROFILE_TOP}).")
+    parser.add_argument("--trace", nargs="?", const=TRACE_PATH, metavar="PATH",
+                        help=f"Write a Chrome/Perfetto trace of every span to PATH (default: {TRACE_PATH}); open it in ui.perfetto.dev.")
+    parser.add_argument("--memprofile", nargs="?", type=int, const=MEMPROFILE_TOP, metavar="N",
+                        help=f"Track memory with tracemalloc: peak traced memory and peak RSS per phase and worker, "
+                             f"plus the top N allocation sites (default: {MEMPROFILE_TOP}). Slows the build down.")
+    parser.add_argument("--max-rss", type=float, metavar="MB",
+                        help="Fail (exit status 3) if the process's peak RSS exceeds this many MB.")
+
+
+def _write_json(data, path, indent=1):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _write_trace(events, threads, command, path):
+    """Writes the Trace Event Format file: complete ("X") events plus thread names."""
+    pid = os.getpid()
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"coursehub {command}"}}]
+    for sort_index, (tid, name) in enumerate(sorted(threads.items(), key=lambda item: item[1])):
+        metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        metadata.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": tid, "args": {"sort_index": sort_index}})
+    events.sort(key=lambda event: (event["ts"], -event["dur"]))
+    _write_json({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, path, indent=None)
+    print(f"🧵 Trace of {len(events)} spans on {len(threads)} thread(s) written to '{path}'.")
+
+
+def _report_profile(profiles, path, top):
+    stats = pstats.Stats(*profiles)
+    stats.dump_stats(path)
+    print(f"\n🔬 Profile written to '{path}' (open it with `python3 -m pstats {path}`). Top {top} by own time:")
+    stats.sort_stats("tottime").print_stats(top)
+
+
+@contextmanager
+def session(command, args):
+    """Collects metrics (plus, on request, a cProfile dump, a trace and memory figures)
+    for one command run.
+
+    When the block finishes, prints a one-line phase summary and writes the JSON
+    summary to args.metrics, if set. Raises SystemExit(3) if peak RSS broke --max-rss.
+    """
+    global _profiles, _trace, _trace_origin, _memory
+    reset()
+    if args.trace:
+        _trace = []
+        _trace_threads.clear()
+    if args.memprofile is not None:
+        _memory = {"phases": {}, "workers": {}, "snapshot": None, "snapshot_peak": 0}
+        tracemalloc.start(MEMPROFILE_FRAMES)
+    main_profile = None
+    if args.profile:
+        _profiles = []
+        main_profile = cProfile.Profile()
+        main_profile.enable()
+    started = _trace_origin = time.perf_counter()
+    try:
+        with span(command):
+            yield
+    finally:
+        wall_seconds = time.perf_counter() - started
+        worker_profiles, _profiles = _profiles, None
+        events, _trace = _trace, None
+        memory, _memory = _memory, None
+        if memory is not None:
+            memory["traced_peak"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if main_profile is not None:
+            main_profile.disable()
+    if main_profile is not None:
+        _report_profile([main_profile] + worker_profiles, args.profile, args.profile_top)
+    if events is not None:
+        _write_trace(events, _trace_threads, command, args.trace)
+    data = summary(command, wall_seconds)
+    if memory is not None:
+        data["memory"] = memory_summary(memory, args.memprofile)
+        _print_memory(data)
+    phases = " · ".join(f"{name} {entry['seconds']:.2f}s" for name, entry in data["phases"].items())
+    if args.metrics:
+        _write_json(data, args.metrics)
+        print(f"⏱️  {phases or 'no phases'} (wall {wall_seconds:.2f}s). Metrics written to '{args.metrics}'.")
+    else:
+        print(f"⏱️  {phases or 'no phases'} (wall {wall_seconds:.2f}s).")
+    if args.max_rss is not None and data["peak_rss_kb"] is not None and data["peak_rss_kb"] > args.max_rss * 1024:
+        print(f"❌ Peak RSS {data['peak_rss_kb'] / 1024:.1f} MB exceeded the --max-rss ceiling of {args.max_rss:g} MB.")
+        raise SystemExit(3)
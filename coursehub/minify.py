@@ -0,0 +1,112 @@
+# FILE: coursehub/minify.py
+# PURPOSE: Shrink the pages the --site copy generates (each course's viewer.html and the
+#          dashboard) before they are served. Whitespace runs in text collapse to one
+#          character, comments go, attribute values lose quotes they do not need, and
+#          <style> blocks lose comments and the spaces around their punctuation. The
+#          content of <pre>, <textarea> and <script> is left exactly as written, and so is
+#          any comment that records where a page came from. The site's lessons are
+#          minified too, but only after their rewritten form has restored byte for byte to
+#          the capture; that verified form is kept beside them so they can still be
+#          restored (see assets.py).
+import re
+
+# --- Configuration ---
+MINIFY_VERSION = 2           # bump when the output changes; every minified page is then rewritten
+# Comments that are kept: SingleFile's capture header, conditional comments and <!--! ... -->
+KEPT_COMMENTS = (b"<!--\n Page saved with SingleFile", b"<!--[if", b"<!--!")
+# --- End Configuration ---
+
+MARKUP = re.compile(rb"<!--.*?-->"
+                    rb"|(<(pre|textarea|script|style)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>)(.*?)(</\2\s*>)"
+                    rb"|<[a-zA-Z](?:[^>\"']|\"[^\"]*\"|'[^']*')*>"
+                    rb"|</[a-zA-Z][^>]*>|<![^>]*>", re.S | re.I)
+TAG = re.compile(rb"<([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*?)(/?)>", re.S)
+ATTRIBUTE = re.compile(rb"""([^\s"'=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+UNQUOTED_VALUE = re.compile(rb"[^\s\"'=<>`]+")
+SPACE = re.compile(rb"\s+")
+CSS_PART = re.compile(rb"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|/\*.*?\*/", re.S)
+CSS_PUNCTUATION = re.compile(rb" ?([{};,>]) ?")
+CSS_SEPARATORS = b" \t\r\n{};,:>"
+
+
+def _collapse(text):
+    """One character per whitespace run: a newline if the run held one, else a space."""
+    return SPACE.sub(lambda match: b"\n" if b"\n" in match.group(0) else b" ", text)
+
+
+def minify_tag(tag):
+    """Rewrites a start tag with single spaces between attributes and without the quotes
+    a value does not need. A tag this cannot parse is returned as it is."""
+    match = TAG.fullmatch(tag)
+    if match is None:
+        return tag
+    parts = [match.group(1)]
+    position = 0
+    attributes = match.group(2)
+    for attribute in ATTRIBUTE.finditer(attributes):
+        if attributes[position:attribute.start()].strip():
+            return tag
+        position = attribute.end()
+        name, double, single, bare = attribute.groups()
+        value = next((group for group in (double, single, bare) if group is not None), None)
+        if value is None:
+            parts.append(name)
+        elif UNQUOTED_VALUE.fullmatch(value) and not value.endswith(b"/"):
+            parts.append(name + b"=" + value)
+        elif b'"' not in value:
+            parts.append(name + b'="' + value + b'"')
+        else:
+            parts.append(name + b"='" + value + b"'")
+    if attributes[position:].strip():
+        return tag
+    return b"<" + b" ".join(parts) + (b"/" if match.group(3) else b"") + b">"
+
+
+def minify_css(css):
+    """Drops comments (but /*! ... */) and the whitespace CSS does not need; strings are
+    kept as written. A comment between two tokens stays, since removing it would join them."""
+    parts, code, position = [], [], 0
+    for match in CSS_PART.finditer(css):
+        code.append(css[position:match.start()])
+        position = match.end()
+        token = match.group(0)
+        if token.startswith(b"/*") and not token.startswith(b"/*!"):
+            before = css[match.start() - 1:match.start()]
+            after = css[match.end():match.end() + 1]
+            if not before or not after or before in CSS_SEPARATORS or after in CSS_SEPARATORS:
+                continue
+        # The code on both sides of a dropped comment is minified as one run, so a ';'
+        # before a '}' is found even across the comment
+        parts += [_minify_css_code(b"".join(code)), token]
+        code.clear()
+    code.append(css[position:])
+    parts.append(_minify_css_code(b"".join(code)))
+    return b"".join(parts).strip()
+
+
+def _minify_css_code(code):
+    """Minifies CSS outside strings and comments; only here may ";}" lose its ';'."""
+    return CSS_PUNCTUATION.sub(rb"\1", SPACE.sub(b" ", code)).replace(b": ", b":").replace(b";}", b"}")
+
+
+def minify_html(html):
+    """Minifies one page (bytes). Returns the minified bytes."""
+    parts, position = [], 0
+    for match in MARKUP.finditer(html):
+        parts.append(_collapse(html[position:match.start()]))
+        token = match.group(0)
+        if token.startswith(b"<!--"):
+            if token.startswith(KEPT_COMMENTS):
+                parts.append(token)
+        elif match.group(1) is not None:
+            body = match.group(3)
+            if match.group(2).lower() == b"style":
+                body = minify_css(body)
+            parts += [minify_tag(match.group(1)), body, match.group(4)]
+        elif token.startswith(b"</") or token.startswith(b"<!"):
+            parts.append(token)
+        else:
+            parts.append(minify_tag(token))
+        position = match.end()
+    parts.append(_collapse(html[position:]))
+    return b"".join(parts)
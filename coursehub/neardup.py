@@ -0,0 +1,232 @@
+# FILE: coursehub/neardup.py (`coursehub similar`)
+# PURPOSE: Find lessons whose visible text is nearly the same, beyond the exact-URL groups
+#          of snapshots.py: the solution and practice captures of one exam, or two saves
+#          of a page that differ only in a timer. Each lesson's text is cut into shingles
+#          of a few words and reduced to a MinHash signature (cached by the page's sha256),
+#          and the signatures are bucketed band by band (locality-sensitive hashing), so
+#          only pages that share a bucket are ever compared instead of every pair. Pages
+#          whose estimated similarity clears the threshold are joined into clusters.
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import struct
+
+from . import catalog, metrics
+
+# --- Configuration ---
+SIMILAR_PATH = "hub_similar.sqlite3"
+SCHEMA_VERSION = 1
+SHINGLE_WORDS = 4            # words per shingle
+NUM_HASHES = 128             # MinHash signature length; BANDS * ROWS must equal it
+BANDS = 32                   # LSH bands; pages sharing any band become candidates
+ROWS = 4                     # signature values per band: ~ (1/BANDS) ** (1/ROWS) = 0.42 similarity
+                             # is where a pair becomes more likely than not to be compared
+DEFAULT_THRESHOLD = 0.8      # estimated Jaccard similarity that puts two pages in one cluster
+SIGNATURE_VERSION = 1        # bump when signatures change; every page is then signed again
+# --- End Configuration ---
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    sha256    TEXT NOT NULL,     -- of the page the signature was computed from
+    version   INTEGER NOT NULL,  -- SIGNATURE_VERSION it was computed with
+    shingles  INTEGER NOT NULL,
+    signature BLOB NOT NULL,     -- NUM_HASHES little-endian uint64 minimums
+    PRIMARY KEY (sha256, version)
+);
+"""
+
+# Markup that is never shown: the head, scripts, styles, inline SVG and comments. The
+# shadow-root <template>s SingleFile captures are shown, so their text is kept. The
+# bodies are matched as "runs without '<', then a '<' that does not close" rather than
+# a lazy .*?, which is ten times slower over a head of inlined stylesheets.
+HIDDEN = re.compile(rb"<(head|script|style|svg|noscript)\b[^<]*(?:<(?!/\1\s*>)[^<]*)*</\1\s*>"
+                    rb"|<!--[^-]*(?:-(?!->)[^-]*)*-->", re.I)
+TAG = re.compile(rb"<[^>]*>")
+WORD = re.compile(r"\w+")
+SIGNATURE = struct.Struct(f"<{NUM_HASHES}Q")
+EMPTY = ((1 << 64) - 1,) * NUM_HASHES
+
+
+def connect(path=SIMILAR_PATH):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS signatures")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def visible_text(page):
+    """The words a reader sees on a captured page (bytes), lowercased, in order."""
+    text = TAG.sub(b" ", HIDDEN.sub(b" ", page)).decode("utf-8", "replace")
+    return WORD.findall(html.unescape(text).lower())
+
+
+def shingles(words):
+    """The distinct runs of SHINGLE_WORDS words (the whole text if shorter), as bytes."""
+    runs = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))}
+    return {run.encode("utf-8") for run in runs if run}
+
+
+def minhash(runs):
+    """The MinHash signature of a set of shingles (EMPTY for an empty set). NUM_HASHES
+    independent 64-bit hashes of a shingle are read off one SHAKE-128 digest, and the
+    signature keeps the smallest value of each across the set."""
+    if not runs:
+        return EMPTY
+    return tuple(map(min, zip(*(SIGNATURE.unpack(hashlib.shake_128(run).digest(SIGNATURE.size)) for run in runs))))
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    if first == EMPTY or second == EMPTY:
+        return 1.0 if first == second else 0.0
+    return sum(x == y for x, y in zip(first, second)) / NUM_HASHES
+
+
+def signatures(conn, lessons):
+    """{path: signature} for catalog lesson rows. Pages whose sha256 has a cached
+    signature are not read; the others are, and their signatures are cached."""
+    cached = {row["sha256"]: row["signature"]
+              for row in conn.execute("SELECT sha256, signature FROM signatures WHERE version = ?", (SIGNATURE_VERSION,))}
+    result = {}
+    for lesson in lessons:
+        blob = cached.get(lesson["sha256"])
+        if blob is None:
+            with metrics.phase("read", lesson["path"]):
+                with open(lesson["path"].replace("/", os.path.sep), "rb") as f:
+                    page = f.read()
+            metrics.count("files_read")
+            metrics.count("bytes_read", len(page))
+            with metrics.phase("signature", lesson["path"]):
+                runs = shingles(visible_text(page))
+                blob = SIGNATURE.pack(*minhash(runs))
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO signatures (sha256, version, shingles, signature) VALUES (?, ?, ?, ?)",
+                             (lesson["sha256"], SIGNATURE_VERSION, len(runs), blob))
+            cached[lesson["sha256"]] = blob
+        result[lesson["path"]] = SIGNATURE.unpack(blob)
+    return result
+
+
+def candidate_pairs(signatures_by_path):
+    """Pairs of paths that share at least one LSH band, each pair once and sorted."""
+    buckets = {}
+    for path, signature in signatures_by_path.items():
+        for band in range(BANDS):
+            key = (band,) + signature[band * ROWS:(band + 1) * ROWS]
+            buckets.setdefault(key, []).append(path)
+    pairs = set()
+    for paths in buckets.values():
+        for i, first in enumerate(paths):
+            for second in paths[i + 1:]:
+                pairs.add((first, second) if first < second else (second, first))
+    return sorted(pairs)
+
+
+def clusters(signatures_by_path, threshold):
+    """Groups of paths joined by estimated similarity >= threshold (single linkage), with
+    the candidate pairs that were compared. Only groups of two or more are returned."""
+    parent = {path: path for path in signatures_by_path}
+
+    def root(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    pairs = candidate_pairs(signatures_by_path)
+    for first, second in pairs:
+        if similarity(signatures_by_path[first], signatures_by_path[second]) >= threshold:
+            parent[root(first)] = root(second)
+    groups = {}
+    for path in sorted(signatures_by_path):
+        groups.setdefault(root(path), []).append(path)
+    return [group for group in groups.values() if len(group) > 1], len(pairs)
+
+
+def describe(group, lessons_by_path, signatures_by_path):
+    """A cluster as JSON-ready data. `keep` is the latest capture (the one a lesson list
+    would show), `base` the earliest (the one a store would keep whole); every lesson
+    carries its estimated similarity to `keep`."""
+    by_capture = sorted(group, key=lambda path: (lessons_by_path[path]["captured_at"] or "", path))
+    keep, base = by_capture[-1], by_capture[0]
+    return {
+        "keep": keep,
+        "base": base,
+        "source_urls": sorted({lessons_by_path[path]["source_url"] or "" for path in group}),
+        "bytes": sum(lessons_by_path[path]["size"] for path in group),
+        "lessons": [{"path": path, "captured_at": lessons_by_path[path]["captured_at"],
+                     "similarity": round(similarity(signatures_by_path[path], signatures_by_path[keep]), 3)}
+                    for path in by_capture],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub similar",
+                                     description="Find clusters of near-identical lessons by their visible text.")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH, help=f"Path of the lesson catalog (default: {catalog.CATALOG_PATH}).")
+    parser.add_argument("--store", default=SIMILAR_PATH, help=f"Signature cache (default: {SIMILAR_PATH}).")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Estimated similarity (0..1) that joins two lessons (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--json", metavar="PATH", help="Also write the clusters to this JSON file.")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="Number of clusters to list (default: 20).")
+    metrics.add_arguments(parser, metrics_path=None)
+    args = parser.parse_args(argv)
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be within 0..1")
+
+    with metrics.session("similar", args):
+        return run(args)
+
+
+def run(args):
+    """Signs every lesson, clusters them and prints the clusters. Returns the exit code."""
+    if not os.path.exists(args.catalog):
+        print(f"❌ Error: Lesson catalog '{args.catalog}' not found. Run `coursehub build` first.")
+        return 1
+    catalog_conn = catalog.connect(args.catalog)
+    lessons = [lesson for course in catalog.course_summaries(catalog_conn) for lesson in catalog.lessons(catalog_conn, course["path"])]
+    catalog_conn.close()
+    lessons_by_path = {lesson["path"]: lesson for lesson in lessons}
+
+    conn = connect(args.store)
+    signatures_by_path = signatures(conn, lessons)
+    # Signatures of pages no lesson has any more, or of an older version, are dropped
+    current = {lesson["sha256"] for lesson in lessons}
+    stale = [(row["sha256"], row["version"]) for row in conn.execute("SELECT sha256, version FROM signatures")
+             if row["sha256"] not in current or row["version"] != SIGNATURE_VERSION]
+    with conn:
+        conn.executemany("DELETE FROM signatures WHERE sha256 = ? AND version = ?", stale)
+    conn.close()
+
+    with metrics.phase("cluster"):
+        groups, compared = clusters(signatures_by_path, args.threshold)
+    found = sorted((describe(group, lessons_by_path, signatures_by_path) for group in groups),
+                   key=lambda cluster: (-cluster["bytes"], cluster["keep"]))
+    total = len(lessons) * (len(lessons) - 1) // 2
+    duplicates = sum(len(cluster["lessons"]) - 1 for cluster in found)
+    print(f"🔎 {len(lessons)} lessons: compared {compared} of {total} pairs, found {len(found)} clusters "
+          f"at similarity >= {args.threshold:g} ({duplicates} lessons could collapse into another).")
+    for cluster in found[:args.limit]:
+        urls = len(cluster["source_urls"])
+        print(f"   -> {len(cluster['lessons']):>3} lessons, {cluster['bytes'] / 1e6:.1f} MB, "
+              f"{urls} source URL{'s' if urls != 1 else ''}; keep '{cluster['keep']}'")
+        for lesson in cluster["lessons"]:
+            if lesson["path"] != cluster["keep"]:
+                print(f"        {lesson['similarity']:.2f}  {lesson['path']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"threshold": args.threshold, "clusters": found}, f, indent=1, ensure_ascii=False)
+        print(f"📝 Wrote the clusters to '{args.json}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
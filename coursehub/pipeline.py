@@ -0,0 +1,144 @@
+# FILE: coursehub/pipeline.py
+# PURPOSE: A small task-graph engine for `coursehub build`. Each task names the tasks it
+#          depends on, the files it writes and a content key: a digest of everything its
+#          outputs are made from. Tasks start as soon as their dependencies finish
+#          (independent ones run concurrently on a worker pool), and a task whose key
+#          matches the one recorded in the catalog, and whose recorded outputs still hold
+#          the bytes it wrote (same size and sha256), is skipped and hands its recorded
+#          result to the tasks after it. An output edited by hand or checked out again
+#          is a cache miss, so the task runs and repairs it.
+import json
+import queue
+from collections import deque
+
+from . import catalog, metrics
+
+# Outcome states
+RAN = "ran"          # the task ran and succeeded
+CACHED = "cached"    # its key and outputs matched the recorded ones; the recorded result was reused
+FAILED = "failed"    # it raised; the error text is in Outcome.error
+BLOCKED = "blocked"  # a dependency failed, so it never ran
+
+
+class Task:
+    """One node of the build graph.
+
+    run(results) does the work; `results` maps each dependency's name to its result.
+    key(results) returns a digest of the task's inputs, or None if it must always run
+    (e.g. the scans that detect changes in the first place). Results of keyed tasks are
+    recorded as JSON, together with `outputs` and, for files only known once the task
+    ran, any paths listed under result["outputs"]. `local` tasks run on the scheduling
+    thread, which owns the catalog connection; the rest go to the worker pool. An
+    `always` task still runs after a dependency failed, without that dependency's result.
+    """
+
+    def __init__(self, kind, target, run, deps=(), key=None, outputs=(), local=False, always=False):
+        self.kind = kind
+        self.target = target
+        self.name = kind if target is None else f"{kind}:{target}"
+        self.run = run
+        self.deps = list(deps)
+        self.key = key
+        self.outputs = list(outputs)
+        self.local = local
+        self.always = always
+
+
+class Outcome:
+    def __init__(self, state, result=None, error=None):
+        self.state = state
+        self.result = result
+        self.error = error
+
+
+def _outputs(task, result):
+    extra = result.get("outputs", []) if isinstance(result, dict) else []
+    return task.outputs + [path for path in extra if path not in task.outputs]
+
+
+def _execute(task, results):
+    with metrics.span(task.kind, task.target):
+        return task.run(results)
+
+
+def run_graph(tasks, executor, conn, force=False):
+    """Runs every task once its dependencies are done. Returns {task name: Outcome}.
+
+    With `force` every task runs, but keys are still recorded for the next build.
+    """
+    by_name = {task.name: task for task in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("task names must be unique")
+    dependents = {task.name: [] for task in tasks}
+    waiting = {}
+    for task in tasks:
+        for dep in task.deps:
+            if dep not in by_name:
+                raise ValueError(f"task '{task.name}' depends on unknown task '{dep}'")
+            dependents[dep].append(task.name)
+        waiting[task.name] = len(task.deps)
+
+    outcomes = {}
+    keys = {}
+    ready = deque(task for task in tasks if not task.deps)
+    running = {}  # future -> (submission number, task name)
+    completed = queue.SimpleQueue()
+
+    def finish(name, outcome):
+        outcomes[name] = outcome
+        metrics.count(f"tasks_{outcome.state}")
+        if outcome.state == RAN and keys.get(name) is not None:
+            fingerprints = catalog.output_fingerprints(_outputs(by_name[name], outcome.result))
+            catalog.set_task_state(conn, name, keys[name], json.dumps(outcome.result, sort_keys=True), json.dumps(fingerprints))
+        for dependent in dependents[name]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(by_name[dependent])
+
+    def start(task):
+        failed = [dep for dep in task.deps if outcomes[dep].state in (FAILED, BLOCKED)]
+        if failed and not task.always:
+            return finish(task.name, Outcome(BLOCKED, error=f"{failed[0]} did not complete"))
+        results = {dep: outcomes[dep].result for dep in task.deps if dep not in failed}
+        try:
+            key = task.key(results) if task.key else None
+        except Exception as e:
+            return finish(task.name, Outcome(FAILED, error=str(e)))
+        keys[task.name] = key
+        if key is not None and not force:
+            recorded = catalog.task_state(conn, task.name)
+            if recorded is not None and recorded[0] == key:
+                with metrics.phase("check", task.name):
+                    intact = catalog.outputs_intact(json.loads(recorded[2]))
+                if intact:
+                    return finish(task.name, Outcome(CACHED, json.loads(recorded[1])))
+                metrics.count("tasks_outputs_changed")
+        if task.local:
+            try:
+                result = _execute(task, results)
+            except Exception as e:
+                return finish(task.name, Outcome(FAILED, error=str(e)))
+            return finish(task.name, Outcome(RAN, result))
+        future = executor.submit(metrics.profiled(_execute), task, results)
+        running[future] = (len(keys), task.name)
+        future.add_done_callback(completed.put)
+
+    while ready or running:
+        while ready:
+            start(ready.popleft())
+        if not running:
+            break
+        # Block for one finished task, then take whatever else finished meanwhile. A batch
+        # is handled in submission order, so the local tasks it unlocks start in that order.
+        done = [completed.get()]
+        while not completed.empty():
+            done.append(completed.get())
+        for future in sorted(done, key=running.get):
+            _, name = running.pop(future)
+            error = future.exception()
+            finish(name, Outcome(FAILED, error=str(error)) if error else Outcome(RAN, future.result()))
+
+    unfinished = [task.name for task in tasks if task.name not in outcomes]
+    if unfinished:
+        raise ValueError(f"dependency cycle among: {', '.join(unfinished)}")
+    return outcomes
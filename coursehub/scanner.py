@@ -0,0 +1,200 @@
+# FILE: coursehub/scanner.py (`coursehub scan`)
+# PURPOSE: Look inside lessons without reading them into memory. A lesson is memory-mapped
+#          and searched with byte-level regexes for its data: URIs and its <style> and
+#          <script> blocks; each hit is handed out as a memoryview slice of the mapping, so
+#          a multi-MB payload is never copied, and base64 is decoded straight from that
+#          slice with binascii. The OS pages the file in as the regexes walk it, which lets
+#          a scan of the whole corpus run at about the speed of the disk. The rewriting
+#          passes (assets.py, deadcss.py) still read whole pages: they produce new bytes.
+import argparse
+import binascii
+import heapq
+import mmap
+import os
+import re
+import time
+import urllib.parse
+from contextlib import contextmanager
+
+from . import catalog, metrics
+
+# --- Configuration ---
+KINDS = ("data-uri", "style", "script")
+DEFAULT_TOP = 10             # largest payloads listed by `coursehub scan`
+# --- End Configuration ---
+
+# The media type and parameters, then the payload: base64 characters after ";base64,",
+# anything up to a quote, bracket or whitespace otherwise (percent-encoded SVG and text).
+# The scheme is matched in lowercase, as SingleFile writes it: with re.I the regex engine
+# can no longer jump between occurrences of "data:" and the scan is four times slower.
+DATA_URI = re.compile(rb"data:([A-Za-z0-9.+-]+/[A-Za-z0-9.+-]+)?(?:;[A-Za-z0-9.+-]+=[^;,\"'()\s<>]*)*"
+                      rb"(?:(;[bB][aA][sS][eE]64),([A-Za-z0-9+/]*={0,2})|,([^\"'()\s<>]*))")
+# A block's body is matched as "runs without '<', then a '<' that does not close it",
+# which walks a 1 MB stylesheet far faster than a lazy .*?
+BLOCK = re.compile(rb"<(style|script)\b[^>]*>([^<]*(?:<(?!/\1\s*>)[^<]*)*)</\1\s*>", re.I)
+
+
+class Payload:
+    """One hit of scan(): its kind ("data-uri", "style" or "script"), the span of the whole
+    URI or element in the file, the media type of a data: URI (None otherwise) and
+    whether it is base64. `view` is a memoryview of the payload itself (the URI's data or
+    the element's content) and is only valid while the file is mapped."""
+
+    __slots__ = ("kind", "start", "end", "mime", "base64", "view")
+
+    def __init__(self, kind, start, end, mime, base64, view):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.mime = mime
+        self.base64 = base64
+        self.view = view
+
+
+@contextmanager
+def mapped(path):
+    """Maps a file read-only and yields a memoryview of it (an empty one for an empty
+    file). The mapping is closed on exit; if a caller still holds a slice of it, it is
+    left for the garbage collector to close once the last slice is gone."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(data)
+    try:
+        yield view
+    finally:
+        view.release()
+        try:
+            data.close()
+        except BufferError:
+            pass
+
+
+def _data_uris(buffer, view):
+    for match in DATA_URI.finditer(buffer):
+        mime = match.group(1)
+        payload = 3 if match.start(2) >= 0 else 4
+        yield Payload("data-uri", match.start(), match.end(), mime.decode("ascii").lower() if mime else "text/plain",
+                      payload == 3, view[match.start(payload):match.end(payload)])
+
+
+def _blocks(buffer, view, kinds):
+    for match in BLOCK.finditer(buffer):
+        kind = match.group(1).decode("ascii").lower()
+        if kind in kinds:
+            yield Payload(kind, match.start(), match.end(), None, False, view[match.start(2):match.end(2)])
+
+
+def scan(view, kinds=KINDS):
+    """Yields a Payload for every data: URI and <style>/<script> block of a mapped page
+    (a memoryview from mapped()), in the order they start. URIs inside a block are
+    yielded as well as the block itself."""
+    scans = []
+    if "data-uri" in kinds:
+        scans.append(_data_uris(view, view))
+    if "style" in kinds or "script" in kinds:
+        scans.append(_blocks(view, view, kinds))
+    return heapq.merge(*scans, key=lambda payload: payload.start)
+
+
+def decode(payload):
+    """The bytes a data: URI stands for. Base64 is decoded from the mapped slice without
+    copying it first; percent-encoded data is unquoted. Raises binascii.Error for base64
+    that does not decode."""
+    if payload.base64:
+        return binascii.a2b_base64(payload.view)
+    return urllib.parse.unquote_to_bytes(payload.view.tobytes())
+
+
+def scan_files(paths, decode_uris=False, top=DEFAULT_TOP):
+    """Scans `paths` and sums what they carry. Returns a dict with the number of files
+    and bytes scanned, per-kind and per-media-type totals, the undecodable URIs and the
+    `top` largest payloads as (size, path, offset, kind, media type)."""
+    totals = {kind: [0, 0] for kind in KINDS}      # kind -> [count, payload bytes]
+    mimes = {}                                     # media type -> [count, encoded bytes, decoded bytes]
+    largest, invalid = [], []
+    files = scanned = 0
+    for path in paths:
+        with metrics.phase("scan", path):
+            with mapped(path) as view:
+                files += 1
+                scanned += len(view)
+                for payload in scan(view):
+                    size = len(payload.view)
+                    totals[payload.kind][0] += 1
+                    totals[payload.kind][1] += size
+                    if payload.kind == "data-uri":
+                        entry = mimes.setdefault(payload.mime, [0, 0, 0])
+                        entry[0] += 1
+                        entry[1] += size
+                        if decode_uris:
+                            try:
+                                entry[2] += len(decode(payload))
+                            except (binascii.Error, ValueError) as e:
+                                invalid.append((path, payload.start, str(e)))
+                    item = (size, path, payload.start, payload.kind, payload.mime)
+                    if len(largest) < top:
+                        heapq.heappush(largest, item)
+                    elif top:
+                        heapq.heappushpop(largest, item)
+                    payload.view.release()
+    metrics.count("files_read", files)
+    metrics.count("bytes_read", scanned)
+    return {"files": files, "bytes": scanned, "kinds": totals, "mimes": mimes, "invalid": invalid,
+            "largest": sorted(largest, reverse=True)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub scan",
+                                     description="Inventory the data: URIs, <style> and <script> blocks of lessons via mmap.")
+    parser.add_argument("paths", nargs="*", help="Pages to scan (default: every lesson in the catalog).")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH, help=f"Path of the lesson catalog (default: {catalog.CATALOG_PATH}).")
+    parser.add_argument("--decode", action="store_true", help="Also decode every data: URI and report the decoded sizes.")
+    parser.add_argument("-n", "--top", type=int, default=DEFAULT_TOP, help=f"Number of largest payloads to list (default: {DEFAULT_TOP}).")
+    metrics.add_arguments(parser, metrics_path=None)
+    args = parser.parse_args(argv)
+    if args.top < 0:
+        parser.error("--top must not be negative")
+
+    with metrics.session("scan", args):
+        return run(args)
+
+
+def run(args):
+    """Scans the requested pages and prints the inventory. Returns the exit code."""
+    paths = args.paths
+    if not paths:
+        if not os.path.exists(args.catalog):
+            print(f"❌ Error: Lesson catalog '{args.catalog}' not found. Run `coursehub build` first or name the pages.")
+            return 1
+        conn = catalog.connect(args.catalog)
+        paths = [lesson["path"].replace("/", os.path.sep)
+                 for course in catalog.course_summaries(conn) for lesson in catalog.lessons(conn, course["path"])]
+        conn.close()
+    started = time.perf_counter()
+    try:
+        result = scan_files(paths, args.decode, args.top)
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    seconds = time.perf_counter() - started
+    print(f"🔬 Scanned {result['files']} files, {result['bytes'] / 1e6:.1f} MB in {seconds:.2f}s "
+          f"({result['bytes'] / 1e6 / max(seconds, 1e-9):.0f} MB/s).")
+    for kind, (count, size) in result["kinds"].items():
+        print(f"   -> {kind:<8} {count:>7} found, {size / 1e6:8.1f} MB")
+    for mime, (count, encoded, decoded) in sorted(result["mimes"].items(), key=lambda item: -item[1][1]):
+        print(f"        {mime:<24} {count:>6} URIs, {encoded / 1e6:7.2f} MB"
+              + (f" -> {decoded / 1e6:.2f} MB decoded" if args.decode else ""))
+    if result["largest"]:
+        print("📦 Largest payloads:")
+        for size, path, offset, kind, mime in result["largest"]:
+            print(f"   -> {size / 1e6:6.2f} MB {mime or kind:<24} {path} @ {offset}")
+    for path, offset, error in result["invalid"]:
+        print(f"   -> ❌ {path} @ {offset}: data: URI does not decode ({error})")
+    return 1 if result["invalid"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+# FILE: coursehub/singlefile.py
+# PURPOSE: Read lesson metadata (title, source URL, capture time) from the first few KB
+#          of a SingleFile capture without loading its multi-MB body, and turn it into
+#          the labels the viewer shows. Replaces the viewer's client-side cleanFileName().
+import html
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+# --- Configuration ---
+HEADER_READ_SIZE = 4 * 1024
+# SingleFile swaps characters that are not allowed in file names for full-width lookalikes
+FULLWIDTH_TO_ASCII = {"：": ":", "｜": "|", "／": "/", "＼": "\\", "＊": "*", "？": "?", "＂": '"', "＜": "<", "＞": ">"}
+# Text stripped from titles before they are shown in the lesson list
+LABEL_NOISE = [r"Course Exam:", r"Practice Exam:", r"Solution", r"\|\s*365 (?:Data Science|Financial Analyst)"]
+# --- End Configuration ---
+
+URL_RE = re.compile(rb"^\s*url:\s*(\S+)", re.MULTILINE)
+SAVED_DATE_RE = re.compile(rb"^\s*saved date:\s*(.+?)\s*$", re.MULTILINE)
+TITLE_RE = re.compile(rb"<title>(.*?)</title>", re.DOTALL | re.IGNORECASE)
+# e.g. "Sat Nov 15 2025 10:27:53 GMT+0100 (West Africa Standard Time)"
+JS_DATE_RE = re.compile(r"\w{3} (\w{3} \d{1,2} \d{4} \d{2}:\d{2}:\d{2}) GMT([+-])(\d{2})(\d{2})")
+# e.g. " (14_11_2025 20：17：08)" appended by SingleFile's default file name template
+FILENAME_STAMP_RE = re.compile(r"\s*\(\d{1,2}_\d{1,2}_\d{4} \d{1,2}[:：]\d{2}[:：]\d{2}\)\s*$")
+LABEL_NOISE_RE = re.compile("|".join(LABEL_NOISE), re.IGNORECASE)
+
+
+def parse_saved_date(value):
+    """Converts a SingleFile 'saved date' (JavaScript Date.toString) to ISO 8601, or None."""
+    match = JS_DATE_RE.search(value)
+    if not match:
+        return None
+    local, sign, hours, minutes = match.groups()
+    offset = timedelta(hours=int(hours), minutes=int(minutes))
+    tz = timezone(offset if sign == "+" else -offset)
+    return datetime.strptime(local, "%b %d %Y %H:%M:%S").replace(tzinfo=tz).isoformat()
+
+
+def title_from_filename(path):
+    """Recovers the page title SingleFile used to name the file."""
+    name = os.path.basename(path)
+    if name.lower().endswith(".html"):
+        name = name[:-5]
+    name = FILENAME_STAMP_RE.sub("", name)
+    for fullwidth, ascii_char in FULLWIDTH_TO_ASCII.items():
+        name = name.replace(fullwidth, ascii_char)
+    return name.strip()
+
+
+def probe(path):
+    """Returns (title, source_url, captured_at) for a lesson, reading only its header.
+
+    SingleFile writes the source URL and save date in a comment at the very top of
+    the page. The <title> usually sits after the inlined stylesheets, hundreds of KB
+    in, so when it is not inside the header the title is recovered from the file
+    name instead (SingleFile names captures after the page title). Values that
+    cannot be determined are None.
+    """
+    with open(path, "rb") as f:
+        head = f.read(HEADER_READ_SIZE)
+    url = URL_RE.search(head)
+    saved = SAVED_DATE_RE.search(head)
+    title = TITLE_RE.search(head)
+    return (
+        html.unescape(title.group(1).decode("utf-8", "replace")).strip() if title else title_from_filename(path),
+        url.group(1).decode("utf-8", "replace") if url else None,
+        parse_saved_date(saved.group(1).decode("utf-8", "replace")) if saved else None,
+    )
+
+
+def lesson_label(title):
+    """Short lesson name for the viewer list: drops exam prefixes and the site suffix."""
+    name = LABEL_NOISE_RE.sub("", title).replace("_", " ").replace("-", " ")
+    name = " ".join(name.split())
+    return " ".join(word[:1].upper() + word[1:] for word in name.split(" ")) or title
+
+
+def capture_label(captured_at):
+    """Human-readable capture time, e.g. '14 Nov 2025, 20:17', or '' if unknown."""
+    if not captured_at:
+        return ""
+    return datetime.fromisoformat(captured_at).strftime("%d %b %Y, %H:%M")
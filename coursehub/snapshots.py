@@ -0,0 +1,336 @@
+# FILE: coursehub/snapshots.py (`coursehub snapshots pack|stats|get|verify`)
+# PURPOSE: A compact store of every lesson for backups and transfer. Many lessons are
+#          captures of one page saved minutes apart (26 of them share one exam URL), so
+#          captures are grouped by the `url:` in their SingleFile header: the first one
+#          of a group is kept whole (zlib-compressed) as the group's base, and every later
+#          one only as a binary delta against it: the byte ranges it shares with the base
+#          plus the bytes that differ. Pages are rebuilt on demand through SnapshotStore,
+#          which keeps recently rebuilt pages and bases in a size-bounded LRU cache.
+import argparse
+import collections
+import hashlib
+import itertools
+import os
+import re
+import sqlite3
+import zlib
+
+from . import catalog, metrics
+
+# --- Configuration ---
+SNAPSHOTS_PATH = "hub_snapshots.sqlite3"
+SCHEMA_VERSION = 1
+COMPRESS_LEVEL = 6
+MIN_COPY = 8                         # a matching chunk shorter than this is stored as it is
+CACHE_BYTES = 256 * 1024 * 1024      # rebuilt pages and bases SnapshotStore keeps in memory
+# --- End Configuration ---
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bases (
+    sha256     TEXT PRIMARY KEY,
+    size       INTEGER NOT NULL,
+    data       BLOB NOT NULL         -- zlib-compressed page
+);
+CREATE TABLE IF NOT EXISTS groups (
+    source_url TEXT PRIMARY KEY,
+    base       TEXT NOT NULL REFERENCES bases(sha256)
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    path       TEXT PRIMARY KEY,     -- hub-relative, '/'-separated, as in the catalog
+    source_url TEXT,
+    sha256     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    base       TEXT NOT NULL REFERENCES bases(sha256),
+    delta      BLOB                  -- zlib-compressed delta; NULL when the page is the base
+);
+"""
+
+# Deltas work on chunks that end at '>', '}', ';' or a newline: SingleFile writes long
+# minified lines, and a changed timer or answer touches only the chunks around it
+CHUNK = re.compile(rb"[^>};\n]*[>};\n]|[^>};\n]+")
+
+
+def connect(path=SNAPSHOTS_PATH):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _varint(number):
+    out = bytearray()
+    while number >= 0x80:
+        out.append(number & 0x7F | 0x80)
+        number >>= 7
+    out.append(number)
+    return out
+
+
+def _read_varint(data, position):
+    number = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+
+def encode_delta(base, page):
+    """A delta that rebuilds `page` from `base`: a zlib-compressed run of (literal bytes,
+    base range to copy) pairs, each length and offset a varint."""
+    base_chunks = CHUNK.findall(base)
+    offsets = list(itertools.accumulate((len(chunk) for chunk in base_chunks), initial=0))
+    first = {}
+    for number, chunk in enumerate(base_chunks):
+        first.setdefault(chunk, number)
+
+    out, literal = bytearray(), bytearray()
+    copy_start = copy_end = 0
+    following = None  # the base chunk that would continue the current copy
+
+    def flush():
+        out.extend(_varint(len(literal)) + literal + _varint(copy_start) + _varint(copy_end - copy_start))
+        literal.clear()
+
+    for chunk in CHUNK.findall(page):
+        if following is not None and following < len(base_chunks) and base_chunks[following] == chunk:
+            copy_end += len(chunk)
+            following += 1
+            continue
+        number = first.get(chunk) if len(chunk) >= MIN_COPY else None
+        if copy_end > copy_start:
+            flush()
+            copy_start = copy_end = 0
+        if number is None:
+            literal += chunk
+            following = None
+        else:
+            copy_start, copy_end, following = offsets[number], offsets[number + 1], number + 1
+    if literal or copy_end > copy_start:
+        flush()
+    return zlib.compress(bytes(out), COMPRESS_LEVEL)
+
+
+def decode_delta(base, delta):
+    """Inverse of encode_delta()."""
+    data = zlib.decompress(delta)
+    parts, position = [], 0
+    while position < len(data):
+        length, position = _read_varint(data, position)
+        parts.append(data[position:position + length])
+        position += length
+        start, position = _read_varint(data, position)
+        length, position = _read_varint(data, position)
+        parts.append(base[start:start + length])
+    return b"".join(parts)
+
+
+class SnapshotStore:
+    """Reads pages back from the store. Deltas are rebuilt on demand; rebuilt pages and
+    decompressed bases stay in an LRU cache of at most `cache_bytes`."""
+
+    def __init__(self, conn, cache_bytes=CACHE_BYTES):
+        self.conn = conn
+        self.cache_bytes = cache_bytes
+        self.cache = collections.OrderedDict()  # sha256 -> page bytes
+        self.cached_bytes = 0
+
+    def _cached(self, sha256):
+        data = self.cache.get(sha256)
+        if data is not None:
+            self.cache.move_to_end(sha256)
+            metrics.count("snapshot_cache_hits")
+        return data
+
+    def _remember(self, sha256, data):
+        if len(data) > self.cache_bytes or sha256 in self.cache:
+            return
+        self.cache[sha256] = data
+        self.cached_bytes += len(data)
+        while self.cached_bytes > self.cache_bytes:
+            _, evicted = self.cache.popitem(last=False)
+            self.cached_bytes -= len(evicted)
+
+    def base(self, sha256):
+        """The decompressed base page with this hash."""
+        data = self._cached(sha256)
+        if data is None:
+            row = self.conn.execute("SELECT data FROM bases WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None:
+                raise KeyError(f"base {sha256[:12]} is missing from the store")
+            data = zlib.decompress(row["data"])
+            self._remember(sha256, data)
+        return data
+
+    def read(self, path):
+        """The bytes of the snapshot of hub-relative `path`, rebuilt if it is a delta."""
+        row = self.conn.execute("SELECT sha256, base, delta FROM snapshots WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            raise KeyError(f"'{path}' is not in the snapshot store")
+        if row["delta"] is None:
+            return self.base(row["base"])
+        data = self._cached(row["sha256"])
+        if data is None:
+            metrics.count("snapshot_rebuilds")
+            with metrics.phase("rebuild", path):
+                data = decode_delta(self.base(row["base"]), row["delta"])
+            self._remember(row["sha256"], data)
+        return data
+
+
+def _add_base(conn, sha256, page):
+    conn.execute("INSERT OR IGNORE INTO bases (sha256, size, data) VALUES (?, ?, ?)",
+                 (sha256, len(page), zlib.compress(page, COMPRESS_LEVEL)))
+
+
+def pack(conn, catalog_conn, store):
+    """Brings the store in line with the catalog's lessons. New or changed lessons are
+    added oldest capture first, so each group's base is its earliest capture; a delta
+    is rebuilt and checked before it is kept, and a page whose delta is not smaller than
+    the page would be as a base (judged by how well the group's base compressed)
+    becomes a base of its own. Returns (added, removed)."""
+    lessons = [lesson for course in catalog.course_summaries(catalog_conn) for lesson in catalog.lessons(catalog_conn, course["path"])]
+    stored = {row["path"]: row["sha256"] for row in conn.execute("SELECT path, sha256 FROM snapshots")}
+    current = {lesson["path"] for lesson in lessons}
+    added = 0
+    for lesson in sorted(lessons, key=lambda lesson: (lesson["captured_at"] or "", lesson["path"])):
+        if stored.get(lesson["path"]) == lesson["sha256"]:
+            continue
+        with metrics.phase("read", lesson["path"]):
+            with open(lesson["path"].replace("/", os.path.sep), "rb") as f:
+                page = f.read()
+        sha256 = hashlib.sha256(page).hexdigest()
+        url = lesson["source_url"]
+        group = conn.execute("SELECT g.base, b.size, LENGTH(b.data) AS stored FROM groups g JOIN bases b ON b.sha256 = g.base "
+                             "WHERE g.source_url = ?", (url,)).fetchone() if url else None
+        base, delta = sha256, None
+        if group is not None and group["base"] != sha256:
+            with metrics.phase("delta", lesson["path"]):
+                candidate = encode_delta(store.base(group["base"]), page)
+                rebuilt = decode_delta(store.base(group["base"]), candidate)
+            if rebuilt == page and len(candidate) < len(page) * group["stored"] / group["size"]:
+                base, delta = group["base"], candidate
+        with conn:
+            if delta is None:
+                _add_base(conn, sha256, page)
+                if url and group is None:
+                    conn.execute("INSERT INTO groups (source_url, base) VALUES (?, ?)", (url, sha256))
+            conn.execute("INSERT OR REPLACE INTO snapshots (path, source_url, sha256, size, base, delta) VALUES (?, ?, ?, ?, ?, ?)",
+                         (lesson["path"], url, sha256, len(page), base, delta))
+        metrics.count("bytes_read", len(page))
+        added += 1
+
+    removed = [path for path in stored if path not in current]
+    with conn:
+        conn.executemany("DELETE FROM snapshots WHERE path = ?", [(path,) for path in removed])
+        # A group whose base no snapshot uses any more starts over with its next capture
+        conn.execute("DELETE FROM groups WHERE base NOT IN (SELECT base FROM snapshots)")
+        conn.execute("DELETE FROM bases WHERE sha256 NOT IN (SELECT base FROM snapshots)")
+    return added, len(removed)
+
+
+def group_stats(conn):
+    """One row per base: source_url, captures, page bytes and stored bytes, largest saving first."""
+    return conn.execute(
+        "SELECT b.sha256, MIN(s.source_url) AS source_url, COUNT(*) AS captures, SUM(s.size) AS page_bytes, "
+        "LENGTH(b.data) + COALESCE(SUM(LENGTH(s.delta)), 0) AS stored_bytes "
+        "FROM bases b JOIN snapshots s ON s.base = b.sha256 GROUP BY b.sha256 "
+        "ORDER BY SUM(s.size) - LENGTH(b.data) - COALESCE(SUM(LENGTH(s.delta)), 0) DESC"
+    ).fetchall()
+
+
+def print_stats(conn, limit):
+    groups = group_stats(conn)
+    pages = sum(group["page_bytes"] for group in groups)
+    stored = sum(group["stored_bytes"] for group in groups)
+    captures = sum(group["captures"] for group in groups)
+    print(f"🗄️  {captures} snapshots in {len(groups)} groups: {pages / 1e6:.1f} MB of pages stored in {stored / 1e6:.1f} MB "
+          f"({pages / max(stored, 1):.1f}x smaller).")
+    for group in [group for group in groups if group["captures"] > 1][:limit]:
+        print(f"   -> {group['captures']:>3} captures of {group['source_url']}: "
+              f"{group['page_bytes'] / 1e6:.1f} MB -> {group['stored_bytes'] / 1e6:.2f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub snapshots",
+                                     description="Keep every lesson in a delta-compressed snapshot store.")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH, help=f"Path of the lesson catalog (default: {catalog.CATALOG_PATH}).")
+    parser.add_argument("--store", default=SNAPSHOTS_PATH, help=f"Snapshot store (default: {SNAPSHOTS_PATH}).")
+    metrics.add_arguments(parser, metrics_path=None)
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("pack", help="Add new or changed lessons to the store and drop the ones that are gone.")
+    stats_parser = actions.add_parser("stats", help="Show how much each group of captures takes in the store.")
+    stats_parser.add_argument("-n", "--limit", type=int, default=20, help="Number of groups to list (default: 20).")
+    get_parser = actions.add_parser("get", help="Rebuild one lesson from the store.")
+    get_parser.add_argument("path", help="The lesson's hub-relative path, as in the catalog.")
+    get_parser.add_argument("-o", "--output", required=True, help="File to write the rebuilt page to.")
+    actions.add_parser("verify", help="Rebuild every snapshot and check it against its hash.")
+    args = parser.parse_args(argv)
+
+    with metrics.session("snapshots", args):
+        return run(args)
+
+
+def run(args):
+    """Carries out the parsed `coursehub snapshots` action. Returns the exit code."""
+    if args.action == "pack":
+        if not os.path.exists(args.catalog):
+            print(f"❌ Error: Lesson catalog '{args.catalog}' not found. Run `coursehub build` first.")
+            return 1
+        catalog_conn = catalog.connect(args.catalog)
+        conn = connect(args.store)
+        added, removed = pack(conn, catalog_conn, SnapshotStore(conn))
+        catalog_conn.close()
+        print(f"📥 Packed {added} new or changed lessons into '{args.store}', dropped {removed}.")
+        print_stats(conn, 0)
+        conn.close()
+        return 0
+
+    if not os.path.exists(args.store):
+        print(f"❌ Error: Snapshot store '{args.store}' not found. Run `coursehub snapshots pack` first.")
+        return 1
+    conn = connect(args.store)
+    try:
+        if args.action == "stats":
+            print_stats(conn, args.limit)
+            return 0
+        store = SnapshotStore(conn)
+        if args.action == "get":
+            try:
+                page = store.read(args.path.replace(os.path.sep, "/"))
+            except KeyError as e:
+                print(f"❌ Error: {e.args[0]}")
+                return 1
+            with open(args.output, "wb") as f:
+                f.write(page)
+            print(f"✅ Wrote '{args.output}' ({len(page) / 1e6:.1f} MB).")
+            return 0
+        failed = checked = 0
+        # Grouped by base, so each base is decompressed once
+        for row in conn.execute("SELECT path, sha256 FROM snapshots ORDER BY base, path").fetchall():
+            checked += 1
+            try:
+                error = None if hashlib.sha256(store.read(row["path"])).hexdigest() == row["sha256"] else \
+                    "rebuilt bytes differ from the stored hash"
+            except (KeyError, zlib.error, IndexError) as e:
+                error = str(e)
+            if error:
+                failed += 1
+                print(f"  -> ❌ {row['path']}: {error}")
+        if failed:
+            print(f"❌ {failed} of {checked} snapshots do not rebuild.")
+            return 1
+        print(f"✅ All {checked} snapshots rebuild byte for byte.")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
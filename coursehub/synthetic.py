@@ -0,0 +1,270 @@
+# FILE: coursehub/synthetic.py (`coursehub synth`)
+# PURPOSE: Generate a synthetic hub shaped like ours for benchmarks: course folders under
+#          the same roots (including the nested 'Excel Projects' group), SingleFile-style
+#          lesson pages (header comment, inlined fonts and SVG icons in a big <style>,
+#          base64 images in the body) plus workbook and PDF stand-ins. Scale 1 matches the
+#          real hub's shape: 17 courses with 200 lessons, 30 resource-only folders, 316
+#          workbooks and 19 PDFs. Output is fully determined by the parameters and seed.
+import argparse
+import base64
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+# --- Configuration ---
+MANIFEST_NAME = "synthetic.json"
+GENERATOR_VERSION = 1
+# Per unit of scale, taken from the real hub
+LESSON_COURSES = 17
+LESSONS = 200
+RESOURCE_FOLDERS = 30
+WORKBOOKS = 316
+PDFS = 19
+REAL_LESSON_KB = 1170               # average real capture; other file sizes scale with --lesson-kb
+REAL_WORKBOOK_KB = 59
+REAL_PDF_KB = 750
+DEFAULT_LESSON_KB = 64
+DEFAULT_IMAGES = 3
+DEFAULT_DUPLICATE_RATIO = 0.1
+FONT_WEIGHTS = (300, 400, 500, 600, 700)
+ICON_POOL = 40                      # distinct SVG icons shared by every page
+ICONS_PER_PAGE = 16
+# --- End Configuration ---
+
+LESSON_ROOTS = [
+    ("advanced-microsoft-excel", None, 0.45),
+    ("advanced-microsoft-excel", "Excel Projects", 0.35),
+    ("introduction-to-excel", None, 0.20),
+]
+RESOURCE_ROOTS = ["Maths For Finance Resources", "fixed-income-investments", "Data Strategy Resources"]
+TITLE_KINDS = ["Course Exam", "Practice Exam", "Case Study", "Quiz"]
+SITE_SUFFIX = "365 Data Science"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+CSS_PROPERTIES = ["margin", "padding", "color", "background", "border", "font-size", "line-height", "display", "gap", "width"]
+CSS_VALUES = ["0", "4px 8px", "#1e293b", "#f8fafc", "1px solid #e2e8f0", "14px", "1.5", "flex", "12px", "100%"]
+
+
+def hub_config():
+    """The hub_config.json matching a synthetic hub (same rules as the real one)."""
+    return {
+        "roots": sorted({name for name, _, _ in LESSON_ROOTS} | set(RESOURCE_ROOTS)),
+        "group_folders": ["Excel Projects"],
+    }
+
+
+def _random_bytes(rng, size):
+    return rng.getrandbits(size * 8).to_bytes(size, "little") if size else b""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _js_date(moment):
+    return moment.strftime("%a %b %d %Y %H:%M:%S GMT+0100 (West Africa Standard Time)")
+
+
+def _singlefile_name(title, moment):
+    """The file name SingleFile's default template gives a capture."""
+    name = title.replace(":", "：").replace("|", "｜")
+    return f"{name} ({moment.day:02d}_{moment.month:02d}_{moment.year} {moment:%H}：{moment:%M}：{moment:%S}).html"
+
+
+class Corpus:
+    """Shared page parts (fonts, icons, CSS rules) sized for one --lesson-kb setting."""
+
+    def __init__(self, rng, lesson_kb, images):
+        self.lesson_bytes = lesson_kb * 1024
+        self.images = images
+        # Every capture inlines the same web fonts and icon set, as the real ones do
+        font_size = max(512, self.lesson_bytes * 8 // 100 * 3 // 4)
+        self.fonts = [
+            '@font-face{font-family:"Inter";font-style:normal;font-weight:%d;src:url(data:font/woff2;base64,%s) format("woff2")}'
+            % (weight, _b64(b"wOF2" + _random_bytes(rng, font_size)))
+            for weight in FONT_WEIGHTS
+        ]
+        self.icons = [
+            '<svg width="38" height="38" viewBox="0 0 38 38" xmlns="http://www.w3.org/2000/svg"><path d="M%d %dC%d %d %d %d %d %dZ" fill="#%06x"/></svg>'
+            % (tuple(rng.randrange(38) for _ in range(8)) + (rng.getrandbits(24),))
+            for _ in range(ICON_POOL)
+        ]
+        self.rules = [
+            ".c%04x{%s:%s;%s:%s}" % (i, rng.choice(CSS_PROPERTIES), rng.choice(CSS_VALUES),
+                                     rng.choice(CSS_PROPERTIES), rng.choice(CSS_VALUES))
+            for i in range(4096)
+        ]
+
+    def page(self, rng, title, url, moment):
+        """One SingleFile-style capture of roughly lesson_bytes bytes."""
+        icons = rng.sample(range(ICON_POOL), min(ICONS_PER_PAGE, ICON_POOL))
+        icon_vars = ";".join(
+            f'--sf-img-{n}: url("data:image/svg+xml;base64,{_b64(self.icons[icon].encode("utf-8"))}")'
+            for n, icon in enumerate(icons, 1)
+        )
+        image_budget = self.lesson_bytes // 4
+        image_size = image_budget * 3 // 4 // self.images if self.images else 0
+        body_images = "".join(
+            f'<p class=c{rng.randrange(4096):04x}><img alt="figure {n}" src="data:image/png;base64,{_b64(PNG_MAGIC + _random_bytes(rng, image_size))}"></p>'
+            for n in range(self.images)
+        )
+        used_rules = rng.sample(range(len(self.rules)), 24)
+        body = (
+            f'<body> <div id=__lms><nav class=c{used_rules[0]:04x}><div class=name>{title}</div></nav>'
+            + "".join(f'<div class=c{rule:04x}><span style="background-image:var(--sf-img-{n % len(icons) + 1})"></span>'
+                      f'Question {n + 1}: choose the correct formula.</div>' for n, rule in enumerate(used_rules[1:]))
+            + body_images + "</div></body></html>"
+        )
+        head = (
+            f"<!DOCTYPE html> <html><!--\n Page saved with SingleFile \n url: {url} \n saved date: {_js_date(moment)}\n-->"
+            f"<meta charset=utf-8>\n<style>:root{{{icon_vars}}}{''.join(self.fonts)}"
+        )
+        # Fill the stylesheet with rules (most of them unused by the body) up to the target size
+        budget = self.lesson_bytes - len(head) - len(body) - 64
+        rules = []
+        while budget > 0:
+            rule = self.rules[rng.randrange(len(self.rules))]
+            rules.append(rule)
+            budget -= len(rule)
+        return f"{head}{''.join(rules)}</style><title>{title} | {SITE_SUFFIX}</title>{body}"
+
+
+def _sized_file(rng, magic, average_kb):
+    size = max(1024, int(rng.uniform(0.25, 1.75) * average_kb * 1024))
+    return magic + _random_bytes(rng, size - len(magic))
+
+
+def generate(root, scale=1, lesson_kb=DEFAULT_LESSON_KB, images=DEFAULT_IMAGES,
+             duplicate_ratio=DEFAULT_DUPLICATE_RATIO, seed=0):
+    """Writes a synthetic hub into `root` (created if needed) and returns its manifest.
+
+    `duplicate_ratio` of the lessons are re-captures of the course's previous lesson:
+    the same page saved again, so only the SingleFile header and file name differ.
+    """
+    rng = random.Random(seed)
+    corpus = Corpus(rng, lesson_kb, images)
+    size_factor = lesson_kb / REAL_LESSON_KB
+    started = datetime(2025, 11, 14, 12, 0, 0)
+    course_count = LESSON_COURSES * scale
+    lesson_count = LESSONS * scale
+    counts = {"lesson": 0, "workbook": 0, "pdf": 0}
+    total_bytes = 0
+
+    def write(path, data):
+        nonlocal total_bytes
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    # Spread the lessons over the courses unevenly, like the real hub (1 to ~27 per course)
+    weights = [rng.uniform(0.1, 2.0) for _ in range(course_count)]
+    total_weight = sum(weights)
+    per_course = [max(1, round(lesson_count * weight / total_weight)) for weight in weights]
+    workbooks_left, pdfs_left = WORKBOOKS * scale, PDFS * scale
+
+    for index, lessons in enumerate(per_course):
+        pick = rng.random()
+        for root_name, group, share in LESSON_ROOTS:
+            pick -= share
+            if pick <= 0:
+                break
+        course = os.path.join(root, root_name, *([group] if group else []), f"Synthetic Course {index:05d}")
+        course_title = f"Synthetic Course {index:05d}"
+        previous = None
+        for n in range(lessons):
+            moment = started + timedelta(days=index % 30, minutes=n * 7, seconds=rng.randrange(60))
+            if previous and rng.random() < duplicate_ratio:
+                title, url, state = previous
+                page_rng = random.Random()
+                page_rng.setstate(state)
+            else:
+                title = f"{rng.choice(TITLE_KINDS)}: {course_title} Part {n + 1}"
+                url = f"https://learn.365datascience.com/exams/{rng.randrange(10**6, 10**7)}/"
+                page_rng = rng
+                previous = (title, url, rng.getstate())
+            write(os.path.join(course, _singlefile_name(f"{title} | {SITE_SUFFIX}", moment)),
+                  corpus.page(page_rng, title, url, moment).encode("utf-8"))
+            counts["lesson"] += 1
+        for n in range(min(workbooks_left, rng.randrange(0, 4))):
+            write(os.path.join(course, f"Workbook {n + 1}.xlsx"), _sized_file(rng, b"PK\x03\x04", REAL_WORKBOOK_KB * size_factor))
+            workbooks_left -= 1
+            counts["workbook"] += 1
+
+    # Resource-only folders hold the remaining workbooks and all PDFs
+    folders = RESOURCE_FOLDERS * scale
+    for index in range(folders):
+        folder = os.path.join(root, RESOURCE_ROOTS[index % len(RESOURCE_ROOTS)], f"Resources {index:05d}")
+        workbooks = workbooks_left // (folders - index)
+        pdfs = pdfs_left // (folders - index)
+        for n in range(workbooks):
+            write(os.path.join(folder, f"Model {n + 1}.xlsx"), _sized_file(rng, b"PK\x03\x04", REAL_WORKBOOK_KB * size_factor))
+        for n in range(pdfs):
+            write(os.path.join(folder, f"Notes {n + 1}.pdf"), _sized_file(rng, b"%PDF-1.4\n", REAL_PDF_KB * size_factor))
+        os.makedirs(folder, exist_ok=True)
+        workbooks_left -= workbooks
+        pdfs_left -= pdfs
+        counts["workbook"] += workbooks
+        counts["pdf"] += pdfs
+
+    with open(os.path.join(root, "hub_config.json"), "w", encoding="utf-8") as f:
+        json.dump(hub_config(), f, indent=4)
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "parameters": {"scale": scale, "lesson_kb": lesson_kb, "images": images,
+                       "duplicate_ratio": duplicate_ratio, "seed": seed},
+        "courses": course_count,
+        "lessons": counts["lesson"],
+        "workbooks": counts["workbook"],
+        "pdfs": counts["pdf"],
+        "total_bytes": total_bytes,
+    }
+    with open(os.path.join(root, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def read_manifest(root):
+    """The manifest of a previously generated hub, or None."""
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def estimated_bytes(scale, lesson_kb):
+    """Rough disk footprint of a synthetic hub, for checking free space up front."""
+    size_factor = lesson_kb / REAL_LESSON_KB
+    per_unit = LESSONS * lesson_kb + (WORKBOOKS * REAL_WORKBOOK_KB + PDFS * REAL_PDF_KB) * size_factor
+    return int(per_unit * scale * 1024)
+
+
+def add_arguments(parser):
+    """The corpus-shape options shared by `coursehub synth` and `coursehub bench`."""
+    parser.add_argument("--lesson-kb", type=int, default=DEFAULT_LESSON_KB,
+                        help=f"Average lesson size in KB (default: {DEFAULT_LESSON_KB}; real captures average {REAL_LESSON_KB}).")
+    parser.add_argument("--images", type=int, default=DEFAULT_IMAGES, help=f"Base64 images per lesson (default: {DEFAULT_IMAGES}).")
+    parser.add_argument("--duplicate-ratio", type=float, default=DEFAULT_DUPLICATE_RATIO,
+                        help=f"Share of lessons that are re-captures of the previous lesson (default: {DEFAULT_DUPLICATE_RATIO}).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub synth", description="Generate a synthetic course hub for benchmarking.")
+    parser.add_argument("directory", help="Where to create the hub (should be empty or missing).")
+    parser.add_argument("--scale", type=int, default=1, help="Multiple of the real hub's size (default: 1).")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.scale < 1 or args.lesson_kb < 1 or args.images < 0 or not 0 <= args.duplicate_ratio <= 1:
+        parser.error("--scale and --lesson-kb must be positive, --images non-negative and --duplicate-ratio within 0..1")
+
+    print(f"🏗️  Generating a {args.scale}× synthetic hub in '{args.directory}' (about {estimated_bytes(args.scale, args.lesson_kb) / 1e6:.0f} MB)...")
+    manifest = generate(args.directory, args.scale, args.lesson_kb, args.images, args.duplicate_ratio, args.seed)
+    print(f"✅ {manifest['courses']} courses, {manifest['lessons']} lessons, {manifest['workbooks']} workbooks, "
+          f"{manifest['pdfs']} PDFs ({manifest['total_bytes'] / 1e6:.1f} MB).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
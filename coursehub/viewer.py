@@ -1,44 +1,18 @@
-# FILE: update_all_viewers.py
-# PURPOSE: To run from the root folder (e.g., 'Business Analyst') and automatically
-#          generate a modern viewer.html for every single course subfolder.
+# FILE: coursehub/viewer.py
+# PURPOSE: The course viewer (viewer.html) template and its renderer. The template is
+#          parsed once per process and shared by every course, whether the viewers are
+#          built by `coursehub build` from the catalog or by `coursehub viewer` for an
+#          explicit list of folders. A course's workbooks and PDFs are listed under its
+#          lessons as resources that open in a new tab, so a course without any lessons
+#          still gets a viewer.
+import argparse
+import hashlib
+import json
 import os
 
-print("🚀 Starting viewer generation process...")
-
-# --- Configuration ---
-# This is the main folder that contains all your course categories like 'advanced-microsoft-excel'
-# Since this script is in the root, we look for folders in the current directory.
-ROOT_SEARCH_PATHS = ["advanced-microsoft-excel", "introduction-to-excel"] # Add other main folders if you have them
-# --- End Configuration ---
-
-course_folders = []
-
-# Find all the individual course folders
-for search_path in ROOT_SEARCH_PATHS:
-    if not os.path.exists(search_path):
-        print(f"⚠️ Warning: Search path '{search_path}' not found. Skipping.")
-        continue
-    
-    for item in sorted(os.listdir(search_path)):
-        full_path = os.path.join(search_path, item)
-        if os.path.isdir(full_path):
-            # Special handling for nested project folders
-            if item in ["Excel Projects"]:
-                for sub_item in sorted(os.listdir(full_path)):
-                    sub_full_path = os.path.join(full_path, sub_item)
-                    if os.path.isdir(sub_full_path):
-                        course_folders.append(sub_full_path)
-            else:
-                course_folders.append(full_path)
-
-
-if not course_folders:
-    print("❌ Error: No course folders found. Make sure your ROOT_SEARCH_PATHS are correct.")
-    exit(1)
-
-print(f"Found {len(course_folders)} course folders to process.")
-
-# --- The HTML Template (DO NOT CHANGE) ---
+from . import metrics, singlefile, walker, writer
+
+# --- The HTML Template (with a new placeholder for the dynamic home path) ---
 html_template = """<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -55,7 +29,7 @@ html_template = """<!DOCTYPE html>
             --light-bg: #111827; --white-bg: #1f2937; --border-light: #374151; --text-dark: #f9fafb; --text-gray: #9ca3af; --sidebar-bg: #0f172a; --sidebar-active-bg: #1e293b;
         }}
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Inter', sans-serif; display: flex; height: 100vh; overflow: hidden; background-color: var(--light-bg); color: var(--text-dark); transition: var(--transition-ease); }}
+        body {{ font-family: 'Inter', sans-serif; display: flex; height: 100vh; overflow: hidden; background-color: var(--light-bg); color: var--text-dark; transition: var(--transition-ease); }}
         #sidebar {{ width: 320px; flex-shrink: 0; background: var(--sidebar-bg); color: var(--sidebar-text); display: flex; flex-direction: column; transition: var(--transition-ease); border-right: 1px solid var(--border-light); }}
         .sidebar-header {{ padding: 20px; border-bottom: 1px solid rgba(255, 255, 255, 0.1); display: flex; align-items: center; gap: 15px; }}
         .sidebar-icon {{ font-size: 28px; color: var(--primary-green); }}
@@ -75,6 +49,10 @@ html_template = """<!DOCTYPE html>
         .file-item.active {{ background-color: var(--sidebar-active-bg); color: white; font-weight: 600; border-left-color: var(--accent-yellow); }}
         .file-number {{ color: var(--text-gray); font-weight: 400; }}
         .file-item.active .file-number {{ color: rgba(255, 255, 255, 0.7); }}
+        .file-label {{ display: flex; flex-direction: column; gap: 2px; }}
+        .file-meta {{ font-size: 12px; font-weight: 400; color: var(--text-gray); }}
+        .file-section {{ padding: 15px 15px 5px; font-size: 12px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em; color: var(--text-gray); }}
+        a.file-item {{ color: inherit; text-decoration: none; }}
         #viewer-container {{ flex-grow: 1; display: flex; flex-direction: column; background-color: var(--white-bg); transition: var(--transition-ease); }}
         #viewer-topbar {{ display: flex; justify-content: space-between; align-items: center; padding: 0 25px; height: 65px; border-bottom: 1px solid var(--border-light); flex-shrink: 0; transition: var(--transition-ease); }}
         #lesson-status {{ font-weight: 500; color: var(--text-gray); }}
@@ -113,7 +91,7 @@ html_template = """<!DOCTYPE html>
     <div id="viewer-topbar">
         <div id="lesson-status">Select a lesson to begin</div>
         <div class="topbar-actions">
-            <a href="../../index.html" class="nav-btn icon-btn" title="Back to Dashboard"><i class="fas fa-home"></i></a>
+            <a href="{HOME_PATH}" class="nav-btn icon-btn" title="Back to Dashboard"><i class="fas fa-home"></i></a>
             <button class="nav-btn" id="prevBtn" onclick="navigatePrev()" disabled><i class="fas fa-arrow-left"></i> <span>Previous</span></button>
             <button class="nav-btn nav-primary" id="nextBtn" onclick="navigateNext()" disabled><span>Next</span> <i class="fas fa-arrow-right"></i></button>
         </div>
@@ -130,29 +108,41 @@ html_template = """<!DOCTYPE html>
 </main>
 <script>
     const files = {FILES_JS};
+    const resources = {RESOURCES_JS};
     let currentIndex = -1;
     const courseTitle = "{COURSE_TITLE}";
 
     const fileListDiv = document.getElementById('fileList'), contentFrame = document.getElementById('content'), emptyStateDiv = document.getElementById('empty-state'), lessonStatusDiv = document.getElementById('lesson-status'), prevBtn = document.getElementById('prevBtn'), nextBtn = document.getElementById('nextBtn'), searchInput = document.getElementById('search'), progressBar = document.getElementById('progress-bar'), lessonCountP = document.getElementById('lesson-count');
 
-    function cleanFileName(path) {{
-        let name = path.split('/').pop().replace(/\\.html$/, '').replace(/[_-]/g, ' ');
-        name = name.replace(/Course Exam：/gi, '').replace(/Practice Exam：/gi, '').replace(/Solution/gi, '');
-        name = name.replace(/｜ 365 Data Science/gi, '').replace(/\\(d{{2}}_d{{2}}_d{{4}} d{{2}}：d{{2}}：d{{2}}\\)/, '');
-        return name.trim().split(' ').map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(' ');
-    }}
-
     function loadFileList() {{
         fileListDiv.innerHTML = '';
         files.forEach((file, index) => {{
             const div = document.createElement('div');
             div.className = 'file-item';
             div.dataset.index = index;
-            div.innerHTML = `<span class="file-number">${{String(index + 1).padStart(2, '0')}}.</span><span>${{cleanFileName(file)}}</span>`;
+            div.title = file.url;
+            div.innerHTML = `<span class="file-number">${{String(index + 1).padStart(2, '0')}}.</span><span class="file-label"><span></span><span class="file-meta"></span></span>`;
+            div.querySelector('.file-label span').textContent = file.title;
+            div.querySelector('.file-meta').textContent = file.captured;
             div.onclick = () => loadFile(index);
             fileListDiv.appendChild(div);
         }});
-        lessonCountP.textContent = `${{files.length}} Lessons`;
+        if (resources.length) {{
+            const heading = document.createElement('div');
+            heading.className = 'file-section';
+            heading.textContent = 'Resources';
+            fileListDiv.appendChild(heading);
+        }}
+        resources.forEach(resource => {{
+            const link = document.createElement('a');
+            link.className = 'file-item';
+            link.href = encodeURI(resource.path);
+            link.target = '_blank';
+            link.innerHTML = `<span class="file-number"><i class="fas ${{resource.kind === 'pdf' ? 'fa-file-pdf' : 'fa-file-excel'}}"></i></span><span class="file-label"><span></span></span>`;
+            link.querySelector('.file-label span').textContent = resource.title;
+            fileListDiv.appendChild(link);
+        }});
+        lessonCountP.textContent = `${{files.length}} Lessons` + (resources.length ? ` · ${{resources.length}} Resources` : '');
     }}
 
     function loadFile(index) {{
@@ -160,11 +150,12 @@ html_template = """<!DOCTYPE html>
         currentIndex = index;
         const file = files[index];
 
-        contentFrame.src = encodeURI(file);
+        contentFrame.src = encodeURI(file.path);
         contentFrame.style.display = 'block';
         emptyStateDiv.style.display = 'none';
 
-        lessonStatusDiv.innerHTML = `Lesson <span>${{index + 1}} of ${{files.length}}</span>: ${{cleanFileName(file)}}`;
+        lessonStatusDiv.innerHTML = `Lesson <span>${{index + 1}} of ${{files.length}}</span>: `;
+        lessonStatusDiv.append(file.title);
         
         document.querySelectorAll('.file-item').forEach(item => {{
             const itemIndex = parseInt(item.dataset.index);
@@ -211,45 +202,140 @@ html_template = """<!DOCTYPE html>
 </html>"""
 # --- End of Template ---
 
+TEMPLATE_HASH = hashlib.sha256(html_template.encode("utf-8")).hexdigest()
+
+
+def lesson_entry(lesson):
+    """The precomputed metadata the viewer shows for one lesson (no client-side parsing)."""
+    title = lesson["title"] or singlefile.title_from_filename(lesson["rel_path"])
+    return {
+        "path": lesson["rel_path"],
+        "title": singlefile.lesson_label(title),
+        "captured": singlefile.capture_label(lesson["captured_at"]),
+        "url": lesson["source_url"] or "",
+    }
+
 
-# Loop through each found course folder and generate a viewer
-for course_path in course_folders:
-    print(f"\nProcessing: {course_path}")
-    
+def resource_entry(resource):
+    """What the viewer shows for one workbook or PDF: its file name without the extension."""
+    return {
+        "path": resource["rel_path"],
+        "title": os.path.splitext(os.path.basename(resource["rel_path"]))[0],
+        "kind": resource["kind"],
+    }
+
+
+def render_viewer(course_path, lessons, resources=()):
+    """Fills the viewer template for one course and returns the final HTML and home path."""
+    with metrics.phase("render", course_path):
+        return _render_viewer(course_path, lessons, resources)
+
+
+def _render_viewer(course_path, lessons, resources):
     # Sanitize folder name for the title
     course_title = os.path.basename(course_path).replace("-", " ").replace("_", " ").title()
 
-    # Find all HTML files for this specific course
-    html_files = []
-    for root, dirs, files in os.walk(course_path):
-        dirs[:] = [d for d in dirs if not d.startswith('.')] # ignore hidden dirs
-        for file in files:
-            if file.endswith('.html') and 'viewer.html' not in file.lower():
-                # Get the path of the file relative to the course folder
-                # This is CRITICAL for the iframe src to work correctly
-                full_path = os.path.join(root, file)
-                relative_path = os.path.relpath(full_path, course_path).replace(os.path.sep, '/')
-                html_files.append(relative_path)
-    
-    html_files.sort()
-
-    if not html_files:
-        print(f"  -> ⚠️ No lesson files found. Skipping.")
-        continue
-
-    # Prepare the list of files for JavaScript injection
-    files_js_string = "[\n    " + ",\n    ".join([f'"{f}"' for f in html_files]) + "\n]"
-
-    # Populate the template with course-specific data
-    final_html = html_template.format(COURSE_TITLE=course_title, FILES_JS=files_js_string)
-
-    # Write the new viewer.html file inside the course folder
+    # Prepare the lesson and resource metadata for JavaScript injection ("</" is escaped so a title
+    # can never close the surrounding <script> element)
+    entries = [json.dumps(lesson_entry(lesson), ensure_ascii=False).replace("</", "<\\/") for lesson in lessons]
+    files_js_string = "[\n    " + ",\n    ".join(entries) + "\n]"
+    entries = [json.dumps(resource_entry(resource), ensure_ascii=False).replace("</", "<\\/") for resource in resources]
+    resources_js_string = "[\n    " + ",\n    ".join(entries) + "\n]" if entries else "[]"
+
+    # ================================================================= #
+    # ===== NEW: Dynamically calculate the path back to index.html ==== #
+    # ================================================================= #
+    depth = len(course_path.split(os.path.sep))
+    home_path = os.path.join(*(['..'] * depth), 'index.html').replace(os.path.sep, '/')
+
+    # Populate the template with course-specific data, including the new home_path
+    final_html = html_template.format(
+        COURSE_TITLE=course_title,
+        FILES_JS=files_js_string,
+        RESOURCES_JS=resources_js_string,
+        HOME_PATH=home_path
+    )
+    return final_html, home_path
+
+
+def course_files(course_path, config):
+    """Lesson and resource records for a folder read straight from disk (no catalog), in
+    walker order. Returns (lessons, resources)."""
+    lessons, resources = [], []
+    for hub_file in walker.walk_course(course_path, config):
+        if hub_file.kind != "lesson":
+            resources.append({"rel_path": hub_file.rel_path, "kind": hub_file.kind})
+            continue
+        with metrics.phase("read", hub_file.path):
+            title, source_url, captured_at = singlefile.probe(hub_file.path)
+        metrics.count("files_read")
+        metrics.count("bytes_read", min(hub_file.size, singlefile.HEADER_READ_SIZE))
+        lessons.append({"rel_path": hub_file.rel_path, "title": title,
+                        "source_url": source_url, "captured_at": captured_at})
+    return lessons, resources
+
+
+def contents(lessons, resources):
+    """'12 lessons', or '12 lessons, 3 resources' when a course has resources."""
+    return f"{lessons} lessons" + (f", {resources} resources" if resources else "")
+
+
+def write_viewer(course_path, lessons, resources=()):
+    """Renders <course_path>/viewer.html and writes it only if its bytes changed.
+
+    Returns (viewer path, home path, written).
+    """
+    final_html, home_path = render_viewer(course_path, lessons, resources)
     viewer_file_path = os.path.join(course_path, "viewer.html")
-    try:
-        with open(viewer_file_path, "w", encoding="utf-8") as f:
-            f.write(final_html)
-        print(f"  -> ✅ Successfully generated '{viewer_file_path}' with {len(html_files)} lessons.")
-    except Exception as e:
-        print(f"  -> ❌ Error writing file for {course_path}: {e}")
-
-print("\n\n🎉 All viewers have been updated! Please hard-refresh your browser (Ctrl+Shift+R or Cmd+Shift+R).")
+    return viewer_file_path, home_path, writer.write_if_changed(viewer_file_path, final_html)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="coursehub viewer",
+        description="Generate viewer.html for the given course folders in one process (run from the hub root).")
+    parser.add_argument("folders", nargs="+", help="Course folders, relative to the hub root.")
+    parser.add_argument("--config", default=walker.CONFIG_PATH, help=f"Hub configuration file (default: {walker.CONFIG_PATH}).")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with metrics.session("viewer", args):
+        return generate_viewers(args)
+
+
+def generate_viewers(args):
+    """Renders the viewers of args.folders one after another. Returns the exit code."""
+    config = walker.load_config(args.config)
+    generated = identical = failed = 0
+    for folder in args.folders:
+        # The home link is derived from the folder's depth below the hub root
+        course_path = os.path.normpath(os.path.relpath(folder))
+        print(f"\nProcessing: {course_path}")
+        try:
+            lessons, resources = course_files(course_path, config)
+            if not lessons and not resources:
+                print(f"  -> ⚠️ No lesson or resource files found. Skipping.")
+                metrics.count("courses_empty")
+                continue
+            viewer_file_path, home_path, written = write_viewer(course_path, lessons, resources)
+        except OSError as e:
+            print(f"  -> ❌ Error generating viewer for {course_path}: {e}")
+            failed += 1
+            metrics.count("courses_error")
+            continue
+        if not written:
+            print(f"  -> 💤 '{viewer_file_path}' is already identical ({contents(len(lessons), len(resources))}). Left untouched.")
+            identical += 1
+            metrics.count("courses_identical")
+            continue
+        print(f"  -> ✅ Successfully generated '{viewer_file_path}' with {contents(len(lessons), len(resources))} "
+              f"and correct home path '{home_path}'.")
+        generated += 1
+        metrics.count("courses_generated")
+
+    print(f"\n📋 Generated: {generated}, identical output: {identical}, errors: {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
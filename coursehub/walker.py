@@ -0,0 +1,178 @@
+# FILE: coursehub/walker.py
+# PURPOSE: The one place that knows where courses live. Course roots and include/exclude
+#          rules come from hub_config.json; discovery and walking use os.scandir and reuse
+#          each DirEntry's cached type and stat, so a full-hub scan is a single pass.
+#          A course folder with no servable file anywhere below it is pruned as soon as
+#          it is found, so it never becomes an empty course. `coursehub courses` lists
+#          course folders for the shell scripts.
+import argparse
+import fnmatch
+import json
+import os
+import sys
+
+from . import metrics
+
+# --- Configuration ---
+CONFIG_PATH = "hub_config.json"
+DEFAULT_CONFIG = {
+    # Top-level folders whose children are courses
+    "roots": ["advanced-microsoft-excel", "introduction-to-excel"],
+    # Folders inside a root whose children are courses of their own
+    "group_folders": ["Excel Projects"],
+    # Servable files and the catalog kind they are recorded as
+    "kinds": {".html": "lesson", ".xlsx": "workbook", ".xlsm": "workbook", ".xls": "workbook", ".pdf": "pdf"},
+    # Glob patterns (matched case-insensitively against a file or folder name) that are never served
+    "exclude": [".*", "__pycache__", "*viewer.html*"],
+}
+# --- End Configuration ---
+
+
+class HubFile:
+    """One servable file found by the walker, with the stat data from its DirEntry."""
+
+    __slots__ = ("path", "rel_path", "kind", "size", "mtime_ns")
+
+    def __init__(self, path, rel_path, kind, size, mtime_ns):
+        self.path = path
+        self.rel_path = rel_path
+        self.kind = kind
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+
+def load_config(path=CONFIG_PATH):
+    """Loads hub_config.json, filling any missing keys from DEFAULT_CONFIG."""
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            config.update(json.load(f))
+    config["kinds"] = {ext.lower(): kind for ext, kind in config["kinds"].items()}
+    config["exclude"] = [pattern.lower() for pattern in config["exclude"]]
+    return config
+
+
+def is_excluded(name, config):
+    name = name.lower()
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in config["exclude"])
+
+
+def _subdirs(path, config):
+    """Sorted, non-excluded child folders of `path` (no stat calls: d_type is enough)."""
+    try:
+        with os.scandir(path) as it:
+            entries = [entry for entry in it if entry.is_dir() and not is_excluded(entry.name, config)]
+    except OSError:
+        return []
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+
+def has_servable(path, config):
+    """True if a servable file lies anywhere below `path`. The search stops at the first
+    one, so a folder with content usually costs a single scandir."""
+    kinds = config["kinds"]
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = [entry for entry in it if not is_excluded(entry.name, config)]
+        except OSError:
+            continue
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() in kinds and entry.is_file():
+                return True
+        stack.extend(entry.path for entry in entries if entry.is_dir())
+    return False
+
+
+def find_courses(config):
+    """Returns every course folder below the configured roots that holds a servable
+    file, in display order.
+
+    Missing roots are reported on stderr and skipped.
+    """
+    with metrics.phase("walk", "course roots"):
+        return _find_courses(config)
+
+
+def _find_courses(config):
+    courses = []
+    group_folders = set(config["group_folders"])
+    for root in config["roots"]:
+        if not os.path.isdir(root):
+            print(f"⚠️ Warning: Search path '{root}' not found. Skipping.", file=sys.stderr)
+            continue
+        for entry in _subdirs(root, config):
+            if entry.name in group_folders:
+                courses.extend(sub.path for sub in _subdirs(entry.path, config))
+            else:
+                courses.append(entry.path)
+    found = [course for course in courses if has_servable(course, config)]
+    metrics.count("courses_pruned", len(courses) - len(found))
+    return found
+
+
+def walk_course(course_path, config):
+    """Returns every servable file below a course folder, sorted by relative path.
+
+    Excluded folders are pruned before they are opened, file types are decided from
+    the name alone, and only servable files are stat'ed (once, via DirEntry.stat()).
+    """
+    with metrics.phase("walk", course_path):
+        return _walk_course(course_path, config)
+
+
+def _walk_course(course_path, config):
+    kinds = config["kinds"]
+    found = []
+    stack = [(course_path, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            if directory == course_path:
+                raise
+            continue
+        metrics.count("dirs_scanned")
+        for entry in entries:
+            if is_excluded(entry.name, config):
+                continue
+            rel_path = prefix + entry.name
+            if entry.is_dir():
+                stack.append((entry.path, rel_path + "/"))
+                continue
+            kind = kinds.get(os.path.splitext(entry.name)[1].lower())
+            if kind is None or not entry.is_file():
+                continue
+            st = entry.stat()
+            found.append(HubFile(entry.path, rel_path, kind, st.st_size, st.st_mtime_ns))
+    metrics.count("files_statted", len(found))
+    found.sort(key=lambda hub_file: hub_file.rel_path)
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coursehub courses", description="List the course folders that contain servable files.")
+    parser.add_argument("--config", default=CONFIG_PATH, help=f"Hub configuration file (default: {CONFIG_PATH}).")
+    parser.add_argument("-0", "--print0", action="store_true", help="Terminate paths with NUL instead of newline.")
+    parser.add_argument("--kind", action="append", help="Only consider files of this kind (repeatable, e.g. --kind lesson).")
+    parser.add_argument("--count", action="store_true", help="Prefix each path with its file count and a tab.")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    end = "\0" if args.print0 else "\n"
+    for course_path in find_courses(config):
+        files = walk_course(course_path, config)
+        if args.kind:
+            files = [hub_file for hub_file in files if hub_file.kind in args.kind]
+        if files:
+            sys.stdout.write(f"{len(files)}\t{course_path}{end}" if args.count else course_path + end)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+# FILE: coursehub/writer.py
+# PURPOSE: Write generated files (viewer.html, index.html, hub_scan.json) only when their
+#          bytes change. An identical rebuild leaves the file, its mtime and every browser
+#          or HTTP cache validator untouched; a real change lands via temp file + rename
+#          so the web server never serves a half-written page.
+import hashlib
+import os
+
+from . import metrics
+from .catalog import hash_file
+
+
+def is_identical(path, data):
+    """True if `path` already holds exactly `data` (bytes). Size is checked before hashing."""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        return hash_file(path) == hashlib.sha256(data).hexdigest()
+    except OSError:
+        return False
+
+
+def write_if_changed(path, text):
+    """Writes `text` (UTF-8) to `path` unless the file is already identical.
+
+    Returns True if the file was written, False if it was left untouched.
+    """
+    return write_bytes_if_changed(path, text.encode("utf-8"))
+
+
+def write_bytes_if_changed(path, data):
+    """write_if_changed() for bytes that are not UTF-8 text."""
+    with metrics.phase("write", path):
+        if is_identical(path, data):
+            metrics.count("outputs_unchanged")
+            return False
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    metrics.count("outputs_written")
+    metrics.count("bytes_written", len(data))
+    return True
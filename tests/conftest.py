@@ -0,0 +1,61 @@
+# FILE: tests/conftest.py
+# PURPOSE: A tiny hub for the tests: two courses of SingleFile-style lessons with inlined
+#          images, icons and fonts, shared and unused CSS, plus a workbook. Each test gets
+#          its own copy as the working directory, since coursehub works from the hub root.
+import base64
+import os
+
+import pytest
+
+PNG = bytes(range(256)) * 4
+FONT = b"wOF2" + bytes(range(255, -1, -1)) * 3
+
+
+def svg_icon(path):
+    return (b'<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24">'
+            b'<path d="' + path + b'"/></svg>')
+
+
+def data_uri(mime, data):
+    return b"data:" + mime + b";base64," + base64.b64encode(data)
+
+
+def lesson(title, url, body):
+    """A page shaped like a SingleFile capture: header comment, shared <style> elements,
+    an @font-face block, an icon and an image as data URIs."""
+    return b"".join([
+        b"<!DOCTYPE html> <html><!--\n Page saved with SingleFile \n url: " + url + b" \n"
+        b" saved date: Sat Nov 15 2025 10:27:53 GMT+0100 (West Africa Standard Time)\n--><meta charset=utf-8>\n",
+        b"<title>" + title + b"</title>\n",
+        b"<style>@font-face{font-family:Inter;src:url(" + data_uri(b"font/woff2", FONT) + b")}</style>",
+        b"<style>body { margin: 0; }  /* layout */ .card { padding: 4px; animation: fade 1s; }\n"
+        b"@keyframes fade { from { opacity: 0; } to { opacity: 1; } }\n"
+        b".never-used-anywhere { color: red; background: linear-gradient(90deg, #16a34a 0%, #facc15 100%); "
+        b"border: 1px solid #e2e8f0; }</style>\n",
+        b"<body><div class=card>\n  <img src=\"" + data_uri(b"image/svg+xml", svg_icon(b"M0 0h24v24H0z")) + b"\">\n",
+        b"  <img src=\"" + data_uri(b"image/svg+xml", svg_icon(b"M12 2l10 20H2z")) + b"\">\n",
+        b"  <img src=\"" + data_uri(b"image/png", PNG) + b"\">\n",
+        b"  <p>" + body + b"</p>\n</div></body></html>\n",
+    ])
+
+
+HUB = {
+    "advanced-microsoft-excel/Pivot Table Exam/1 Intro (14_11_2025 20：17：08).html":
+        lesson(b"Intro | 365 Financial Analyst", b"https://example.com/exams/1/", b"Pivot tables summarise rows."),
+    "advanced-microsoft-excel/Pivot Table Exam/2 Slicers.html":
+        lesson(b"Slicers", b"https://example.com/exams/2/", b"Slicers filter a pivot table."),
+    "advanced-microsoft-excel/Pivot Table Exam/data.xlsx": b"PK\x03\x04 not really a workbook",
+    "introduction-to-excel/Section 1/Course notes/Formulas.pdf": b"%PDF-1.4 not really a pdf",
+    "introduction-to-excel/Empty Section/notes.txt": b"not servable",
+}
+
+
+@pytest.fixture
+def hub(tmp_path, monkeypatch):
+    """The tiny hub in a fresh folder, which becomes the working directory."""
+    for path, data in HUB.items():
+        full = tmp_path.joinpath(*path.split("/"))
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_bytes(data)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,78 @@
+import hashlib
+import os
+
+from coursehub import assets, build, catalog
+from conftest import HUB, PNG
+
+COURSE = "advanced-microsoft-excel/Pivot Table Exam"
+LESSONS = [path for path in HUB if path.startswith(COURSE) and path.endswith(".html")]
+
+
+def test_extract_and_restore_round_trip():
+    page = HUB[LESSONS[0]]
+    prefix = assets.asset_prefix(LESSONS[0])
+    rewritten, found, extracted, kept = assets.extract(page, prefix, {})
+    assert (extracted, kept) == (4, 0)
+    assert len(rewritten) < len(page) and b"data:image/png" not in rewritten
+    assert PNG in found.values()
+    assert assets.restore(rewritten, prefix, found.__getitem__) == page
+
+
+def test_non_canonical_base64_stays_inline():
+    page = b'<img src="data:image/png;base64,' + b"QUJD" * 40 + b'Q=">'
+    rewritten, found, extracted, kept = assets.extract(page, "../assets/", {})
+    assert (rewritten, found, extracted, kept) == (page, {}, 0, 1)
+
+
+def site_lessons(hub, capsys):
+    assert build.main(["--site"]) == 0
+    capsys.readouterr()
+    conn = catalog.connect()
+    restored = list(assets.site_lessons(conn, assets.SITE_PATH))
+    conn.close()
+    return restored
+
+
+def test_site_lessons_restore_byte_for_byte(hub, capsys):
+    restored = site_lessons(hub, capsys)
+    assert sorted(lesson["path"] for lesson, _, _ in restored) == sorted(LESSONS)
+    for lesson, page, error in restored:
+        assert error is None
+        assert page == HUB[lesson["path"]]
+        served = (hub / assets.SITE_PATH / lesson["path"]).read_bytes()
+        assert len(served) < len(page) and b"data:image/png" not in served
+    # The workbook is copied as is, next to the lessons
+    assert (hub / assets.SITE_PATH / COURSE / "data.xlsx").read_bytes() == HUB[f"{COURSE}/data.xlsx"]
+
+
+def test_keyframes_of_kept_rules_stay_and_unused_rules_move(hub, capsys):
+    site_lessons(hub, capsys)
+    store = hub / assets.SITE_PATH / assets.ASSETS_DIR
+    served = (hub / assets.SITE_PATH / LESSONS[1]).read_bytes()
+    served += b"".join(path.read_bytes() for path in store.iterdir() if path.suffix == ".css" and b"coursehub:" in path.read_bytes())
+    assert b"@keyframes fade" in served and b"animation: fade" in served
+    assert b".never-used-anywhere" not in served
+    moved = [path.read_bytes() for path in store.iterdir() if path.suffix == ".css" and path.read_bytes().startswith(b".never-used")]
+    assert len(moved) == 1
+
+
+def test_edited_site_lesson_fails_verification(hub, capsys):
+    site_lessons(hub, capsys)
+    served = hub / assets.SITE_PATH / LESSONS[0]
+    served.write_bytes(served.read_bytes() + b" ")
+    conn = catalog.connect()
+    errors = {lesson["path"]: error for lesson, _, error in assets.site_lessons(conn, assets.SITE_PATH)}
+    conn.close()
+    assert errors[LESSONS[0]] == "served page is not the minified form of its verified page"
+    assert errors[LESSONS[1]] is None
+
+
+def test_lesson_that_fails_the_round_trip_is_served_verbatim(hub, capsys, monkeypatch):
+    real = assets.restore_lesson
+    monkeypatch.setattr(assets, "restore_lesson", lambda html, prefix, load: real(html, prefix, load) + b"!")
+    lessons = [{"path": path, "size": len(HUB[path]), "sha256": hashlib.sha256(HUB[path]).hexdigest()} for path in LESSONS]
+    result = assets.build_site_lessons(assets.SITE_PATH, lessons)
+    assert sorted(result["verbatim"]) == sorted(LESSONS) and result["sources"] == {}
+    for path in LESSONS:
+        assert open(assets.site_path(assets.SITE_PATH, path), "rb").read() == HUB[path]
+    assert not any(name.endswith(".html.z") for name in os.listdir(os.path.join(assets.SITE_PATH, assets.ASSETS_DIR)))
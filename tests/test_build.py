@@ -0,0 +1,60 @@
+import json
+
+from coursehub import build, catalog
+
+COURSE = "advanced-microsoft-excel/Pivot Table Exam"
+
+
+def build_hub(capsys, *argv):
+    assert build.main(["-j", "2", *argv]) == 0
+    return capsys.readouterr().out
+
+
+def test_second_build_is_all_cached(hub, capsys):
+    first = build_hub(capsys)
+    assert "Generated: 2, identical output: 0, unchanged inputs: 0, empty: 0, errors: 0" in first
+    assert "0 lessons, 1 resources" in first
+    second = build_hub(capsys)
+    assert "Generated: 0, identical output: 0, unchanged inputs: 2" in second
+    assert "is up to date" in second
+
+
+def test_viewer_lists_lessons_and_resources(hub, capsys):
+    build_hub(capsys)
+    page = (hub / COURSE / "viewer.html").read_text(encoding="utf-8")
+    assert '"title": "Intro"' in page and '"captured": "15 Nov 2025, 10:27"' in page
+    assert '"path": "data.xlsx", "title": "data", "kind": "workbook"' in page
+    dashboard = (hub / "index.html").read_text(encoding="utf-8")
+    assert "Introduction To Excel: Section 1" in dashboard and "1 resources" in dashboard
+
+
+def test_hand_edited_viewer_is_repaired(hub, capsys):
+    build_hub(capsys)
+    viewer = hub / COURSE / "viewer.html"
+    built = viewer.read_bytes()
+    viewer.write_bytes(built.replace(b"Slicers", b"Slicerz"))
+    assert "Successfully generated" in build_hub(capsys)
+    assert viewer.read_bytes() == built
+
+
+def test_changed_lesson_rebuilds_only_its_course(hub, capsys):
+    build_hub(capsys)
+    lesson = hub / COURSE / "2 Slicers.html"
+    lesson.write_bytes(lesson.read_bytes().replace(b"<title>Slicers</title>", b"<title>Slicers 2</title>"))
+    out = build_hub(capsys)
+    assert "Generated: 1, identical output: 0, unchanged inputs: 1" in out
+    scan = json.loads((hub / build.SCAN_PATH).read_text(encoding="utf-8"))
+    assert scan["lesson_count"] == 2
+
+
+def test_plain_build_keeps_the_site_tasks(hub, capsys):
+    build_hub(capsys, "--site")
+    conn = catalog.connect()
+    site_tasks = [name for name, _ in catalog.task_results(conn, "site:")]
+    build_hub(capsys)
+    assert [name for name, _ in catalog.task_results(conn, "site:")] == site_tasks
+    conn.close()
+    build_hub(capsys, "--site")
+    summary = json.loads((hub / "hub_metrics.json").read_text(encoding="utf-8"))
+    assert "extract" not in summary["phases"]
+    assert summary["counters"]["tasks_cached"] >= len(site_tasks)
@@ -0,0 +1,61 @@
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+
+from coursehub import build, cache, catalog
+
+COURSE = "advanced-microsoft-excel/Pivot Table Exam"
+
+
+def export(hub, capsys):
+    assert build.main(["-j", "2"]) == 0
+    assert cache.main(["export", "cache.tar.gz"]) == 0
+    capsys.readouterr()
+
+
+def test_import_into_a_fresh_checkout_is_all_cached(hub, capsys, tmp_path_factory, monkeypatch):
+    export(hub, capsys)
+    fresh = tmp_path_factory.mktemp("fresh")
+    shutil.copytree(hub / "advanced-microsoft-excel", fresh / "advanced-microsoft-excel")
+    shutil.copytree(hub / "introduction-to-excel", fresh / "introduction-to-excel")
+    for generated in fresh.rglob("viewer.html"):
+        generated.unlink()
+    shutil.copy(hub / "cache.tar.gz", fresh)
+    monkeypatch.chdir(fresh)
+    assert cache.main(["import", "cache.tar.gz"]) == 0
+    assert "Adopted 4 of 4 file rows (0 missing here, 0 different)" in capsys.readouterr().out
+    assert (fresh / COURSE / "viewer.html").read_bytes() == (hub / COURSE / "viewer.html").read_bytes()
+    assert build.main(["-j", "2"]) == 0
+    assert "Generated: 0, identical output: 0, unchanged inputs: 2" in capsys.readouterr().out
+
+
+def test_undeclared_output_member_is_rejected(hub, capsys):
+    export(hub, capsys)
+    extra = b"#!/bin/sh\nrm -rf ~\n"
+    with tarfile.open("cache.tar.gz") as tar:
+        members = {info.name: tar.extractfile(info).read() for info in tar}
+    manifest = json.loads(members.pop(cache.MANIFEST_NAME))
+    members[cache.OUTPUTS_PREFIX + "update_everything.sh"] = extra
+    manifest["members"][cache.OUTPUTS_PREFIX + "update_everything.sh"] = {
+        "sha256": hashlib.sha256(extra).hexdigest(), "size": len(extra)}
+    members[cache.MANIFEST_NAME] = json.dumps(manifest).encode("utf-8")
+    with tarfile.open("crafted.tar.gz", "w:gz") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    assert cache.main(["verify", "crafted.tar.gz"]) == 0
+    conn = catalog.connect()
+    tasks_before = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    conn.close()
+    (hub / COURSE / "viewer.html").unlink()
+    assert cache.main(["import", "crafted.tar.gz"]) == 1
+    out = capsys.readouterr().out
+    assert "do not account for; nothing was imported" in out and "update_everything.sh" in out
+    assert not (hub / "update_everything.sh").exists() and not (hub / COURSE / "viewer.html").exists()
+    conn = catalog.connect()
+    assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == tasks_before
+    conn.close()
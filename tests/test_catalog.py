@@ -0,0 +1,66 @@
+import os
+
+from coursehub import catalog, walker
+
+COURSE = "advanced-microsoft-excel/Pivot Table Exam"
+
+
+def sync(conn, config):
+    records = catalog.scan_course(COURSE, catalog.known_files(conn, COURSE), config)
+    return records, catalog.apply_scan(conn, COURSE, "Pivot Table Exam", 0, records)
+
+
+def test_find_courses_prunes_folders_without_servable_files(hub):
+    courses = walker.find_courses(walker.load_config())
+    assert courses == [COURSE, "introduction-to-excel/Section 1"]
+
+
+def test_scan_probes_lessons_and_hashes_every_file(hub):
+    conn = catalog.connect()
+    records, (written, removed) = sync(conn, walker.load_config())
+    assert (written, removed) == (3, 0)
+    by_name = {record["rel_path"]: record for record in records}
+    intro = by_name["1 Intro (14_11_2025 20：17：08).html"]
+    assert (intro["kind"], intro["title"], intro["source_url"]) == ("lesson", "Intro | 365 Financial Analyst", "https://example.com/exams/1/")
+    assert intro["captured_at"] == "2025-11-15T10:27:53+01:00"
+    assert intro["sha256"] == catalog.hash_file(f"{COURSE}/{intro['rel_path']}")
+    assert by_name["data.xlsx"]["kind"] == "workbook"
+    assert [lesson["rel_path"] for lesson in catalog.lessons(conn, COURSE)] == ["1 Intro (14_11_2025 20：17：08).html", "2 Slicers.html"]
+
+
+def test_rescan_writes_only_what_changed(hub):
+    conn = catalog.connect()
+    config = walker.load_config()
+    sync(conn, config)
+    digest = conn.execute("SELECT lessons_hash FROM courses").fetchone()[0]
+    assert sync(conn, config)[1] == (0, 0)
+
+    (hub / COURSE / "2 Slicers.html").write_bytes(b"<title>Slicers, again</title>")
+    (hub / COURSE / "data.xlsx").unlink()
+    records, counts = sync(conn, config)
+    assert counts == (1, 1)
+    assert {record["rel_path"]: record["title"] for record in records}["2 Slicers.html"] == "Slicers, again"
+    assert conn.execute("SELECT lessons_hash FROM courses").fetchone()[0] != digest
+
+
+def test_same_bytes_with_a_new_mtime_keep_the_lessons_hash(hub):
+    conn = catalog.connect()
+    config = walker.load_config()
+    sync(conn, config)
+    digest = conn.execute("SELECT lessons_hash FROM courses").fetchone()[0]
+    lesson = hub / COURSE / "2 Slicers.html"
+    lesson.write_bytes(lesson.read_bytes())
+    stat = lesson.stat()
+    os.utime(lesson, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert sync(conn, config)[1] == (1, 0)
+    assert conn.execute("SELECT lessons_hash FROM courses").fetchone()[0] == digest
+
+
+def test_output_fingerprints_and_outputs_intact(hub):
+    (hub / "a.txt").write_bytes(b"abc")
+    fingerprints = catalog.output_fingerprints(["a.txt", "missing.txt"])
+    assert fingerprints[1] == ["missing.txt", None, None]
+    assert catalog.outputs_intact(fingerprints[:1])
+    assert not catalog.outputs_intact(fingerprints)
+    (hub / "a.txt").write_bytes(b"abd")
+    assert not catalog.outputs_intact(fingerprints[:1])
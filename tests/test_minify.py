@@ -0,0 +1,34 @@
+import pytest
+
+from coursehub import minify
+
+
+@pytest.mark.parametrize("css, expected", [
+    (b"a { color: red ; }\n\nb {  margin: 0 ;  }", b"a{color:red}b{margin:0}"),
+    (b'a::before { content: "x;}"; }', b'a::before{content:"x;}"}'),
+    (b"a::before { content: 'a ;} b'; color: red; }", b"a::before{content:'a ;} b';color:red}"),
+    (b'a { content: "\\";}"; }', b'a{content:"\\";}"}'),
+    (b"a { color: red; /* note */ }", b"a{color:red}"),
+    (b"a { color: red; } /*! license */ b { }", b"a{color:red}/*! license */ b{}"),
+    (b"a/**/b { color: red }", b"a/**/b{color:red}"),
+])
+def test_minify_css(css, expected):
+    assert minify.minify_css(css) == expected
+
+
+def test_minify_html_keeps_preformatted_text_scripts_and_capture_header():
+    page = (b"<!DOCTYPE html> <html><!--\n Page saved with SingleFile \n url: https://example.com/ \n-->\n"
+            b"<!-- build note -->\n<body>\n  <p   class=\"intro\"  id='x'>Hello,\n   world</p>\n"
+            b"<pre>  keep\n    this  </pre>\n<script>if (a  <  b) {  go();  }</script>\n"
+            b"<style>p { margin: 0 ; }</style>\n</body></html>\n")
+    minified = minify.minify_html(page)
+    assert b"Page saved with SingleFile \n url: https://example.com/ \n-->" in minified
+    assert b"build note" not in minified
+    assert b"\n<p class=intro id=x>Hello,\nworld</p>\n" in minified
+    assert b"<pre>  keep\n    this  </pre>" in minified
+    assert b"<script>if (a  <  b) {  go();  }</script>" in minified
+    assert b"<style>p{margin:0}</style>" in minified
+
+
+def test_attribute_values_that_need_quotes_keep_them():
+    assert minify.minify_html(b'<a href="a b" title="x=y" data-v="">') == b'<a href="a b" title="x=y" data-v="">'
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from coursehub import catalog, pipeline
+
+
+@pytest.fixture
+def conn(hub):
+    conn = catalog.connect(catalog.CATALOG_PATH)
+    yield conn
+    conn.close()
+
+
+def run(conn, key, text="page", force=False):
+    """Runs a one-task graph whose task writes `text` to out.txt under content key `key`."""
+    calls = []
+
+    def write(results):
+        calls.append(1)
+        with open("out.txt", "w", encoding="utf-8") as f:
+            f.write(text)
+        return {"length": len(text)}
+
+    task = pipeline.Task("write", "out", write, key=lambda results: key, outputs=["out.txt"])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        outcome = pipeline.run_graph([task], executor, conn, force=force)["write:out"]
+    return outcome, len(calls)
+
+
+def test_same_key_and_intact_output_is_cached(conn):
+    assert run(conn, "k1")[0].state == pipeline.RAN
+    outcome, calls = run(conn, "k1")
+    assert (outcome.state, calls, outcome.result) == (pipeline.CACHED, 0, {"length": 4})
+
+
+def test_changed_key_runs_again(conn):
+    run(conn, "k1")
+    assert run(conn, "k2")[0].state == pipeline.RAN
+
+
+def test_force_runs_but_records_the_key(conn):
+    run(conn, "k1")
+    assert run(conn, "k1", force=True)[0].state == pipeline.RAN
+    assert run(conn, "k1")[0].state == pipeline.CACHED
+
+
+@pytest.mark.parametrize("damage", ["same size", "other size", "deleted"])
+def test_changed_or_missing_output_is_a_miss(conn, hub, damage):
+    run(conn, "k1")
+    output = hub / "out.txt"
+    if damage == "deleted":
+        output.unlink()
+    else:
+        output.write_text("PAGE" if damage == "same size" else "a longer page")
+    outcome, calls = run(conn, "k1")
+    assert (outcome.state, calls) == (pipeline.RAN, 1)
+    assert output.read_text() == "page"
+
+
+def test_failed_dependency_blocks_dependents(conn):
+    def fail(results):
+        raise OSError("disk full")
+
+    tasks = [pipeline.Task("scan", "a", fail),
+             pipeline.Task("viewer", "a", lambda results: None, deps=["scan:a"]),
+             pipeline.Task("retain", None, lambda results: sorted(results), deps=["scan:a"], always=True)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        outcomes = pipeline.run_graph(tasks, executor, conn)
+    assert outcomes["scan:a"].state == pipeline.FAILED
+    assert outcomes["viewer:a"].state == pipeline.BLOCKED
+    assert (outcomes["retain"].state, outcomes["retain"].result) == (pipeline.RAN, [])
+
+
+def test_retain_tasks_only_forgets_kinds_that_were_scheduled(conn):
+    for name in ("viewer:a", "viewer:b", "site:a", "dashboard"):
+        catalog.set_task_state(conn, name, "key", "{}", "[]")
+    assert catalog.retain_tasks(conn, ["viewer:a", "dashboard"]) == 1
+    assert [row["name"] for row in conn.execute("SELECT name FROM tasks ORDER BY name")] == ["dashboard", "site:a", "viewer:a"]
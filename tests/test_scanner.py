@@ -0,0 +1,59 @@
+import base64
+
+import pytest
+
+from coursehub import scanner
+from conftest import HUB, PNG, svg_icon
+
+
+def payloads(page, kinds=scanner.KINDS):
+    view = memoryview(page)
+    return [(payload.kind, payload.mime, payload.base64, bytes(payload.view), scanner.decode(payload) if payload.kind == "data-uri" else None)
+            for payload in scanner.scan(view, kinds)]
+
+
+@pytest.mark.parametrize("uri, mime, is_base64, data", [
+    (b"data:image/png;base64," + base64.b64encode(PNG), "image/png", True, PNG),
+    (b"data:image/svg+xml;charset=utf-8;base64," + base64.b64encode(svg_icon(b"M0 0")), "image/svg+xml", True, svg_icon(b"M0 0")),
+    (b"data:image/svg+xml;v=4,%3Csvg%20width%3D%2224%22%3E%3C/svg%3E", "image/svg+xml", False, b'<svg width="24"></svg>'),
+    (b"data:,Hello%2C%20world", "text/plain", False, b"Hello, world"),
+    (b"data:Font/WOFF2;BASE64,d09GMg==", "font/woff2", True, b"wOF2"),
+])
+def test_data_uri_payload_and_decode(uri, mime, is_base64, data):
+    found = payloads(b'<img src="' + uri + b'"> <div style="background:url(\'' + uri + b'\')">')
+    assert len(found) == 2
+    for kind, found_mime, found_base64, _, decoded in found:
+        assert (kind, found_mime, found_base64, decoded) == ("data-uri", mime, is_base64, data)
+
+
+def test_data_uri_stops_at_quotes_brackets_and_whitespace():
+    page = b"a{background:url(data:image/gif;base64,R0lGOD==)} <img src=data:text/plain,abc alt=x>"
+    assert [view for _, _, _, view, _ in payloads(page, ("data-uri",))] == [b"R0lGOD==", b"abc"]
+
+
+def test_blocks_are_yielded_in_order_with_the_uris_inside_them():
+    page = (b"<STYLE media=all>a{background:url(data:image/png;base64,AAAA)}</style>"
+            b"<script>if (a < b) { x = '</p>'; }</script >")
+    found = payloads(page)
+    assert [kind for kind, _, _, _, _ in found] == ["style", "data-uri", "script"]
+    assert found[0][3] == b"a{background:url(data:image/png;base64,AAAA)}"
+    assert found[2][3] == b"if (a < b) { x = '</p>'; }"
+    assert [kind for kind, _, _, _, _ in payloads(page, ("script",))] == ["script"]
+
+
+def test_scan_files_over_mapped_lessons(hub):
+    lessons = [path for path in HUB if path.endswith(".html")]
+    result = scanner.scan_files(lessons, decode_uris=True, top=3)
+    assert result["files"] == 2 and result["bytes"] == sum(len(HUB[path]) for path in lessons)
+    assert result["kinds"]["style"][0] == 4 and result["kinds"]["script"] == [0, 0]
+    assert result["mimes"]["image/png"][0] == 2 and result["mimes"]["image/png"][2] == 2 * len(PNG)
+    assert result["mimes"]["image/svg+xml"][0] == 4
+    assert result["invalid"] == []
+    assert [item[4] for item in result["largest"]] == ["image/png", "image/png", None]
+
+
+def test_empty_file_maps_to_an_empty_view(tmp_path):
+    empty = tmp_path / "empty.html"
+    empty.write_bytes(b"")
+    with scanner.mapped(str(empty)) as view:
+        assert len(view) == 0 and list(scanner.scan(view)) == []
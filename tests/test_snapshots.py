@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from coursehub import build, catalog, snapshots
+from conftest import HUB, lesson
+
+
+def page(seed, size=20000):
+    rng = random.Random(seed)
+    return b"\n".join(b"<p class=row-%d>%s</p>" % (i, bytes(rng.choice(b"abcdef ") for _ in range(40)))
+                      for i in range(size // 60))
+
+
+@pytest.mark.parametrize("base, target", [
+    (page(1), page(1)),
+    (page(1), page(1).replace(b"row-7>", b"row-7 edited>", 1) + b"<p>appended</p>"),
+    (page(1), b"<p>new header</p>" + page(1)[5000:]),
+    (page(1), page(2)),
+    (b"", page(1)),
+    (page(1), b""),
+])
+def test_delta_round_trip(base, target):
+    delta = snapshots.encode_delta(base, target)
+    assert snapshots.decode_delta(base, delta) == target
+
+
+def test_delta_of_a_small_edit_is_small():
+    base = page(1, size=200000)
+    target = base.replace(b"row-100>", b"row-100 timer=3>", 1)
+    assert len(snapshots.encode_delta(base, target)) < 200
+
+
+def test_pack_groups_captures_of_one_url_and_reads_them_back(hub, capsys):
+    recapture = lesson(b"Slicers", b"https://example.com/exams/2/", b"Slicers filter a pivot table. Updated.")
+    recapture = recapture.replace(b"10:27:53", b"11:00:00")
+    path = "advanced-microsoft-excel/Pivot Table Exam/2 Slicers (again).html"
+    (hub / path).write_bytes(recapture)
+    assert build.main([]) == 0
+    catalog_conn = catalog.connect()
+    conn = snapshots.connect()
+    store = snapshots.SnapshotStore(conn)
+    assert snapshots.pack(conn, catalog_conn, store) == (3, 0)
+    deltas = conn.execute("SELECT path FROM snapshots WHERE delta IS NOT NULL").fetchall()
+    assert [row["path"] for row in deltas] == [path]
+    for name, data in list(HUB.items()) + [(path, recapture)]:
+        if name.endswith(".html"):
+            assert snapshots.SnapshotStore(conn).read(name) == data
+
+    (hub / path).unlink()
+    assert build.main([]) == 0
+    assert snapshots.pack(conn, catalog_conn, store) == (0, 1)
+    capsys.readouterr()
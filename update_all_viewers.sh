@@ -7,18 +7,10 @@
 
 BASE_DIR="/home/uwabor/Videos/Excel tutorial/Business Analyst"
 
-# Find the first generate_viewer.py in the tree
-GENERATOR_SCRIPT=$(find "$BASE_DIR" -name "generate_viewer.py" -type f 2>/dev/null | head -1)
-
-# If no generator found, check if there's one in advanced-microsoft-excel
-if [ -z "$GENERATOR_SCRIPT" ]; then
-    if [ -f "$BASE_DIR/advanced-microsoft-excel/generate_viewer.py" ]; then
-        GENERATOR_SCRIPT="$BASE_DIR/advanced-microsoft-excel/generate_viewer.py"
-    else
-        echo "❌ Error: generate_viewer.py not found"
-        echo "   Please place generate_viewer.py in the advanced-microsoft-excel folder first"
-        exit 1
-    fi
+# The coursehub package (viewer generator and course walker) lives in the hub root
+if [ ! -d "$BASE_DIR/coursehub" ]; then
+    echo "❌ Error: coursehub package not found in $BASE_DIR"
+    exit 1
 fi
 
 # Colors
@@ -34,39 +26,18 @@ echo ""
 echo -e "${BLUE}🔍 Scanning: $BASE_DIR${NC}"
 echo ""
 
-total_folders=0
-updated_folders=0
-
-while IFS= read -r -d '' folder; do
-    html_count=$(find "$folder" -maxdepth 1 -name "*.html" ! -name "viewer*.html" -type f 2>/dev/null | wc -l)
-    
-    if [ $html_count -gt 0 ]; then
-        total_folders=$((total_folders + 1))
-        
-        rel_path="${folder#$BASE_DIR/}"
-        [ -z "$rel_path" ] && rel_path="Business Analyst (root)"
-        
-        echo -e "${YELLOW}📂 $rel_path${NC}"
-        echo "   HTML files: $html_count"
-        
-        if [ ! -f "$folder/generate_viewer.py" ]; then
-            cp "$GENERATOR_SCRIPT" "$folder/" 2>/dev/null
-            echo "   📋 Copied generator script"
-        fi
-        
-        cd "$folder"
-        if python3 generate_viewer.py > /dev/null 2>&1; then
-            echo -e "   ${GREEN}✅ Viewer updated!${NC}"
-            updated_folders=$((updated_folders + 1))
-        else
-            echo "   ❌ Error updating viewer"
-        fi
-        echo ""
-    fi
-done < <(find "$BASE_DIR" -type d -print0)
+# Course folders come from `coursehub courses` (roots and include/exclude rules from
+# hub_config.json); all of them are then rendered by a single `coursehub viewer` process
+cd "$BASE_DIR"
+python3 -m coursehub courses -0 | xargs -0 python3 -m coursehub viewer
+status=$?
+echo ""
 
 echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
-echo -e "${GREEN}🎉 Complete!${NC}"
-echo -e "   Total folders with HTML: $total_folders"
-echo -e "   Successfully updated: $updated_folders"
+if [ $status -eq 0 ]; then
+    echo -e "${GREEN}🎉 Complete!${NC}"
+else
+    echo "❌ Some viewers could not be updated"
+fi
 echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+exit $status